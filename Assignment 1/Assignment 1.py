@@ -2,9 +2,22 @@
 # Date: 08-Nov-2025
 # Project Title: Daily Calorie Tracker CLI
 
+import os
+from datetime import date
+
+from food_db import RECENT_SIZE, FoodFinder, FoodTable
+from meal_log import DEFAULT_LOG, MealLog
+
 print("Welcome to the Daily Calorie Tracker!")
 print("This program helps you keep track of your daily calorie intake.\n")
 
+# calories come from the food table, or from what you logged recently
+foods = FoodFinder(FoodTable.load())
+if os.path.exists(DEFAULT_LOG):
+    with MealLog(DEFAULT_LOG) as log:
+        for m in reversed(log.recent(RECENT_SIZE)):
+            foods.remember(m.name, m.calories)
+
 num_meals = int(input("How many meals do you want to enter? "))
 
 meals = []
@@ -12,7 +25,24 @@ calories = []
 
 for i in range(num_meals):
     meal = input("Enter meal name: ")
-    cal = int(input("Enter calories for " + meal + ": "))
+    food = foods.resolve(meal)
+    if food is None:
+        suggestions = foods.complete(meal, 5)
+        for n, s in enumerate(suggestions, 1):
+            print(" ", n, "-", s.name, "(" + str(s.calories), "cal)")
+        if suggestions:
+            pick = input("Pick a number, or press Enter to keep '" + meal + "': ")
+            if pick.isdigit() and 1 <= int(pick) <= len(suggestions):
+                food = suggestions[int(pick) - 1]
+                meal = food.name
+    if food is None:
+        cal = int(input("Enter calories for " + meal + ": "))
+    else:
+        entered = input(
+            "Enter calories for " + meal + " (Enter for " + str(food.calories) + "): "
+        )
+        cal = int(entered) if entered.strip() else food.calories
+    foods.remember(meal, cal)
     meals.append(meal)
     calories.append(cal)
 
@@ -38,23 +68,31 @@ print("Total:", total)
 print("Average:", round(average, 2))
 print(status)
 
-save = input("\nDo you want to save this report to a file? (yes/no): ").lower()
+save = input("\nDo you want to add these meals to your history? (yes/no): ").lower()
 
 if save == "yes":
-    file = open("calorie_log.txt", "w")
-    file.write("Calorie Tracker Report\n")
-    file.write("------------------------\n")
-    file.write("Meal Name\tCalories\n")
-    for i in range(len(meals)):
-        file.write(meals[i] + "\t" + str(calories[i]) + "\n")
-    file.write("------------------------\n")
-    file.write("Total: " + str(total) + "\n")
-    file.write("Average: " + str(round(average, 2)) + "\n")
-    file.write("Daily Limit: " + str(limit) + "\n")
-    file.write(status + "\n")
-    file.close()
-    print("Report saved to calorie_log.txt")
+    # the history is only ever appended to, so earlier days are kept
+    with MealLog(DEFAULT_LOG) as log:
+        for i in range(len(meals)):
+            log.add(meals[i], calories[i])
+
+        today = date.today()
+        week = log.week(today)
+        month = log.month(today.year, today.month)
+        print("Meals added to", DEFAULT_LOG)
+        print("\n---- History ----")
+        print("Today:", log.day(today).calories, "calories")
+        for rollup in (week, month):
+            print(
+                rollup.label + ":",
+                rollup.calories,
+                "calories over",
+                rollup.days,
+                "day(s), average",
+                round(rollup.average_per_day, 2),
+                "per day",
+            )
 else:
-    print("Report not saved.")
+    print("Meals not saved.")
 
 print("\nThanks for using the program!")
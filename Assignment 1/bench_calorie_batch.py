@@ -0,0 +1,168 @@
+"""
+bench_calorie_batch.py
+
+Throughput of the batch calorie analytics (calorie_batch.py) in rows/s,
+on a generated multi-user export, against a straightforward baseline
+(csv.DictReader / json.loads with one dict update per row). --memory
+adds a second, slower tracemalloc run per method for peak memory.
+
+Usage:
+    python bench_calorie_batch.py --rows 2000000 --users 1000
+    python bench_calorie_batch.py --rows 1000000 --chunk-rows 16384 65536 --memory
+"""
+
+import argparse
+import csv
+import json
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+from datetime import date, timedelta
+
+import calorie_batch
+from calorie_batch import analyze_files
+
+MEALS = ["Oats", "Rice", "Dal", "Paneer wrap", "Apple", "Salad", "Pasta", "Tea"]
+
+
+def write_exports(directory: str, rows: int, users: int, seed: int = 5) -> list:
+    """The same meals as CSV and JSONL: about five per user per day."""
+    rng = random.Random(seed)
+    start = date(2024, 1, 1)
+    span = max(1, rows // (users * 5))
+    days = [(start + timedelta(days=i)).isoformat() for i in range(span)]
+    csv_path = os.path.join(directory, "meals.csv")
+    jsonl_path = os.path.join(directory, "meals.jsonl")
+    with open(csv_path, "w", newline="") as fc, open(jsonl_path, "w") as fj:
+        writer = csv.writer(fc)
+        writer.writerow(["user", "date", "meal", "calories"])
+        for _ in range(rows):
+            row = (
+                f"user{rng.randrange(users)}",
+                rng.choice(days),
+                rng.choice(MEALS),
+                rng.randint(30, 900),
+            )
+            writer.writerow(row)
+            fj.write(
+                f'{{"user": "{row[0]}", "date": "{row[1]}", '
+                f'"meal": "{row[2]}", "calories": {row[3]}}}\n'
+            )
+    return [csv_path, jsonl_path], span
+
+
+def baseline(path: str, limit: float = 2000):
+    """Row-at-a-time: a dict update per meal, then the same report."""
+    daily = {}
+    meals = {}
+    with open(path, newline="") as f:
+        if path.endswith(".csv"):
+            records = csv.DictReader(f)
+        else:
+            records = (json.loads(line) for line in f)
+        for r in records:
+            user = r["user"].strip()
+            cal = float(r["calories"])
+            key = (user, r["date"][:10])
+            daily[key] = daily.get(key, 0.0) + cal
+            key = (user, " ".join(r["meal"].lower().split()))
+            meals[key] = meals.get(key, 0) + 1
+    users = {}
+    for (user, _), cal in daily.items():
+        totals = users.setdefault(user, [0, 0.0, 0])
+        totals[0] += 1
+        totals[1] += cal
+        totals[2] += cal > limit
+    return users
+
+
+def check_bad_lines(directory: str) -> None:
+    """Malformed rows are skipped and counted, never fatal."""
+    path = os.path.join(directory, "bad.jsonl")
+    good = '{"user": "u", "date": "2024-01-01", "meal": "Tea", "calories": 40}'
+    odd = [
+        '{"user": ["u"], "date": "2024-01-01", "meal": "Tea", "calories": 1}',
+        '{"user": "u", "date": "2024-01-01", "meal": {"a": 1}, "calories": 1}',
+        '{"user": "u", "date": "2024-01-01", "meal": "Tea", "calories": "nan"}',
+        '{"user": "u", "date": "2024-01-01", "meal": "Tea", "calories": NaN}',
+        '{"user": "u", "date": "2024-01-01", "meal": "Tea", "calories": "-inf"}',
+    ]
+    with open(path, "w") as f:
+        f.write("\n".join(["[1]", good, good[:-1], "1, 2", good, '"x"'] + odd) + "\n")
+    csv_path = os.path.join(directory, "bad.csv")
+    with open(csv_path, "w") as f:
+        f.write("user,date,meal,calories\nu,2024-01-01,Tea,inf\nu,2024-01-01,Tea,40\n")
+    for use_numpy in (False, True) if calorie_batch.np is not None else (False,):
+        for chunk_rows in (1, 4, 1000):
+            report = analyze_files([path], chunk_rows, use_numpy).report()
+            assert (report.rows, report.skipped) == (2, 9), (chunk_rows, report)
+            report = analyze_files([csv_path], chunk_rows, use_numpy).report()
+            assert (report.rows, report.skipped) == (1, 1), (chunk_rows, report)
+
+
+def measure(memory: bool, fn, *args):
+    """(result, seconds, peak MB or None); tracemalloc would skew the time,
+    so peak memory comes from a separate run."""
+    t0 = time.perf_counter()
+    result = fn(*args)
+    elapsed = time.perf_counter() - t0
+    peak = None
+    if memory:
+        tracemalloc.start()
+        fn(*args)
+        peak = tracemalloc.get_traced_memory()[1] / 1e6
+        tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def row(kind: str, label: str, rows: int, elapsed: float, peak) -> None:
+    peak = "" if peak is None else f"{peak:>8.1f}"
+    print(f"{kind:>6} {label:>30} {elapsed:>8.2f} {rows / elapsed:>11,.0f} {peak}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Batch calorie analytics throughput"
+    )
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--users", type=int, default=1_000)
+    parser.add_argument(
+        "--chunk-rows", type=int, nargs="+", default=[calorie_batch.CHUNK_ROWS]
+    )
+    parser.add_argument("--memory", action="store_true", help="also peak memory")
+    args = parser.parse_args()
+
+    backends = [False] + ([True] if calorie_batch.np is not None else [])
+    with tempfile.TemporaryDirectory() as d:
+        check_bad_lines(d)
+        paths, days = write_exports(d, args.rows, args.users)
+        print(f"{args.rows:,} meals, {args.users:,} users, {days:,} days per file")
+        print(
+            f"{'input':>6} {'method':>30} {'seconds':>8} {'rows/s':>11} "
+            + (f"{'peak MB':>8}" if args.memory else "")
+        )
+        for path in paths:
+            kind = path.rsplit(".", 1)[-1]
+            expected, elapsed, peak = measure(args.memory, baseline, path)
+            row(kind, "row-at-a-time dicts", args.rows, elapsed, peak)
+            for use_numpy in backends:
+                for chunk_rows in args.chunk_rows:
+                    totals, elapsed, peak = measure(
+                        args.memory, analyze_files, [path], chunk_rows, use_numpy
+                    )
+                    report = totals.report()
+                    # same per-user answers as the baseline
+                    for u in report.users:
+                        days, calories, breaches = expected[u.user]
+                        assert u.days == days and u.breach_days == breaches
+                        assert abs(u.calories - calories) < 1e-6 * calories
+                    label = f"chunked {totals.backend} ({chunk_rows:,} rows)"
+                    row(kind, label, args.rows, elapsed, peak)
+    if calorie_batch.np is None:
+        print("(NumPy not installed: only the pure-Python group-by was measured)")
+
+
+if __name__ == "__main__":
+    main()
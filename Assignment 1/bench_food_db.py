@@ -0,0 +1,134 @@
+"""
+bench_food_db.py
+
+Lookup benchmark for the calorie tracker's food table (food_db.py): a
+generated table of --foods entries is written to CSV and loaded, then
+exact lookups, prefix completions and recent-meal hits are timed one
+call at a time (median / p99 / worst), with a linear scan as reference.
+
+Usage:
+    python bench_food_db.py --foods 1000000 --queries 20000
+"""
+
+import argparse
+import csv
+import itertools
+import os
+import random
+import tempfile
+import time
+
+from food_db import FoodFinder, FoodTable, RecentMeals, normalize
+
+STYLES = """
+    baked boiled crispy fried grilled masala roasted smoked spicy steamed
+    stuffed sweet tandoori creamy garlic lemon mint honey pepper chilli
+""".split()
+BASES = """
+    aloo bean beef bhindi cabbage carrot cauliflower chicken chickpea corn dal
+    duck egg fish gobi lamb lentil mushroom mutton noodle okra paneer pea potato
+    prawn pumpkin rice soya spinach tofu
+""".split()
+DISHES = """
+    bowl burger curry cutlet fry kebab masala pakora paratha pasta pie pizza
+    pulao roll salad sandwich soup stew stir_fry tacos tikka wrap biryani chaat
+""".split()
+
+
+def food_names(count: int):
+    """``count`` distinct names like "Crispy paneer wrap 12"."""
+    combos = itertools.product(STYLES, BASES, DISHES)
+    per_variant = len(STYLES) * len(BASES) * len(DISHES)
+    for i, (style, base, dish) in enumerate(itertools.cycle(combos)):
+        if i == count:
+            return
+        variant = i // per_variant
+        name = f"{style.capitalize()} {base} {dish.replace('_', ' ')}"
+        yield f"{name} {variant}" if variant else name
+
+
+def percentiles(samples: list) -> str:
+    samples.sort()
+    p50 = samples[len(samples) // 2]
+    p99 = samples[int(len(samples) * 0.99)]
+    return f"{p50 * 1e6:>8.1f} {p99 * 1e6:>8.1f} {samples[-1] * 1e6:>9.1f}"
+
+
+def time_each(fn, args: list) -> list:
+    clock = time.perf_counter
+    samples = []
+    for arg in args:
+        t0 = clock()
+        fn(arg)
+        samples.append(clock() - t0)
+    return samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Food table lookup benchmark")
+    parser.add_argument("--foods", type=int, default=1_000_000)
+    parser.add_argument("--queries", type=int, default=20_000)
+    args = parser.parse_args()
+
+    rng = random.Random(4)
+    names = list(food_names(args.foods))
+    with tempfile.TemporaryDirectory() as d:
+        # bad calories are skipped, not raised: "inf" used to overflow int()
+        path = os.path.join(d, "bad.csv")
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            csv.writer(f).writerows(
+                [["Oats", "150"], ["Toast", "inf"], ["Jam", "nan"], ["Tea", "x"]]
+            )
+        assert [f.name for f in FoodTable.load(path).complete("")] == ["Oats"]
+
+        path = os.path.join(d, "foods.csv")
+        with open(path, "w", newline="", encoding="utf-8") as f:
+            writer = csv.writer(f)
+            writer.writerow(["name", "calories", "serving"])
+            writer.writerows((n, rng.randint(20, 900), "1 serving") for n in names)
+        t0 = time.perf_counter()
+        table = FoodTable.load(path)
+        t_load = time.perf_counter() - t0
+    print(f"{len(table):,} foods loaded in {t_load:.2f} s")
+
+    recent = RecentMeals()
+    finder = FoodFinder(table, recent)
+    for n in rng.sample(names, recent.size):
+        finder.remember(n, 300)
+
+    hits = [rng.choice(names).upper() for _ in range(args.queries)]
+    misses = [rng.choice(names) + " deluxe" for _ in range(args.queries)]
+    prefixes = [
+        normalize(rng.choice(names))[: rng.randint(1, 12)]
+        for _ in range(args.queries)
+    ]
+    recent_names = [rng.choice(list(recent._meals)) for _ in range(args.queries)]
+
+    print(f"{'operation':>28} {'p50 us':>8} {'p99 us':>8} {'worst us':>9}")
+    cases = [
+        ("lookup (hit)", table.lookup, hits),
+        ("lookup (miss)", table.lookup, misses),
+        ("complete (10 results)", table.complete, prefixes),
+        ("resolve (recent meal)", finder.resolve, recent_names),
+        ("resolve (table)", finder.resolve, hits),
+        ("finder complete", finder.complete, prefixes),
+    ]
+    for label, fn, queries in cases:
+        print(f"{label:>28} {percentiles(time_each(fn, queries))}")
+
+    # reference: what a lookup costs without the sorted index
+    keys = table._keys
+    scan = [normalize(n) for n in hits[:20]]
+    samples = time_each(lambda k: keys.index(k), scan)
+    print(f"{'linear scan (hit)':>28} {percentiles(samples)}")
+
+    # every answer must match a scan of the full table
+    for prefix in prefixes[:20]:
+        want = [k for k in keys if k.startswith(prefix)][:10]
+        assert [normalize(f.name) for f in table.complete(prefix)] == want
+    for name in hits[:200]:
+        assert normalize(table.lookup(name).name) == normalize(name)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+"""
+bench_meal_log.py
+
+Benchmarks for the Daily Calorie Tracker's meal history (meal_log.py).
+
+    append   meals/s for single appends (flushed, and fsynced) and for
+             bulk add_many()
+    query    years of history: opening with the saved index vs rebuilding
+             it, and week / month / date-range totals and one day's meals
+             from the index vs re-reading the whole log
+
+Usage:
+    python bench_meal_log.py append --meals 100000
+    python bench_meal_log.py query --years 20 --per-day 6
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+from meal_log import Meal, MealLog, _parse_line
+
+FOODS = ["Oats", "Rice", "Dal", "Paneer wrap", "Apple", "Salad", "Pasta", "Tea"]
+
+
+def generate(start: date, days: int, per_day: int, seed: int = 1):
+    rng = random.Random(seed)
+    for d in range(days):
+        day = datetime.combine(start + timedelta(days=d), datetime.min.time())
+        for m in range(per_day):
+            when = day + timedelta(hours=7 + m * 14 // per_day)
+            yield Meal(when, rng.choice(FOODS), rng.randint(50, 900))
+
+
+def scan_totals(path: str, first: date, last: date) -> tuple:
+    """The no-index way: read every line, keep those in [first, last]."""
+    lo, hi = first.isoformat(), last.isoformat() + "~"
+    days, meals, calories = set(), 0, 0
+    with open(path, "rb") as f:
+        for line in f:
+            stamp = line[:10].decode()
+            if lo <= stamp < hi:
+                days.add(stamp)
+                meals += 1
+                calories += int(line.split(b"\t", 2)[1])
+    return len(days), meals, calories
+
+
+def timed(fn, *args):
+    t0 = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - t0
+
+
+def bench_append(meals: int) -> None:
+    print(f"{'mode':>22} {'meals':>9} {'seconds':>8} {'meals/s':>12}")
+    with tempfile.TemporaryDirectory() as d:
+        rows = list(generate(date(2020, 1, 1), meals // 5 + 1, 5))[:meals]
+        cases = [
+            ("add (flush)", False, rows, False),
+            ("add (fsync)", True, rows[: max(1, meals // 100)], False),
+            ("add_many (one write)", False, rows, True),
+        ]
+        for i, (label, durable, batch, bulk) in enumerate(cases):
+            path = os.path.join(d, f"log{i}.tsv")
+            t0 = time.perf_counter()
+            with MealLog(path, durable=durable) as log:
+                if bulk:
+                    log.add_many(batch)
+                else:
+                    for m in batch:
+                        log.add(m.name, m.calories, m.when)
+            elapsed = time.perf_counter() - t0
+            print(
+                f"{label:>22} {len(batch):>9,} {elapsed:>8.2f} "
+                f"{len(batch) / elapsed:>12,.0f}"
+            )
+
+
+def bench_query(years: int, per_day: int, queries: int) -> None:
+    start = date(2000, 1, 1)
+    days = years * 365
+    rng = random.Random(3)
+    with tempfile.TemporaryDirectory() as d:
+        path = os.path.join(d, "calorie_log.tsv")
+        with MealLog(path) as log:
+            log.add_many(generate(start, days, per_day))
+        size = os.path.getsize(path)
+        print(f"{years} years, {days * per_day:,} meals, {size / 1e6:.1f} MB log")
+
+        log, t_open = timed(MealLog, path)
+        log.close()
+        os.remove(os.path.join(d, "calorie_log.idx"))
+        log, t_rebuild = timed(MealLog, path)
+        print(
+            f"open with index {t_open * 1e3:.1f} ms, "
+            f"rebuild from the log {t_rebuild * 1e3:.1f} ms"
+        )
+
+        ranges = []
+        for _ in range(queries):
+            first = start + timedelta(days=rng.randrange(days))
+            ranges.append((first, first + timedelta(days=rng.randint(0, 400))))
+        print(f"{'query':>18} {'index ms':>10} {'full scan ms':>13} {'speedup':>8}")
+
+        def report(label, indexed, scanned, samples):
+            t_index = t_scan = 0.0
+            for first, last in samples:
+                got, elapsed = timed(indexed, first, last)
+                t_index += elapsed
+                want, elapsed = timed(scanned, first, last)
+                t_scan += elapsed
+                assert got == want, (label, first, last)
+            n = len(samples)
+            print(
+                f"{label:>18} {t_index / n * 1e3:>10.3f} {t_scan / n * 1e3:>13.1f} "
+                f"{t_scan / t_index:>7.0f}x"
+            )
+
+        def week(first, last):
+            r = log.week(first)
+            return r.days, r.meals, r.calories
+
+        def week_scan(first, last):
+            monday = first - timedelta(days=first.weekday())
+            return scan_totals(path, monday, monday + timedelta(days=6))
+
+        def month(first, last):
+            r = log.month(first.year, first.month)
+            return r.days, r.meals, r.calories
+
+        def month_scan(first, last):
+            end = date(first.year + first.month // 12, first.month % 12 + 1, 1)
+            return scan_totals(path, first.replace(day=1), end - timedelta(days=1))
+
+        def span(first, last):
+            r = log.range(first, last)
+            return r.days, r.meals, r.calories
+
+        def meals(first, last):
+            return log.meals_on(first)
+
+        def meals_scan(first, last):
+            key = first.isoformat().encode()
+            with open(path, "rb") as f:
+                return [_parse_line(line) for line in f if line.startswith(key)]
+
+        sample = ranges[: max(1, queries // 10)]  # full scans are slow
+        report("week total", week, week_scan, sample)
+        report("month total", month, month_scan, sample)
+        report("date range total", span, lambda a, b: scan_totals(path, a, b), sample)
+        report("one day's meals", meals, meals_scan, sample)
+
+        t0 = time.perf_counter()
+        for first, last in ranges:
+            log.range(first, last)
+        per_query = (time.perf_counter() - t0) / len(ranges)
+        print(f"{len(ranges):,} random range queries: {per_query * 1e6:.1f} us each")
+        log.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Meal history benchmarks")
+    sub = parser.add_subparsers(dest="bench", required=True)
+
+    p = sub.add_parser("append", help="append throughput")
+    p.add_argument("--meals", type=int, default=100_000)
+
+    p = sub.add_parser("query", help="indexed rollups vs full-log scans")
+    p.add_argument("--years", type=int, default=20)
+    p.add_argument("--per-day", type=int, default=6)
+    p.add_argument("--queries", type=int, default=1_000)
+
+    args = parser.parse_args()
+    if args.bench == "append":
+        bench_append(args.meals)
+    elif args.bench == "query":
+        bench_query(args.years, args.per_day, args.queries)
+
+
+if __name__ == "__main__":
+    main()
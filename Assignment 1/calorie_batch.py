@@ -0,0 +1,534 @@
+"""
+calorie_batch.py
+
+Batch analytics for the Daily Calorie Tracker: many users' meal exports,
+no prompts.
+
+Each input row is one meal: user, date (or a timestamp starting with the
+date), meal name and calories. CSV files need a header naming those
+columns; JSONL files hold one object per line with the same keys. Files
+ending in .gz are decompressed on the fly.
+
+Files are read in chunks of --chunk-rows rows, so their size is bounded
+by disk, not RAM. Each distinct user, date and meal string is numbered
+once, and every row becomes two integer group keys: (user, day) and
+(user, meal). With NumPy, np.unique numbers a chunk's distinct groups
+and np.bincount adds up their meal counts and calories. Without NumPy,
+a Counter and one loop over the group numbers do the same.
+
+Only those per-group totals are kept between chunks. The report is
+derived from them: per-user totals and averages, days over the limit,
+each user's usual meal and the overall top meals.
+
+Usage:
+    python calorie_batch.py exports/ --limit 2200
+    python calorie_batch.py "logs/*.jsonl" --json report.json --daily days.csv
+"""
+
+import argparse
+import csv
+import glob
+import gzip
+import io
+import json
+import math
+import os
+import sys
+from array import array
+from collections import Counter
+from dataclasses import asdict, dataclass
+from itertools import islice
+from operator import or_
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # the fallback below needs only the standard library
+    np = None
+
+from food_db import normalize
+
+DEFAULT_LIMIT = 2000
+CHUNK_ROWS = 65_536
+USER_KEYS = ("user", "user_id")
+DAY_KEYS = ("date", "day", "timestamp", "when")
+MEAL_KEYS = ("meal", "name", "food")
+CALORIE_KEYS = ("calories", "kcal")
+KEY_SETS = (USER_KEYS, DAY_KEYS, MEAL_KEYS, CALORIE_KEYS)
+# user, date and meal values a row may hold (JSON can give lists, dicts...)
+SCALAR_TYPES = frozenset((str, int))
+EXTENSIONS = (".csv", ".jsonl", ".ndjson", ".csv.gz", ".jsonl.gz", ".ndjson.gz")
+
+Columns = Tuple[List[str], List[str], List[str], array]
+
+
+@dataclass
+class UserSummary:
+    user: str
+    days: int
+    meals: int
+    calories: float
+    average_per_day: float
+    average_per_meal: float
+    breach_days: int  # days over the limit
+    top_meal: str  # the meal this user logged most often
+
+
+@dataclass
+class BatchReport:
+    rows: int
+    skipped: int
+    limit: float
+    users: List[UserSummary]
+    top_meals: List[Tuple[str, int, float]]  # (meal, times logged, calories)
+    backend: str
+
+
+# -------------------------
+# Reading
+# -------------------------
+def _open(path: str):
+    if path.endswith(".gz"):
+        return io.TextIOWrapper(gzip.open(path, "rb"), encoding="utf-8", newline="")
+    return open(path, "r", encoding="utf-8", newline="")
+
+
+def _pick(fields: Iterable[str], names: Tuple[str, ...], path: str) -> str:
+    lowered = {f.strip().lower(): f for f in fields}
+    for name in names:
+        if name in lowered:
+            return lowered[name]
+    raise ValueError(f"{path}: no {names[0]!r} column (tried {', '.join(names)})")
+
+
+def iter_chunks(
+    path: str, chunk_rows: int = CHUNK_ROWS
+) -> Iterator[Tuple[Columns, int]]:
+    """Yield ((users, days, meals, calories), skipped rows) per chunk.
+
+    Rows with a missing field, a user, date or meal that is not a string
+    or integer, or calories that are not a finite number, and JSONL lines
+    that are not a JSON object, are skipped and counted. Meal names are
+    normalised (food_db.normalize) so "Oats" and " oats" group together.
+    """
+    base = path[:-3] if path.endswith(".gz") else path
+    is_json = base.lower().endswith((".jsonl", ".ndjson"))
+    with _open(path) as f:
+        if is_json:
+            keys = None
+            while True:
+                lines = list(filter(str.strip, islice(f, chunk_rows)))
+                if not lines:
+                    return
+                records, bad = _json_records(lines)
+                if keys is None:
+                    keys = _json_keys(records, path)
+                    if keys is None:  # no object in the chunk yet
+                        yield ([], [], [], array("d")), bad + len(records)
+                        continue
+                columns, skipped = _columns(records, keys)
+                yield columns, skipped + bad
+        else:
+            reader = csv.reader(f)
+            header = next(reader, None)
+            if header is None:
+                return
+            cols = tuple(
+                header.index(_pick(header, names, path)) for names in KEY_SETS
+            )
+            while True:
+                rows = list(islice(reader, chunk_rows))
+                if not rows:
+                    return
+                yield _columns(rows, cols)
+
+
+def _json_records(lines: List[str]) -> Tuple[list, int]:
+    """Parse JSONL lines; returns (values, lines that failed to parse)."""
+    try:
+        # one C-level parse per chunk instead of one call per line
+        records = json.loads("[" + ",".join(lines) + "]")
+    except ValueError:
+        records = None
+    # a line like "1, 2" parses, but as two values
+    if records is not None and len(records) == len(lines):
+        return records, 0
+    records = []
+    bad = 0
+    for line in lines:
+        try:
+            records.append(json.loads(line))
+        except ValueError:
+            bad += 1
+    return records, bad
+
+
+def _json_keys(records: list, path: str) -> Optional[tuple]:
+    """The user/day/meal/calorie keys, from the first object that has all
+    of them; None if the chunk holds no object at all."""
+    error = None
+    for r in records:
+        if not isinstance(r, dict):
+            continue  # counted as skipped by _columns
+        try:
+            return tuple(_pick(r, names, path) for names in KEY_SETS)
+        except ValueError as e:
+            error = error or e
+    if error is not None:
+        raise error
+    return None
+
+
+def _columns(rows: list, cols: tuple) -> Tuple[Columns, int]:
+    """Split rows (CSV lists or JSON objects) into columns, one
+    comprehension per column; ``cols`` are the indexes or keys to read.
+
+    A chunk with a bad row falls back to checking every row on its own.
+    """
+    u, d, m, c = cols
+    try:
+        users = [r[u] for r in rows]
+        days = [r[d] for r in rows]
+        meals = [r[m] for r in rows]
+        calories = array("d", map(float, [r[c] for r in rows]))
+    except (IndexError, KeyError, TypeError, ValueError):
+        return _columns_checked(rows, cols)
+    if "" in days or not all(map(math.isfinite, calories)):
+        return _columns_checked(rows, cols)
+    # one type() per row, in C; this also catches None and unhashable values
+    if not all(set(map(type, col)) <= SCALAR_TYPES for col in (users, days, meals)):
+        return _columns_checked(rows, cols)
+    return (
+        _clean(users, _user),
+        _clean(days, _day),
+        _clean(meals, _meal),
+        calories,
+    ), 0
+
+
+def _user(value) -> str:
+    return str(value).strip()
+
+
+def _day(value) -> str:
+    return str(value)[:10]
+
+
+def _meal(value) -> str:
+    return normalize(str(value))
+
+
+def _clean(values: list, fn) -> list:
+    """``fn`` over a column, called once per distinct value.
+
+    Exports repeat the same users, dates and meals on many rows, so this
+    is far cheaper than cleaning every row.
+    """
+    cleaned = {v: fn(v) for v in set(values)}
+    return list(map(cleaned.__getitem__, values))
+
+
+def _columns_checked(rows: list, cols: tuple) -> Tuple[Columns, int]:
+    u, d, m, c = cols
+    users: List[str] = []
+    days: List[str] = []
+    meals: List[str] = []
+    calories = array("d")
+    skipped = 0
+    for r in rows:
+        try:
+            user, day, meal, cal = r[u], r[d], r[m], float(r[c])
+        except (IndexError, KeyError, TypeError, ValueError):
+            skipped += 1
+            continue
+        if (
+            type(user) not in SCALAR_TYPES
+            or type(day) not in SCALAR_TYPES
+            or type(meal) not in SCALAR_TYPES
+            or not day
+            or not math.isfinite(cal)
+        ):
+            skipped += 1
+            continue
+        users.append(_user(user))
+        days.append(_day(day))
+        meals.append(_meal(meal))
+        calories.append(cal)
+    return (users, days, meals, calories), skipped
+
+
+# -------------------------
+# Group-by aggregation
+# -------------------------
+class _Groups:
+    """Meal counts and calorie sums per group, groups numbered as first seen.
+
+    A group key is one int: (user id << 32) | day or meal id.
+    """
+
+    def __init__(self, use_numpy: bool) -> None:
+        self.index: Dict[int, int] = {}  # group key -> position in the totals
+        self.use_numpy = use_numpy
+        if use_numpy:
+            self.counts = np.zeros(0, dtype=np.int64)
+            self.sums = np.zeros(0, dtype=np.float64)
+        else:
+            self.counts = array("q")
+            self.sums = array("d")
+
+    def add(self, keys, calories: array) -> None:
+        index = self.index
+        code_of = index.setdefault
+        if self.use_numpy:
+            # number each distinct key of the chunk once, not every row
+            unique, inverse = np.unique(keys, return_inverse=True)
+            known = [code_of(k, len(index)) for k in unique.tolist()]
+            codes = np.asarray(known, dtype=np.intp)[inverse]
+            size = len(index)
+            grow = size - len(self.counts)
+            if grow:
+                self.counts = np.concatenate([self.counts, np.zeros(grow, np.int64)])
+                self.sums = np.concatenate([self.sums, np.zeros(grow)])
+            self.counts += np.bincount(codes, minlength=size)
+            self.sums += np.bincount(
+                codes, weights=np.frombuffer(calories), minlength=size
+            )
+            return
+        # a new key gets the next number: len(index) before it is inserted
+        codes = [code_of(k, len(index)) for k in keys]
+        grow = len(index) - len(self.counts)
+        if grow:
+            self.counts.extend(array("q", [0]) * grow)
+            self.sums.extend(array("d", [0.0]) * grow)
+        counts, sums = self.counts, self.sums
+        for code, n in Counter(codes).items():
+            counts[code] += n
+        for code, cal in zip(codes, calories):
+            sums[code] += cal
+
+    def items(self) -> Iterator[Tuple[int, int, float]]:
+        counts, sums = self.counts, self.sums
+        if self.use_numpy:
+            counts, sums = counts.tolist(), sums.tolist()
+        for key, code in self.index.items():
+            yield key, counts[code], sums[code]
+
+
+_SHIFT = 32
+_LOW = (1 << _SHIFT) - 1
+
+
+def _factorize(values: List[str], vocab: Dict[str, int]) -> List[int]:
+    """Ids for ``values``, adding unseen ones to ``vocab``."""
+    ids = {v: vocab.setdefault(v, len(vocab)) for v in set(values)}
+    return list(map(ids.__getitem__, values))
+
+
+class CalorieAggregator:
+    """Running per-(user, day) and per-(user, meal) totals over chunks."""
+
+    def __init__(self, use_numpy: Optional[bool] = None) -> None:
+        if use_numpy is None:
+            use_numpy = np is not None
+        if use_numpy and np is None:
+            raise RuntimeError("NumPy is not installed")
+        self.use_numpy = use_numpy
+        self.backend = "numpy" if use_numpy else "python"
+        # string -> id, numbered as first seen
+        self.user_ids: Dict[str, int] = {}
+        self.day_ids: Dict[str, int] = {}
+        self.meal_ids: Dict[str, int] = {}
+        self.days = _Groups(use_numpy)
+        self.meals = _Groups(use_numpy)
+        self.rows = 0
+        self.skipped = 0
+
+    def update(self, columns: Columns, skipped: int = 0) -> None:
+        users, days, meals, calories = columns
+        self.rows += len(users)
+        self.skipped += skipped
+        if not users:
+            return
+        user = _factorize(users, self.user_ids)
+        day = _factorize(days, self.day_ids)
+        meal = _factorize(meals, self.meal_ids)
+        if self.use_numpy:
+            user = np.asarray(user, dtype=np.int64) << _SHIFT
+            self.days.add(user | np.asarray(day, dtype=np.int64), calories)
+            self.meals.add(user | np.asarray(meal, dtype=np.int64), calories)
+        else:
+            user = [u << _SHIFT for u in user]
+            self.days.add(map(or_, user, day), calories)
+            self.meals.add(map(or_, user, meal), calories)
+
+    def _groups(self, groups: _Groups, vocab: Dict[str, int]):
+        users, names = list(self.user_ids), list(vocab)  # id order
+        for key, count, calories in groups.items():
+            yield users[key >> _SHIFT], names[key & _LOW], count, calories
+
+    def daily(self) -> Iterator[Tuple[str, str, int, float]]:
+        """(user, day, meals, calories) for every user and day seen."""
+        return self._groups(self.days, self.day_ids)
+
+    def report(self, limit: float = DEFAULT_LIMIT, top: int = 10) -> BatchReport:
+        per_user: Dict[str, list] = {}  # user -> [days, meals, calories, breaches]
+        for user, _, meals, calories in self.daily():
+            totals = per_user.get(user)
+            if totals is None:
+                totals = per_user[user] = [0, 0, 0.0, 0]
+            totals[0] += 1
+            totals[1] += meals
+            totals[2] += calories
+            totals[3] += calories > limit
+
+        usual: Dict[str, Tuple[int, float, str]] = {}
+        overall: Dict[str, list] = {}
+        for user, meal, count, calories in self._groups(self.meals, self.meal_ids):
+            # most logged; ties go to more calories, then the later name
+            best = usual.get(user)
+            if best is None or (count, calories, meal) > best:
+                usual[user] = (count, calories, meal)
+            totals = overall.get(meal)
+            if totals is None:
+                totals = overall[meal] = [0, 0.0]
+            totals[0] += count
+            totals[1] += calories
+
+        users = [
+            UserSummary(
+                user=user,
+                days=days,
+                meals=meals,
+                calories=calories,
+                average_per_day=calories / days,
+                average_per_meal=calories / meals,
+                breach_days=breaches,
+                top_meal=usual[user][2],
+            )
+            for user, (days, meals, calories, breaches) in sorted(per_user.items())
+        ]
+        ranked = sorted(overall.items(), key=lambda kv: (-kv[1][0], -kv[1][1], kv[0]))
+        return BatchReport(
+            rows=self.rows,
+            skipped=self.skipped,
+            limit=limit,
+            users=users,
+            top_meals=[(meal, n, cal) for meal, (n, cal) in ranked[:top]],
+            backend=self.backend,
+        )
+
+
+def expand_paths(patterns: Iterable[str]) -> List[str]:
+    """Files named by each argument: a directory (its exports), a glob or a file."""
+    paths: List[str] = []
+    seen = set()
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            found = sorted(
+                os.path.join(pattern, name)
+                for name in os.listdir(pattern)
+                if name.lower().endswith(EXTENSIONS)
+            )
+        elif glob.has_magic(pattern):
+            found = sorted(glob.glob(pattern))
+        else:
+            found = [pattern]
+        for path in found:
+            if path not in seen:
+                seen.add(path)
+                paths.append(path)
+    return paths
+
+
+def analyze_files(
+    paths: Iterable[str],
+    chunk_rows: int = CHUNK_ROWS,
+    use_numpy: Optional[bool] = None,
+) -> CalorieAggregator:
+    totals = CalorieAggregator(use_numpy)
+    for path in paths:
+        for columns, skipped in iter_chunks(path, chunk_rows):
+            totals.update(columns, skipped)
+    return totals
+
+
+# -------------------------
+# Command line
+# -------------------------
+def print_report(report: BatchReport, top_users: int = 20) -> None:
+    print(f"{report.rows:,} meals from {len(report.users):,} users", end="")
+    print(f" ({report.skipped:,} rows skipped)" if report.skipped else "")
+    print(f"Daily limit: {report.limit:g}")
+    print(
+        f"\n{'User':<20} {'Days':>6} {'Meals':>7} {'Calories':>11} "
+        f"{'Avg/day':>8} {'Avg/meal':>9} {'Over':>5}  Usual meal"
+    )
+    print("-" * 90)
+    for u in report.users[:top_users]:
+        print(
+            f"{u.user[:20]:<20} {u.days:>6,} {u.meals:>7,} {u.calories:>11,.0f} "
+            f"{u.average_per_day:>8.1f} {u.average_per_meal:>9.1f} "
+            f"{u.breach_days:>5,}  {u.top_meal}"
+        )
+    if len(report.users) > top_users:
+        print(f"... and {len(report.users) - top_users:,} more users")
+    print("-" * 90)
+    print("\nTop meals:")
+    for meal, count, calories in report.top_meals:
+        print(f"  {meal:<30} {count:>9,} times {calories:>13,.0f} calories")
+
+
+def write_daily(path: str, totals: CalorieAggregator, limit: float) -> None:
+    with open(path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(["user", "date", "meals", "calories", "over_limit"])
+        writer.writerows(
+            (user, day, meals, calories, "yes" if calories > limit else "no")
+            for user, day, meals, calories in totals.daily()
+        )
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Per-user calorie analytics over many meal exports"
+    )
+    parser.add_argument(
+        "paths", nargs="+", help="CSV/JSONL files, directories or globs"
+    )
+    parser.add_argument("--limit", type=float, default=DEFAULT_LIMIT)
+    parser.add_argument("--top", type=int, default=10, help="top meals to list")
+    parser.add_argument("--chunk-rows", type=int, default=CHUNK_ROWS)
+    parser.add_argument(
+        "--json", default=None, metavar="FILE", help="also write the report as JSON"
+    )
+    parser.add_argument(
+        "--daily",
+        default=None,
+        metavar="FILE",
+        help="write per-user daily totals (CSV)",
+    )
+    args = parser.parse_args(argv)
+
+    paths = expand_paths(args.paths)
+    if not paths:
+        print("No meal exports found.")
+        sys.exit(1)
+    try:
+        totals = analyze_files(paths, args.chunk_rows)
+    except (OSError, ValueError) as e:
+        print("Error:", e)
+        sys.exit(1)
+
+    report = totals.report(args.limit, args.top)
+    print_report(report)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(asdict(report), f, indent=2)
+        print("Report saved to", args.json)
+    if args.daily:
+        write_daily(args.daily, totals, args.limit)
+        print("Daily totals saved to", args.daily)
+
+
+if __name__ == "__main__":
+    main()
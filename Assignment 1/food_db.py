@@ -0,0 +1,153 @@
+"""
+food_db.py
+
+Food table and autocomplete for the Daily Calorie Tracker.
+
+The table is read from a CSV (name,calories,serving; foods.csv ships
+next to this file) into a sorted prefix array: every name is normalised
+(lower case, single spaces) and the keys are kept sorted, so an exact
+lookup is one binary search and the completions of a prefix are the run
+of keys starting at bisect_left(prefix). Both cost O(log n + results),
+well under a millisecond even for a million foods.
+
+RecentMeals is a small LRU of the meals the user actually logged, with
+their calories. It is consulted before the table, so a home recipe
+missing from the table, or a usual portion, is remembered.
+
+    foods = FoodTable.load()
+    foods.lookup("oats").calories
+    [f.name for f in foods.complete("pa")]   # Palak paneer, Pancakes, ...
+"""
+
+import bisect
+import csv
+import math
+import os
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Iterable, List, Optional, Tuple
+
+DEFAULT_FOODS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "foods.csv")
+RECENT_SIZE = 50
+
+
+def normalize(name: str) -> str:
+    return " ".join(name.lower().split())
+
+
+@dataclass
+class Food:
+    name: str
+    calories: int
+    serving: str = ""
+
+
+class FoodTable:
+    def __init__(self, foods: Iterable[Tuple[str, int, str]]) -> None:
+        rows = {}
+        for name, calories, serving in foods:
+            key = normalize(name)
+            if key and key not in rows:  # the first entry for a name wins
+                rows[key] = (name.strip(), int(calories), serving)
+        self._keys: List[str] = sorted(rows)
+        self._rows: List[Tuple[str, int, str]] = [rows[k] for k in self._keys]
+
+    @classmethod
+    def load(cls, path: str = DEFAULT_FOODS) -> "FoodTable":
+        """Read a name,calories[,serving] CSV; a header row is optional."""
+
+        def rows():
+            with open(path, newline="", encoding="utf-8") as f:
+                for row in csv.reader(f):
+                    if len(row) < 2:
+                        continue
+                    try:
+                        calories = float(row[1])
+                    except ValueError:
+                        continue  # the header, or a bad row
+                    if not math.isfinite(calories):
+                        continue  # "inf" or "nan" is as bad as any other row
+                    yield row[0], int(calories), row[2].strip() if len(row) > 2 else ""
+
+        return cls(rows())
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def lookup(self, name: str) -> Optional[Food]:
+        key = normalize(name)
+        i = bisect.bisect_left(self._keys, key)
+        if i < len(self._keys) and self._keys[i] == key:
+            return Food(*self._rows[i])
+        return None
+
+    def complete(self, prefix: str, limit: int = 10) -> List[Food]:
+        """Up to ``limit`` foods whose name starts with ``prefix``, A to Z."""
+        key = normalize(prefix)
+        keys = self._keys
+        i = bisect.bisect_left(keys, key)
+        found = []
+        while i < len(keys) and len(found) < limit and keys[i].startswith(key):
+            found.append(Food(*self._rows[i]))
+            i += 1
+        return found
+
+
+class RecentMeals:
+    """LRU of recently logged meals: normalised name -> Food."""
+
+    def __init__(self, size: int = RECENT_SIZE) -> None:
+        self.size = size
+        self._meals: "OrderedDict[str, Food]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._meals)
+
+    def remember(self, name: str, calories: int) -> None:
+        key = normalize(name)
+        self._meals[key] = Food(name.strip(), int(calories))
+        self._meals.move_to_end(key)
+        if len(self._meals) > self.size:
+            self._meals.popitem(last=False)
+
+    def get(self, name: str) -> Optional[Food]:
+        key = normalize(name)
+        food = self._meals.get(key)
+        if food is not None:
+            self._meals.move_to_end(key)
+        return food
+
+    def complete(self, prefix: str, limit: int = 10) -> List[Food]:
+        """Recent meals starting with ``prefix``, most recent first."""
+        key = normalize(prefix)
+        found = []
+        for k in reversed(self._meals):
+            if k.startswith(key):
+                found.append(self._meals[k])
+                if len(found) == limit:
+                    break
+        return found
+
+
+class FoodFinder:
+    """Recent meals first, then the food table."""
+
+    def __init__(self, table: FoodTable, recent: Optional[RecentMeals] = None) -> None:
+        self.table = table
+        self.recent = recent if recent is not None else RecentMeals()
+
+    def resolve(self, name: str) -> Optional[Food]:
+        return self.recent.get(name) or self.table.lookup(name)
+
+    def complete(self, prefix: str, limit: int = 10) -> List[Food]:
+        found = self.recent.complete(prefix, limit)
+        seen = {normalize(f.name) for f in found}
+        for food in self.table.complete(prefix, limit + len(found)):
+            if len(found) == limit:
+                break
+            if normalize(food.name) not in seen:
+                found.append(food)
+        return found
+
+    def remember(self, name: str, calories: int) -> None:
+        self.recent.remember(name, calories)
@@ -0,0 +1,314 @@
+"""
+meal_log.py
+
+Persistent meal history for the Daily Calorie Tracker.
+
+Meals are appended, never rewritten, to a tab-separated log with one line
+per meal:
+
+    2025-11-08T13:05:00<TAB>650<TAB>Paneer wrap
+
+A small sidecar index (calorie_log.idx) maps each date to the byte
+ranges holding its meals, plus that day's meal count and calories. From
+those daily totals the log keeps weekly (ISO week) and monthly rollups,
+so totals and averages for any week, month or date range never re-read
+the log; only meals_on() seeks to the lines of the day it is asked for.
+
+The index is a cache. It records how many log bytes it covers, and on
+open only the lines appended since then are scanned (all of them if the
+index is missing or the log was truncated).
+
+    with MealLog("calorie_log.tsv") as log:
+        log.add("Oats", 350)
+        log.week(date.today()).average_per_day
+"""
+
+import bisect
+import json
+import os
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+DEFAULT_LOG = "calorie_log.tsv"
+INDEX_VERSION = 1
+
+
+@dataclass
+class Meal:
+    when: datetime
+    name: str
+    calories: int
+
+
+@dataclass
+class DayTotal:
+    day: date
+    meals: int
+    calories: int
+
+
+@dataclass
+class Rollup:
+    label: str  # e.g. "2025-W45", "2025-11" or "2025-11-01..2025-11-30"
+    days: int  # days with at least one meal
+    meals: int
+    calories: int
+
+    @property
+    def average_per_day(self) -> float:
+        return self.calories / self.days if self.days else 0.0
+
+    @property
+    def average_per_meal(self) -> float:
+        return self.calories / self.meals if self.meals else 0.0
+
+
+def _format_line(when: datetime, name: str, calories: int) -> bytes:
+    # tabs and newlines would break the line format
+    clean = " ".join(name.split())
+    stamp = when.isoformat(timespec="seconds")
+    return f"{stamp}\t{int(calories)}\t{clean}\n".encode()
+
+
+def _parse_line(line: bytes) -> Meal:
+    stamp, calories, name = line.decode().rstrip("\n").split("\t", 2)
+    return Meal(datetime.fromisoformat(stamp), name, int(calories))
+
+
+class MealLog:
+    def __init__(
+        self,
+        path: str = DEFAULT_LOG,
+        index_path: Optional[str] = None,
+        durable: bool = False,
+    ) -> None:
+        self.path = path
+        self.index_path = index_path or os.path.splitext(path)[0] + ".idx"
+        self.durable = durable  # fsync after every append
+        # "YYYY-MM-DD" -> [meals, calories, [[start, end], ...]]
+        self._days: Dict[str, list] = {}
+        self._dates: List[str] = []  # sorted keys of _days
+        # [days, meals, calories] per (ISO year, week) and per (year, month)
+        self._weeks: Dict[Tuple[int, int], list] = {}
+        self._months: Dict[Tuple[int, int], list] = {}
+        self._indexed = 0  # log bytes covered by _days
+        self._dirty = False
+        self._load_index()
+        self._catch_up()
+        self._file = open(self.path, "ab")
+
+    # -- index upkeep --
+    def _load_index(self) -> None:
+        try:
+            with open(self.index_path) as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        try:
+            size = os.path.getsize(self.path)
+        except OSError:
+            size = 0
+        if data.get("version") != INDEX_VERSION or data.get("log_bytes", 0) > size:
+            return  # stale: rebuild from the log
+        self._days = data["days"]
+        self._dates = sorted(self._days)
+        self._indexed = data["log_bytes"]
+        for key, (meals, calories, _) in self._days.items():
+            self._roll(date.fromisoformat(key), 1, meals, calories)
+
+    def _catch_up(self) -> None:
+        """Index the lines appended after the last saved index."""
+        if not os.path.exists(self.path):
+            return
+        torn = False
+        with open(self.path, "rb") as f:
+            f.seek(self._indexed)
+            offset = self._indexed
+            for line in f:
+                if not line.endswith(b"\n"):
+                    torn = True
+                    break
+                try:
+                    meal = _parse_line(line)
+                except ValueError:
+                    pass  # a damaged line is skipped, not fatal
+                else:
+                    self._record(meal.when.date(), meal.calories, offset, len(line))
+                offset += len(line)
+        if torn:
+            # a write cut short by a crash; drop it so the next append
+            # starts on a fresh line
+            os.truncate(self.path, offset)
+        if offset != self._indexed:
+            self._indexed = offset
+            self._dirty = True
+
+    def _roll(self, day: date, days: int, meals: int, calories: int) -> None:
+        year, week, _ = day.isocalendar()
+        for table, key in (
+            (self._weeks, (year, week)),
+            (self._months, (day.year, day.month)),
+        ):
+            totals = table.get(key)
+            if totals is None:
+                totals = table[key] = [0, 0, 0]
+            totals[0] += days
+            totals[1] += meals
+            totals[2] += calories
+
+    def _record(self, day: date, calories: int, offset: int, length: int) -> None:
+        key = day.isoformat()
+        entry = self._days.get(key)
+        new_day = entry is None
+        if new_day:
+            entry = self._days[key] = [0, 0, []]
+            if not self._dates or key > self._dates[-1]:
+                self._dates.append(key)
+            else:
+                bisect.insort(self._dates, key)
+        entry[0] += 1
+        entry[1] += calories
+        spans = entry[2]
+        if spans and spans[-1][1] == offset:
+            spans[-1][1] = offset + length  # the day's meals are contiguous
+        else:
+            spans.append([offset, offset + length])
+        self._roll(day, int(new_day), 1, calories)
+
+    def save_index(self) -> None:
+        if not self._dirty:
+            return
+        tmp = self.index_path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(
+                {
+                    "version": INDEX_VERSION,
+                    "log_bytes": self._indexed,
+                    "days": self._days,
+                },
+                f,
+                separators=(",", ":"),
+            )
+        os.replace(tmp, self.index_path)
+        self._dirty = False
+
+    # -- appends --
+    def add(self, name: str, calories: int, when: Optional[datetime] = None) -> Meal:
+        when = when or datetime.now().replace(microsecond=0)
+        meal = Meal(when, name, int(calories))
+        self.add_many([meal])
+        return meal
+
+    def add_many(self, meals: Iterable[Meal]) -> int:
+        """Append ``meals`` with one write; returns how many were logged."""
+        chunks = []
+        offset = self._indexed
+        for meal in meals:
+            line = _format_line(meal.when, meal.name, meal.calories)
+            self._record(meal.when.date(), meal.calories, offset, len(line))
+            chunks.append(line)
+            offset += len(line)
+        if chunks:
+            self._file.write(b"".join(chunks))
+            self._file.flush()
+            if self.durable:
+                os.fsync(self._file.fileno())
+            self._indexed = offset
+            self._dirty = True
+        return len(chunks)
+
+    # -- queries --
+    def day(self, day: date) -> DayTotal:
+        meals, calories, _ = self._days.get(day.isoformat(), (0, 0, None))
+        return DayTotal(day, meals, calories)
+
+    def days_between(self, start: date, end: date) -> List[DayTotal]:
+        """Totals for each logged day from ``start`` to ``end`` inclusive."""
+        lo = bisect.bisect_left(self._dates, start.isoformat())
+        hi = bisect.bisect_right(self._dates, end.isoformat())
+        days = self._days
+        return [
+            DayTotal(date.fromisoformat(key), days[key][0], days[key][1])
+            for key in self._dates[lo:hi]
+        ]
+
+    def meals_on(self, day: date) -> List[Meal]:
+        entry = self._days.get(day.isoformat())
+        if entry is None:
+            return []
+        self._file.flush()
+        meals = []
+        with open(self.path, "rb") as f:
+            for start, end in entry[2]:
+                f.seek(start)
+                chunk = f.read(end - start)
+                meals.extend(_parse_line(line) for line in chunk.splitlines(True))
+        return meals
+
+    def week(self, day: date) -> Rollup:
+        """The ISO week (Monday to Sunday) containing ``day``."""
+        year, week, _ = day.isocalendar()
+        days, meals, calories = self._weeks.get((year, week), (0, 0, 0))
+        return Rollup(f"{year}-W{week:02d}", days, meals, calories)
+
+    def month(self, year: int, month: int) -> Rollup:
+        days, meals, calories = self._months.get((year, month), (0, 0, 0))
+        return Rollup(f"{year}-{month:02d}", days, meals, calories)
+
+    def range(self, start: date, end: date) -> Rollup:
+        """Totals from ``start`` to ``end`` inclusive.
+
+        Whole months inside the range come from the monthly rollups; only
+        the partial months at either end add up daily totals.
+        """
+        total = [0, 0, 0]
+        cursor = start
+        while cursor <= end:
+            month_end = _next_month(cursor) - timedelta(days=1)
+            if cursor.day == 1 and month_end <= end:
+                parts = [self._months.get((cursor.year, cursor.month), (0, 0, 0))]
+            else:
+                last = min(month_end, end)
+                parts = [
+                    (1, t.meals, t.calories) for t in self.days_between(cursor, last)
+                ]
+            for days, meals, calories in parts:
+                total[0] += days
+                total[1] += meals
+                total[2] += calories
+            cursor = month_end + timedelta(days=1)
+        return Rollup(f"{start.isoformat()}..{end.isoformat()}", *total)
+
+    def recent(self, limit: int) -> List[Meal]:
+        """Up to ``limit`` meals from the latest logged days, newest first."""
+        found: List[Meal] = []
+        for key in reversed(self._dates):
+            found.extend(reversed(self.meals_on(date.fromisoformat(key))))
+            if len(found) >= limit:
+                break
+        return found[:limit]
+
+    def first_day(self) -> Optional[date]:
+        return date.fromisoformat(self._dates[0]) if self._dates else None
+
+    def last_day(self) -> Optional[date]:
+        return date.fromisoformat(self._dates[-1]) if self._dates else None
+
+    # -- lifetime --
+    def close(self) -> None:
+        if not self._file.closed:
+            self._file.close()
+            self.save_index()
+
+    def __enter__(self) -> "MealLog":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def _next_month(day: date) -> date:
+    if day.month == 12:
+        return date(day.year + 1, 1, 1)
+    return date(day.year, day.month + 1, 1)
@@ -3,7 +3,14 @@
 # Project Title: GradeBook Analyzer CLI 
 
 
-import csv
+import math
+import sys
+
+from gradebook_engine import analyze, analyze_stream, load_csv
+from gradebook_export import write_results
+
+# --quiet: print the summary only, not every student
+QUIET = "--quiet" in sys.argv[1:] or "-q" in sys.argv[1:]
 
 print("Welcome to the GradeBook Analyzer!")
 print()
@@ -12,14 +19,44 @@ while True:
     print("Menu:")
     print("1) Manual entry")
     print("2) Load from CSV file")
-    print("3) Exit")
-    choice = input("Enter your choice (1/2/3): ").strip()
+    print("3) Summarise a large CSV file (streaming)")
+    print("4) Exit")
+    choice = input("Enter your choice (1/2/3/4): ").strip()
 
-    if choice == "3":
+    if choice == "4":
         print("Goodbye!")
         break
 
-    students = []
+    if choice == "3":
+        # one pass in chunks: memory stays flat however big the file is
+        file_name = input("Enter CSV file path: ").strip()
+        try:
+            summary = analyze_stream(file_name)
+        except (OSError, UnicodeDecodeError):
+            # UnicodeDecodeError is a ValueError, but it is not "no data"
+            print("File not found or unreadable.")
+            continue
+        except ValueError:
+            print("No data to analyze.")
+            continue
+
+        print("\n------ Analysis Summary ------")
+        print("Students:", summary.count)
+        print("Average:", round(summary.average, 2))
+        if summary.median_exact:
+            print("Median:", summary.median)
+        else:
+            print("Median (approx.):", round(summary.median, 2))
+        print("Highest:", summary.highest[0], "-", summary.highest[1])
+        print("Lowest:", summary.lowest[0], "-", summary.lowest[1])
+        print("Grade Distribution:", summary.grade_counts)
+        print("Passed (>=40):", summary.passed)
+        print("Failed (<40):", summary.failed)
+        print("\nReturning to main menu...\n")
+        continue
+
+    names = []
+    scores = []
 
     if choice == "1":
         try:
@@ -32,25 +69,18 @@ while True:
             name = input("Enter student name: ")
             try:
                 marks = float(input("Enter marks for " + name + ": "))
+                if not math.isfinite(marks):
+                    raise ValueError(marks)
             except:
                 print("Invalid marks, set to 0.")
                 marks = 0
-            students.append([name, marks])
+            names.append(name)
+            scores.append(marks)
 
     elif choice == "2":
         file_name = input("Enter CSV file path: ").strip()
         try:
-            with open(file_name, "r") as f:
-                reader = csv.reader(f)
-                for row in reader:
-                    if len(row) < 2:
-                        continue
-                    name = row[0].strip()
-                    try:
-                        marks = float(row[1].strip())
-                    except:
-                        continue
-                    students.append([name, marks])
+            names, scores = load_csv(file_name)
         except:
             print("File not found or unreadable.")
             continue
@@ -58,78 +88,40 @@ while True:
         print("Invalid choice.")
         continue
 
-    if len(students) == 0:
+    if len(names) == 0:
         print("No data to analyze.")
         continue
 
-    # Calculate average
-    total = 0
-    for s in students:
-        total += s[1]
-    average = total / len(students)
-
-    # Calculate median
-    scores = sorted([s[1] for s in students])
-    mid = len(scores) // 2
-    if len(scores) % 2 == 1:
-        median = scores[mid]
-    else:
-        median = (scores[mid - 1] + scores[mid]) / 2
-
-    # Find highest and lowest
-    highest = students[0]
-    lowest = students[0]
-    for s in students:
-        if s[1] > highest[1]:
-            highest = s
-        if s[1] < lowest[1]:
-            lowest = s
-
-    # Assign grades
-    graded = []
-    for s in students:
-        score = s[1]
-        if score >= 90:
-            grade = "A"
-        elif score >= 80:
-            grade = "B"
-        elif score >= 70:
-            grade = "C"
-        elif score >= 60:
-            grade = "D"
-        else:
-            grade = "F"
-        graded.append([s[0], s[1], grade])
-
-    # Pass/fail lists
-    passed = [s[0] for s in students if s[1] >= 40]
-    failed = [s[0] for s in students if s[1] < 40]
+    # All statistics and grades in one call (see gradebook_engine.py)
+    result = analyze(names, scores)
 
     # Display summary
     print("\n------ Analysis Summary ------")
-    print("Average:", round(average, 2))
-    print("Median:", median)
-    print("Highest:", highest[0], "-", highest[1])
-    print("Lowest:", lowest[0], "-", lowest[1])
-    print("Passed (>=40):", passed)
-    print("Failed (<40):", failed)
-
-    print("\nName\t\tMarks\tGrade")
-    print("--------------------------------")
-    for g in graded:
-        print(g[0], "\t", g[1], "\t", g[2])
-    print("--------------------------------")
+    print("Average:", round(result.average, 2))
+    print("Median:", result.median)
+    print("Highest:", result.highest[0], "-", result.highest[1])
+    print("Lowest:", result.lowest[0], "-", result.lowest[1])
+    if QUIET:
+        print("Passed (>=40):", len(result.passed))
+        print("Failed (<40):", len(result.failed))
+    else:
+        print("Passed (>=40):", result.passed)
+        print("Failed (<40):", result.failed)
+
+        print("\nName\t\tMarks\tGrade")
+        print("--------------------------------")
+        # one write for the whole table instead of a print per student
+        rows = zip(names, scores, result.grades)
+        sys.stdout.write("".join(f"{n} \t {m} \t {g}\n" for n, m, g in rows))
+        print("--------------------------------")
 
     # Save option
     save = input("\nDo you want to save results to CSV? (yes/no): ").strip().lower()
     if save == "yes":
+        print("(.csv, .jsonl, .json for columns or .parquet; add .gz to compress)")
         out_file = input("Enter filename (example: results.csv): ").strip()
         try:
-            with open(out_file, "w", newline="") as f:
-                writer = csv.writer(f)
-                writer.writerow(["Name", "Marks", "Grade"])
-                for g in graded:
-                    writer.writerow(g)
+            write_results(out_file, names, scores, result.grades)
             print("Results saved to", out_file)
         except:
             print("Error saving file.")
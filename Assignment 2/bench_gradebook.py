@@ -0,0 +1,282 @@
+"""
+bench_gradebook.py
+
+Compares the GradeBook Analyzer's original per-statistic loops with
+gradebook_engine on a generated CSV export.
+
+Usage:
+    python bench_gradebook.py analyze --rows 1000000
+    python bench_gradebook.py stream --sizes 100000 1000000 3000000
+    python bench_gradebook.py batch --files 32 --rows 100000 --workers 1 2 4 8
+    python bench_gradebook.py export --rows 1000000
+"""
+
+import argparse
+import csv
+import os
+import random
+import tempfile
+import time
+import tracemalloc
+
+import gradebook_engine
+import gradebook_export
+from gradebook_batch import analyze_files
+from gradebook_engine import analyze, analyze_stream, load_csv
+from gradebook_export import write_results
+
+
+# -------------------------
+# Helpers
+# -------------------------
+def write_marks_csv(path: str, rows: int, seed: int = 1) -> None:
+    rng = random.Random(seed)
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerows(
+            (f"student{i}", round(rng.uniform(0, 100), 1)) for i in range(rows)
+        )
+
+
+def legacy_load(file_name: str) -> list:
+    """The menu's original CSV reader: a list of [name, marks] rows."""
+    students = []
+    with open(file_name, "r") as f:
+        reader = csv.reader(f)
+        for row in reader:
+            if len(row) < 2:
+                continue
+            name = row[0].strip()
+            try:
+                marks = float(row[1].strip())
+            except ValueError:
+                continue
+            students.append([name, marks])
+    return students
+
+
+def legacy_analyze(students: list) -> tuple:
+    """The menu's original analysis loops, unchanged."""
+    total = 0
+    for s in students:
+        total += s[1]
+    average = total / len(students)
+
+    scores = sorted([s[1] for s in students])
+    mid = len(scores) // 2
+    if len(scores) % 2 == 1:
+        median = scores[mid]
+    else:
+        median = (scores[mid - 1] + scores[mid]) / 2
+
+    highest = students[0]
+    lowest = students[0]
+    for s in students:
+        if s[1] > highest[1]:
+            highest = s
+        if s[1] < lowest[1]:
+            lowest = s
+
+    graded = []
+    for s in students:
+        score = s[1]
+        if score >= 90:
+            grade = "A"
+        elif score >= 80:
+            grade = "B"
+        elif score >= 70:
+            grade = "C"
+        elif score >= 60:
+            grade = "D"
+        else:
+            grade = "F"
+        graded.append([s[0], s[1], grade])
+
+    passed = [s[0] for s in students if s[1] >= 40]
+    failed = [s[0] for s in students if s[1] < 40]
+    return average, median, highest, lowest, graded, passed, failed
+
+
+def timed(fn, *args, **kwargs):
+    t0 = time.perf_counter()
+    result = fn(*args, **kwargs)
+    return result, time.perf_counter() - t0
+
+
+# -------------------------
+# Benchmarks
+# -------------------------
+def bench_analyze(rows: int) -> None:
+    with tempfile.TemporaryDirectory() as d:
+        path = os.path.join(d, "marks.csv")
+        write_marks_csv(path, rows)
+
+        students, t_load = timed(legacy_load, path)
+        legacy, t_analyze = timed(legacy_analyze, students)
+        results = [("legacy loops", t_load, t_analyze)]
+
+        (names, scores), t_load = timed(load_csv, path)
+        backends = [False] + ([True] if gradebook_engine.np is not None else [])
+        for use_numpy in backends:
+            result, t_analyze = timed(analyze, names, scores, use_numpy=use_numpy)
+            results.append((f"engine ({result.backend})", t_load, t_analyze))
+            # same answers as the loops they replace
+            average, median, highest, lowest, graded, passed, failed = legacy
+            assert abs(result.average - average) < 1e-6
+            assert result.median == median
+            assert result.highest == tuple(highest)
+            assert result.lowest == tuple(lowest)
+            assert result.grades == [g[2] for g in graded]
+            assert result.passed == passed and result.failed == failed
+
+    print(f"{rows:,} rows")
+    print(f"{'':>18} {'load s':>8} {'analyze s':>10} {'total s':>8}")
+    for label, t_load, t_analyze in results:
+        print(
+            f"{label:>18} {t_load:>8.2f} {t_analyze:>10.3f} "
+            f"{t_load + t_analyze:>8.2f}"
+        )
+    if gradebook_engine.np is None:
+        print("(NumPy not installed: only the pure-Python engine was measured)")
+
+
+def load_and_analyze(path: str):
+    names, scores = load_csv(path)
+    return analyze(names, scores)
+
+
+def bench_stream(sizes: list) -> None:
+    print(
+        f"{'rows':>10} {'in-memory s':>12} {'peak MB':>8} "
+        f"{'streaming s':>12} {'peak MB':>8}"
+    )
+    for rows in sizes:
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "marks.csv")
+            write_marks_csv(path, rows)
+            measured = []
+            for fn in (load_and_analyze, analyze_stream):
+                tracemalloc.start()
+                result, elapsed = timed(fn, path)
+                peak = tracemalloc.get_traced_memory()[1]
+                tracemalloc.stop()
+                measured.append((result, elapsed, peak))
+        (full, t_full, peak_full), (summary, t_stream, peak_stream) = measured
+        assert summary.median == full.median and summary.median_exact
+        print(
+            f"{rows:>10,} {t_full:>12.2f} {peak_full / 1e6:>8.1f} "
+            f"{t_stream:>12.2f} {peak_stream / 1e6:>8.1f}"
+        )
+
+
+def bench_batch(files: int, rows: int, workers: list) -> None:
+    with tempfile.TemporaryDirectory() as d:
+        paths = []
+        for i in range(files):
+            path = os.path.join(d, f"section{i:03d}.csv")
+            write_marks_csv(path, rows, seed=i)
+            paths.append(path)
+
+        print(f"{files} files x {rows:,} rows, {os.cpu_count()} CPU(s)")
+        print(f"{'workers':>8} {'seconds':>8} {'rows/s':>12} {'speedup':>8}")
+        baseline = None
+        expected = None
+        for n in workers:
+            (_, total), elapsed = timed(analyze_files, paths, n)
+            summary = total.summary()
+            if expected is None:
+                expected = summary
+            # merging in file order gives the same answer for any pool size
+            assert summary == expected
+            baseline = baseline or elapsed
+            print(
+                f"{n:>8} {elapsed:>8.2f} {files * rows / elapsed:>12,.0f} "
+                f"{baseline / elapsed:>7.2f}x"
+            )
+
+
+def legacy_save(path: str, graded: list) -> None:
+    """The menu's original save loop: one writerow per student."""
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["Name", "Marks", "Grade"])
+        for g in graded:
+            writer.writerow(g)
+
+
+def bench_export(rows: int) -> None:
+    rng = random.Random(2)
+    names = [f"student{i}" for i in range(rows)]
+    scores = [round(rng.uniform(0, 100), 1) for _ in range(rows)]
+    grades = analyze(names, scores, use_numpy=False).grades
+    graded = [list(r) for r in zip(names, scores, grades)]
+
+    files = [
+        "results.csv",
+        "results.csv.gz",
+        "results.jsonl",
+        "results.jsonl.gz",
+        "results.json",
+        "results.json.gz",
+    ]
+    if gradebook_export.pyarrow is not None:
+        files.append("results.parquet")
+
+    print(f"{rows:,} rows")
+    print(f"{'output':>22} {'seconds':>8} {'rows/s':>12} {'MB':>7}")
+    with tempfile.TemporaryDirectory() as d:
+        path = os.path.join(d, "legacy.csv")
+        _, elapsed = timed(legacy_save, path, graded)
+        size = os.path.getsize(path) / 1e6
+        label = "writerow loop (csv)"
+        print(f"{label:>22} {elapsed:>8.2f} {rows / elapsed:>12,.0f} {size:>7.1f}")
+        for name in files:
+            path = os.path.join(d, name)
+            _, elapsed = timed(write_results, path, names, scores, grades)
+            size = os.path.getsize(path) / 1e6
+            print(f"{name:>22} {elapsed:>8.2f} {rows / elapsed:>12,.0f} {size:>7.1f}")
+
+    # console output, as the menu prints the table (to /dev/null here)
+    with open(os.devnull, "w") as sink:
+        t0 = time.perf_counter()
+        for g in graded:
+            print(g[0], "\t", g[1], "\t", g[2], file=sink)
+        t_print = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        sink.write("".join(f"{n} \t {m} \t {g}\n" for n, m, g in graded))
+        t_write = time.perf_counter() - t0
+    print(f"{'table: print per row':>22} {t_print:>8.2f} {rows / t_print:>12,.0f}")
+    print(f"{'table: one write':>22} {t_write:>8.2f} {rows / t_write:>12,.0f}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="GradeBook Analyzer benchmarks")
+    sub = parser.add_subparsers(dest="bench", required=True)
+
+    p = sub.add_parser("analyze", help="original loops vs the analysis engine")
+    p.add_argument("--rows", type=int, default=1_000_000)
+
+    p = sub.add_parser("stream", help="in-memory analysis vs streaming summary")
+    p.add_argument("--sizes", type=int, nargs="+", default=[100_000, 1_000_000])
+
+    p = sub.add_parser("batch", help="multi-file batch scaling over pool sizes")
+    p.add_argument("--files", type=int, default=32)
+    p.add_argument("--rows", type=int, default=100_000)
+    p.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+
+    p = sub.add_parser("export", help="rows/s for each results output format")
+    p.add_argument("--rows", type=int, default=1_000_000)
+
+    args = parser.parse_args()
+    if args.bench == "analyze":
+        bench_analyze(args.rows)
+    elif args.bench == "stream":
+        bench_stream(args.sizes)
+    elif args.bench == "export":
+        bench_export(args.rows)
+    elif args.bench == "batch":
+        bench_batch(args.files, args.rows, args.workers)
+
+
+if __name__ == "__main__":
+    main()
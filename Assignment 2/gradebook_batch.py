@@ -0,0 +1,150 @@
+"""
+gradebook_batch.py
+
+Batch mode for the GradeBook Analyzer: summarise many CSV files at once.
+
+Each file is read in one streaming pass by a worker process, which sends
+back its partial aggregates (a gradebook_engine.StreamingStats). These
+are small and mergeable, so the parent prints one report per file plus a
+combined report without ever holding the rows themselves.
+
+Usage:
+    python gradebook_batch.py sections/ --workers 8
+    python gradebook_batch.py "exports/*.csv" --json report.json
+"""
+
+import argparse
+import glob
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from gradebook_engine import StreamingStats, iter_csv_chunks
+
+
+def expand_paths(patterns: Iterable[str]) -> List[str]:
+    """Files named by each argument: a directory (its *.csv), a glob or a file."""
+    paths: List[str] = []
+    seen = set()
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            found = sorted(glob.glob(os.path.join(pattern, "*.csv")))
+        elif glob.has_magic(pattern):
+            found = sorted(glob.glob(pattern))
+        else:
+            found = [pattern]
+        for path in found:
+            if path not in seen:
+                seen.add(path)
+                paths.append(path)
+    return paths
+
+
+def summarize_file(path: str) -> Tuple[str, Optional[StreamingStats], str]:
+    """Worker: (path, partial aggregates, error message) for one file."""
+    stats = StreamingStats()
+    try:
+        for names, scores in iter_csv_chunks(path):
+            stats.update(names, scores)
+    except (OSError, UnicodeDecodeError) as e:
+        return path, None, str(e)
+    return path, stats, ""
+
+
+def analyze_files(
+    paths: List[str], workers: Optional[int] = None
+) -> Tuple[List[Tuple[str, Optional[StreamingStats], str]], StreamingStats]:
+    """Summarise ``paths`` in parallel; returns per-file results and the total.
+
+    Results come back in ``paths`` order, so ties for highest/lowest go to
+    the earliest file just as if the files were concatenated.
+    """
+    if workers is None:
+        workers = os.cpu_count() or 1
+    if workers <= 1 or len(paths) <= 1:
+        results = [summarize_file(p) for p in paths]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(summarize_file, paths))
+
+    total = StreamingStats()
+    for _, stats, _ in results:
+        if stats is not None:
+            total.merge(stats)
+    return results, total
+
+
+def report_dict(stats: StreamingStats) -> Dict:
+    if not stats.count:
+        return {"count": 0}
+    return asdict(stats.summary())
+
+
+def print_report(results, total: StreamingStats) -> None:
+    print(
+        f"{'File':<32} {'Students':>9} {'Average':>8} {'Median':>8} "
+        f"{'Lowest':>7} {'Highest':>8} {'Passed':>7}"
+    )
+    print("-" * 85)
+    for path, stats, error in list(results) + [("TOTAL", total, "")]:
+        label = os.path.basename(path)[:32]
+        if error:
+            print(f"{label:<32} error: {error}")
+            continue
+        if not stats.count:
+            print(f"{label:<32} {0:>9}  (no data)")
+            continue
+        s = stats.summary()
+        median = f"{s.median:.2f}" + ("" if s.median_exact else "~")
+        print(
+            f"{label:<32} {s.count:>9,} {s.average:>8.2f} {median:>8} "
+            f"{s.lowest[1]:>7.1f} {s.highest[1]:>8.1f} "
+            f"{s.passed / s.count:>7.1%}"
+        )
+    if total.count:
+        s = total.summary()
+        print("-" * 85)
+        print("Highest:", s.highest[0], "-", s.highest[1])
+        print("Lowest:", s.lowest[0], "-", s.lowest[1])
+        print("Grade Distribution:", s.grade_counts)
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="Summarise many GradeBook CSV files in parallel"
+    )
+    parser.add_argument("paths", nargs="+", help="CSV files, directories or globs")
+    parser.add_argument(
+        "--workers", type=int, default=None, help="processes (default: CPU count)"
+    )
+    parser.add_argument(
+        "--json", default=None, metavar="FILE", help="also write the reports as JSON"
+    )
+    args = parser.parse_args(argv)
+
+    paths = expand_paths(args.paths)
+    if not paths:
+        print("No CSV files found.")
+        sys.exit(1)
+
+    results, total = analyze_files(paths, args.workers)
+    print_report(results, total)
+
+    if args.json:
+        report = {
+            "files": {
+                path: {"error": error} if error else report_dict(stats)
+                for path, stats, error in results
+            },
+            "total": report_dict(total),
+        }
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+        print("Report saved to", args.json)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,367 @@
+"""
+gradebook_engine.py
+
+Batch analysis engine for the GradeBook Analyzer.
+
+Marks are kept as two columns (names and scores) instead of a list of
+[name, marks] rows, and every statistic is computed in a few whole-column
+passes. NumPy is used when it is installed; otherwise the same results
+come from a pure-Python fallback.
+
+    names, scores = load_csv("marks.csv")
+    result = analyze(names, scores)
+    print(result.average, result.median, result.highest)
+
+For exports too large to hold in memory, analyze_stream() reads the file
+in chunks and keeps only running totals and a bounded score histogram:
+
+    summary = analyze_stream("huge.csv")
+"""
+
+import bisect
+import csv
+import math
+import os
+import sys
+from array import array
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # the fallback below needs only the standard library
+    np = None
+
+# grading.py (shared with Assignment 3) lives in the repository root
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+from grading import DEFAULT_BANDS, TABLE_MAX, BandTable
+
+
+@dataclass
+class Analysis:
+    count: int
+    average: float
+    median: float
+    highest: Tuple[str, float]  # (name, marks); first one on ties
+    lowest: Tuple[str, float]
+    grades: Sequence[str]  # one letter per student, in input order
+    passed: List[str]
+    failed: List[str]
+    backend: str  # "numpy" or "python"
+
+
+def iter_csv_chunks(
+    file_name: str, chunk_rows: int = 65536
+) -> Iterator[Tuple[List[str], array]]:
+    """Yield (names, scores) columns of up to ``chunk_rows`` rows each.
+
+    Rows with fewer than two columns or marks that are not a number are
+    skipped, as the menu always did; so are nan and inf, which no export
+    format can carry.
+    """
+    with open(file_name, "r", newline="") as f:
+        reader = csv.reader(f)
+        while True:
+            names: List[str] = []
+            scores = array("d")
+            add_name = names.append
+            add_score = scores.append
+            isfinite = math.isfinite
+            for row in reader:
+                if len(row) < 2:
+                    continue
+                try:
+                    marks = float(row[1])
+                except ValueError:
+                    continue
+                if not isfinite(marks):
+                    continue
+                add_name(row[0].strip())
+                add_score(marks)
+                if len(names) == chunk_rows:
+                    break
+            if not names:
+                return
+            yield names, scores
+
+
+def load_csv(file_name: str) -> Tuple[List[str], array]:
+    """Read name,marks rows into a names list and an array of scores."""
+    names: List[str] = []
+    scores = array("d")
+    for chunk_names, chunk_scores in iter_csv_chunks(file_name):
+        names.extend(chunk_names)
+        scores.extend(chunk_scores)
+    return names, scores
+
+
+def analyze(
+    names: Sequence[str],
+    scores: Sequence[float],
+    use_numpy: Optional[bool] = None,
+    table: BandTable = DEFAULT_BANDS,
+) -> Analysis:
+    """Compute every summary statistic and the letter grades.
+
+    ``use_numpy`` forces a backend; by default NumPy is used if available.
+    ``table`` holds the grade bands and pass mark (see grading.py).
+    """
+    if len(names) != len(scores):
+        raise ValueError("names and scores must have the same length")
+    if not len(scores):
+        raise ValueError("no data to analyze")
+    if use_numpy is None:
+        use_numpy = np is not None
+    if use_numpy:
+        if np is None:
+            raise RuntimeError("NumPy is not installed")
+        return _analyze_numpy(names, scores, table)
+    return _analyze_python(names, scores, table)
+
+
+def _analyze_numpy(
+    names: Sequence[str], scores: Sequence[float], table: BandTable
+) -> Analysis:
+    arr = np.asarray(scores, dtype=np.float64)
+    hi = int(arr.argmax())
+    lo = int(arr.argmin())
+    bounds = np.asarray(table.bounds, dtype=np.float64)
+    grades = np.asarray(table.letters)[np.searchsorted(bounds, arr, "right")]
+    passing = arr >= table.pass_mark
+    name_arr = np.asarray(names, dtype=object)
+    return Analysis(
+        count=len(arr),
+        average=float(arr.mean()),
+        median=float(np.median(arr)),
+        highest=(names[hi], float(arr[hi])),
+        lowest=(names[lo], float(arr[lo])),
+        grades=grades.tolist(),
+        passed=name_arr[passing].tolist(),
+        failed=name_arr[~passing].tolist(),
+        backend="numpy",
+    )
+
+
+def _analyze_python(
+    names: Sequence[str], scores: Sequence[float], table: BandTable
+) -> Analysis:
+    n = len(scores)
+    ordered = sorted(scores)
+    mid = n // 2
+    median = ordered[mid] if n % 2 else (ordered[mid - 1] + ordered[mid]) / 2
+    # index of the first maximum / minimum, like the strict > / < loops
+    hi = max(range(n), key=scores.__getitem__)
+    lo = min(range(n), key=scores.__getitem__)
+    band = bisect.bisect_right
+    letters, bounds, lookup = table.letters, table.bounds, table.lookup
+    if lookup is not None:
+        grades = [
+            lookup[int(s)] if 0 <= s <= TABLE_MAX else letters[band(bounds, s)]
+            for s in scores
+        ]
+    else:
+        grades = [letters[band(bounds, s)] for s in scores]
+    pass_mark = table.pass_mark
+    passed = [name for name, s in zip(names, scores) if s >= pass_mark]
+    failed = [name for name, s in zip(names, scores) if s < pass_mark]
+    return Analysis(
+        count=n,
+        average=sum(scores) / n,
+        median=median,
+        highest=(names[hi], scores[hi]),
+        lowest=(names[lo], scores[lo]),
+        grades=grades,
+        passed=passed,
+        failed=failed,
+        backend="python",
+    )
+
+
+# -------------------------
+# Streaming statistics
+# -------------------------
+@dataclass
+class StreamSummary:
+    count: int
+    average: float
+    median: float
+    median_exact: bool  # False once the histogram had to be binned
+    highest: Tuple[str, float]
+    lowest: Tuple[str, float]
+    grade_counts: Dict[str, int]
+    passed: int
+    failed: int
+
+
+@dataclass
+class StreamingStats:
+    """Single-pass statistics that use bounded memory.
+
+    Feed it chunks with update(); merge() combines the stats of separate
+    parts of the data (in file order). The median comes from a histogram
+    of distinct scores, which is exact and small for marks with a few
+    decimals. If more than ``max_distinct`` distinct scores show up, the
+    histogram switches to ``bins`` fixed-width bins over 0-100 and the
+    median becomes an estimate within one bin width (0.01 by default).
+    Every other statistic stays exact.
+    """
+
+    table: BandTable = DEFAULT_BANDS
+    max_distinct: int = 200_000
+    bins: int = 10_000
+    count: int = 0
+    total: float = 0.0
+    highest: Optional[Tuple[str, float]] = None
+    lowest: Optional[Tuple[str, float]] = None
+    band_counts: List[int] = field(default_factory=list)  # per table.letters
+    passed: int = 0
+    values: Optional[Counter] = field(default_factory=Counter)  # score -> count
+    binned: Optional[List[int]] = None  # used instead of values once too many
+
+    def __post_init__(self) -> None:
+        if not self.band_counts:
+            self.band_counts = [0] * len(self.table.letters)
+
+    def update(
+        self,
+        names: Sequence[str],
+        scores: Sequence[float],
+        use_numpy: Optional[bool] = None,
+    ) -> None:
+        """Add one chunk of (names, scores)."""
+        if not len(scores):
+            return
+        if use_numpy is None:
+            use_numpy = np is not None
+        if use_numpy:
+            arr = np.asarray(scores, dtype=np.float64)
+            hi, lo = int(arr.argmax()), int(arr.argmin())
+            total = float(arr.sum())
+            distinct, counts = np.unique(arr, return_counts=True)
+            chunk = dict(zip(distinct.tolist(), counts.tolist()))
+        else:
+            hi = scores.index(max(scores))  # first maximum, like the menu
+            lo = scores.index(min(scores))
+            total = sum(scores)
+            chunk = Counter(scores)
+        self._add(len(scores), total, (names[hi], scores[hi]), (names[lo], scores[lo]))
+        self._add_values(chunk)
+
+    def _add(
+        self,
+        count: int,
+        total: float,
+        highest: Tuple[str, float],
+        lowest: Tuple[str, float],
+    ) -> None:
+        self.count += count
+        self.total += total
+        # strict comparisons keep the earliest student on ties
+        if self.highest is None or highest[1] > self.highest[1]:
+            self.highest = (highest[0], float(highest[1]))
+        if self.lowest is None or lowest[1] < self.lowest[1]:
+            self.lowest = (lowest[0], float(lowest[1]))
+
+    def _add_values(self, chunk: Dict[float, int]) -> None:
+        # grade and pass counts per distinct score, not per student
+        band = bisect.bisect_right
+        bands = self.band_counts
+        bounds, pass_mark = self.table.bounds, self.table.pass_mark
+        for value, n in chunk.items():
+            bands[band(bounds, value)] += n
+            if value >= pass_mark:
+                self.passed += n
+        if self.values is not None:
+            self.values.update(chunk)
+            if len(self.values) > self.max_distinct:
+                self._to_bins()
+        else:
+            self._bin(chunk)
+
+    def _to_bins(self) -> None:
+        self.binned = [0] * self.bins
+        values, self.values = self.values, None
+        self._bin(values)
+
+    def _bin(self, chunk: Dict[float, int]) -> None:
+        binned = self.binned
+        last = self.bins - 1
+        scale = self.bins / 100.0
+        for value, n in chunk.items():
+            i = int(value * scale)
+            binned[0 if i < 0 else last if i > last else i] += n
+
+    def merge(self, other: "StreamingStats") -> None:
+        """Fold in the stats of data that came after this part."""
+        if other.table != self.table:
+            raise ValueError("cannot merge stats graded with different bands")
+        if not other.count:
+            return
+        self._add(other.count, other.total, other.highest, other.lowest)
+        for i, n in enumerate(other.band_counts):
+            self.band_counts[i] += n
+        self.passed += other.passed
+        if other.values is not None and self.values is not None:
+            self.values.update(other.values)
+            if len(self.values) > self.max_distinct:
+                self._to_bins()
+            return
+        if self.values is not None:
+            self._to_bins()
+        if other.values is not None:
+            self._bin(other.values)
+        else:
+            for i, n in enumerate(other.binned):
+                self.binned[i] += n
+
+    def _kth(self, k: int) -> float:
+        """The k-th smallest score (0-based), or its bin's midpoint."""
+        seen = 0
+        if self.values is not None:
+            for value in sorted(self.values):
+                seen += self.values[value]
+                if seen > k:
+                    return value
+        width = 100.0 / self.bins
+        for i, n in enumerate(self.binned):
+            seen += n
+            if seen > k:
+                estimate = (i + 0.5) * width
+                return min(max(estimate, self.lowest[1]), self.highest[1])
+        raise IndexError(k)
+
+    def summary(self) -> StreamSummary:
+        if not self.count:
+            raise ValueError("no data to analyze")
+        mid = self.count // 2
+        if self.count % 2:
+            median = self._kth(mid)
+        else:
+            median = (self._kth(mid - 1) + self._kth(mid)) / 2
+        return StreamSummary(
+            count=self.count,
+            average=self.total / self.count,
+            median=median,
+            median_exact=self.values is not None,
+            highest=self.highest,
+            lowest=self.lowest,
+            grade_counts=dict(
+                zip(reversed(self.table.letters), reversed(self.band_counts))
+            ),
+            passed=self.passed,
+            failed=self.count - self.passed,
+        )
+
+
+def analyze_stream(
+    file_name: str,
+    chunk_rows: int = 65536,
+    use_numpy: Optional[bool] = None,
+    table: BandTable = DEFAULT_BANDS,
+) -> StreamSummary:
+    """Summarise a CSV of any size in one pass; memory does not grow with it."""
+    stats = StreamingStats(table)
+    for names, scores in iter_csv_chunks(file_name, chunk_rows):
+        stats.update(names, scores, use_numpy)
+    return stats.summary()
@@ -0,0 +1,119 @@
+"""
+gradebook_export.py
+
+Bulk writers for GradeBook results (name, marks, grade per student).
+
+Rows are written in large batches through a 1 MiB buffer instead of one
+writer call per student. The format follows the file name:
+
+    results.csv       CSV with a Name,Marks,Grade header
+    results.jsonl     one JSON object per student
+    results.json      columnar JSON: {"columns": {"name": [...], ...}}
+    results.parquet   Parquet (needs pyarrow)
+
+Adding ".gz" (e.g. results.csv.gz) gzips the CSV, JSONL and JSON outputs.
+"""
+
+import csv
+import gzip
+import io
+import json
+import math
+from itertools import islice
+from typing import Optional, Sequence
+
+try:
+    import pyarrow
+    import pyarrow.parquet
+except ImportError:  # Parquet output is optional
+    pyarrow = None
+
+BUFFER_SIZE = 1 << 20
+BATCH_ROWS = 50_000
+FORMATS = ("csv", "jsonl", "json", "parquet")
+
+
+def detect_format(path: str) -> tuple:
+    """(format, gzipped) from a file name such as results.csv.gz."""
+    name = path.lower()
+    gzipped = name.endswith(".gz")
+    if gzipped:
+        name = name[:-3]
+    fmt = name.rsplit(".", 1)[-1] if "." in name else "csv"
+    if fmt not in FORMATS:
+        fmt = "csv"
+    return fmt, gzipped
+
+
+def _open_text(path: str, gzipped: bool):
+    if gzipped:
+        raw = gzip.open(path, "wb", compresslevel=6)
+        return io.TextIOWrapper(
+            io.BufferedWriter(raw, BUFFER_SIZE), encoding="utf-8", newline=""
+        )
+    return open(path, "w", encoding="utf-8", newline="", buffering=BUFFER_SIZE)
+
+
+def write_results(
+    path: str,
+    names: Sequence[str],
+    scores: Sequence[float],
+    grades: Sequence[str],
+    fmt: Optional[str] = None,
+    gzipped: Optional[bool] = None,
+) -> int:
+    """Write every student's result to ``path``; returns the row count.
+
+    ``fmt`` and ``gzipped`` default to what the file name says. Marks
+    must be finite: nan and inf have no JSON form and the CSV loader
+    skips them.
+    """
+    detected_fmt, detected_gz = detect_format(path)
+    fmt = fmt or detected_fmt
+    gzipped = detected_gz if gzipped is None else gzipped
+    if fmt not in FORMATS:
+        raise ValueError(f"unknown format {fmt!r}")
+    if not all(map(math.isfinite, scores)):
+        raise ValueError("marks must be finite numbers")
+
+    if fmt == "parquet":
+        if pyarrow is None:
+            raise RuntimeError("Parquet output needs pyarrow")
+        table = pyarrow.table(
+            {"name": list(names), "marks": list(scores), "grade": list(grades)}
+        )
+        pyarrow.parquet.write_table(table, path)
+        return len(names)
+
+    with _open_text(path, gzipped) as f:
+        if fmt == "csv":
+            writer = csv.writer(f)
+            writer.writerow(["Name", "Marks", "Grade"])
+            writer.writerows(zip(names, scores, grades))
+        elif fmt == "jsonl":
+            _write_jsonl(f, names, scores, grades)
+        else:
+            # one array per column; json.dump's C encoder does the work
+            columns = {
+                "name": list(names),
+                "marks": list(scores),
+                "grade": list(grades),
+            }
+            json.dump({"columns": columns}, f, ensure_ascii=False, allow_nan=False)
+    return len(names)
+
+
+def _write_jsonl(f, names, scores, grades) -> None:
+    dumps = json.dumps
+    rows = zip(names, scores, grades)
+    while True:
+        batch = list(islice(rows, BATCH_ROWS))
+        if not batch:
+            return
+        f.write(
+            "".join(
+                f'{{"name": {dumps(n, ensure_ascii=False)}, "marks": {dumps(m)}, '
+                f'"grade": "{g}"}}\n'
+                for n, m, g in batch
+            )
+        )
@@ -0,0 +1,1067 @@
+"""
+bench_library_inventory.py
+
+Micro-benchmarks for library_inventory_single.py.
+
+Usage:
+    python bench_library_inventory.py isbn --sizes 10000 100000 1000000
+    python bench_library_inventory.py title --sizes 100000 500000
+    python bench_library_inventory.py durable --books 100000 --ops 2000
+    python bench_library_inventory.py load --books 1000000
+    python bench_library_inventory.py memory --books 200000
+    python bench_library_inventory.py logging --books 100000 --lookups 200000
+    python bench_library_inventory.py concurrent --threads 1 2 4 8
+    python bench_library_inventory.py http --rps 2000 --duration 10
+    python bench_library_inventory.py backends --books 1000000
+    python bench_library_inventory.py listing --sizes 10000 100000 1000000
+    python bench_library_inventory.py metrics --books 100000 --lookups 500000
+    python bench_library_inventory.py snapshot --books 1000000 --readers 4
+    python bench_library_inventory.py query --sizes 10000 100000 1000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import logging
+import logging.handlers
+import mmap
+import random
+import subprocess
+import sys
+import threading
+import tempfile
+import time
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List
+
+from library_inventory_single import (
+    BinarySnapshot,
+    Book,
+    ColumnarBookStore,
+    FieldIndex,
+    LibraryInventory,
+    binary_to_json,
+    iter_json_array,
+    json_to_binary,
+    metrics,
+    open_inventory,
+    setup_logging,
+)
+
+
+# -------------------------
+# Helpers
+# -------------------------
+def make_books(n: int) -> List[Book]:
+    return [
+        Book(title=f"Title {i}", author=f"Author {i % 997}", isbn=f"978{i:010d}")
+        for i in range(n)
+    ]
+
+
+SYLLABLES = (
+    "ka ri mo la ne tor vin sa el dra gon mir bel tha zu an or pe qui "
+    "ven lo stra ha ru fen ith wy co mar dul"
+).split()
+
+
+def make_words(count: int, seed: int = 1) -> List[str]:
+    rng = random.Random(seed)
+    return [
+        "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4)))
+        for _ in range(count)
+    ]
+
+
+WORDS = make_words(5000)
+
+
+def make_titled_books(n: int, seed: int = 42) -> List[Book]:
+    rng = random.Random(seed)
+    return [
+        Book(
+            title=" ".join(rng.choice(WORDS) for _ in range(rng.randint(2, 5))).title(),
+            author=f"Author {i % 997}",
+            isbn=f"978{i:010d}",
+        )
+        for i in range(n)
+    ]
+
+
+def fresh_inventory(tmp: Path) -> LibraryInventory:
+    return LibraryInventory(json_path=tmp / "books.json")
+
+
+def rate(count: int, seconds: float) -> str:
+    if seconds <= 0:
+        return "inf"
+    return f"{count / seconds:,.0f}/s"
+
+
+# -------------------------
+# Benchmarks
+# -------------------------
+def bench_isbn(sizes: List[int]) -> None:
+    print(f"{'books':>10} {'add':>14} {'lookup hit':>14} {'lookup miss':>14}")
+    for n in sizes:
+        books = make_books(n)
+        with tempfile.TemporaryDirectory() as d:
+            inv = fresh_inventory(Path(d))
+
+            t0 = time.perf_counter()
+            for b in books:
+                inv.add_book(b)
+            t_add = time.perf_counter() - t0
+
+            t0 = time.perf_counter()
+            for b in books:
+                inv.search_by_isbn(b.isbn)
+            t_hit = time.perf_counter() - t0
+
+            t0 = time.perf_counter()
+            for i in range(n):
+                inv.search_by_isbn(f"000{i:010d}")
+            t_miss = time.perf_counter() - t0
+
+        print(
+            f"{n:>10,} {rate(n, t_add):>14} {rate(n, t_hit):>14} "
+            f"{rate(n, t_miss):>14}"
+        )
+
+
+def bench_title(sizes: List[int], queries: int) -> None:
+    rng = random.Random(7)
+    print(
+        f"{'books':>10} {'build ms':>9} {'scan ms/q':>10} {'index ms/q':>11} "
+        f"{'suggest ms/q':>13} {'avg hits':>9}"
+    )
+    for n in sizes:
+        books = make_titled_books(n)
+        qs = []
+        for _ in range(queries):
+            w = rng.choice(WORDS) + " " + rng.choice(WORDS)
+            start = rng.randint(0, len(w) - 4)
+            qs.append(w[start : start + rng.randint(4, 9)])
+
+        with tempfile.TemporaryDirectory() as d:
+            inv = fresh_inventory(Path(d))
+            for b in books:
+                inv.add_book(b)
+
+            # the index is built by the first search; time that on its own
+            t0 = time.perf_counter()
+            inv.search_by_title("warm")
+            t_build = time.perf_counter() - t0
+
+            # the pre-index implementation of search_by_title
+            t0 = time.perf_counter()
+            for q in qs:
+                s = q.strip().lower()
+                [b for b in inv.books if s in b.title.lower()]
+            t_scan = time.perf_counter() - t0
+
+            hits = 0
+            t0 = time.perf_counter()
+            for q in qs:
+                hits += len(inv.search_by_title(q))
+            t_index = time.perf_counter() - t0
+
+            t0 = time.perf_counter()
+            for q in qs:
+                inv.suggest_titles(q)
+            t_suggest = time.perf_counter() - t0
+
+        print(
+            f"{n:>10,} {t_build * 1000:>9.1f} {t_scan * 1000 / queries:>10.2f} "
+            f"{t_index * 1000 / queries:>11.2f} "
+            f"{t_suggest * 1000 / queries:>13.2f} {hits / queries:>9.0f}"
+        )
+
+
+def bench_durable(n_books: int, ops: int, window_ms: float) -> None:
+    books = make_books(n_books)
+    print(f"{n_books:,} books, {ops:,} issue/return calls per journaled mode")
+    print(f"{'mode':<34} {'saves':>14}")
+
+    def run(label: str, count: int, fn) -> None:
+        t0 = time.perf_counter()
+        fn()
+        print(f"{label:<34} {rate(count, time.perf_counter() - t0):>14}")
+
+    for durable in (False, True):
+        with tempfile.TemporaryDirectory() as d:
+            inv = LibraryInventory(json_path=Path(d) / "books.json", durable=durable)
+            for b in books:
+                inv.add_book(b)
+            snapshots = 5
+
+            def full_snapshots() -> None:
+                for _ in range(snapshots):
+                    inv.compact()
+
+            run(f"snapshot (durable={durable})", snapshots, full_snapshots)
+
+    for durable, window in ((False, 0.0), (True, 0.0), (True, window_ms)):
+        with tempfile.TemporaryDirectory() as d:
+            inv = LibraryInventory(
+                json_path=Path(d) / "books.json",
+                durable=durable,
+                compact_every=ops + 1,
+                group_commit_ms=window,
+            )
+            for b in books:
+                inv.add_book(b)
+            inv.compact()
+
+            def issue_return() -> None:
+                for i in range(ops):
+                    isbn = books[(i // 2) % n_books].isbn
+                    if i % 2 == 0:
+                        inv.issue_book_by_isbn(isbn)
+                    else:
+                        inv.return_book_by_isbn(isbn)
+                inv.close()
+
+            label = f"journal (durable={durable}, window={window:g}ms)"
+            run(label, ops, issue_return)
+
+
+LOAD_MODES = ("json.load", "stream", "inventory", "inventory-lazy", "inventory-mmap")
+
+
+def load_child(mode: str, path: Path) -> None:
+    # runs in a fresh interpreter so ru_maxrss is this loader's peak
+    import resource
+
+    t0 = time.perf_counter()
+    if mode == "json.load":
+        # the loader LibraryInventory used before streaming
+        with open(path, "r", encoding="utf-8") as f:
+            books = [Book.from_dict(item) for item in json.load(f)]
+    elif mode == "stream":
+        with open(path, "r", encoding="utf-8") as f:
+            books = [Book.from_dict(item) for item, _, _ in iter_json_array(f)]
+    elif mode == "inventory":
+        books = LibraryInventory(json_path=path).books
+    else:
+        binary = mode == "inventory-mmap"
+        inv = LibraryInventory(json_path=path, lazy=True, binary_snapshot=binary)
+        inv.search_by_isbn(f"978{0:010d}")
+        books = inv.books
+    elapsed = time.perf_counter() - t0
+    peak_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    try:
+        # ru_maxrss carries over the parent's peak through fork + exec
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    peak_kb = int(line.split()[1])
+    except OSError:
+        pass
+    print(f"{elapsed} {peak_kb} {len(books)}")
+
+
+def check_unicode_load(directory: Path) -> None:
+    """Lazy loaders must agree with a full load on non-ASCII records, both
+    raw UTF-8 and the \\u escapes json.dump writes by default."""
+    books = [
+        Book(title="Les Misérables", author="Hugo é", isbn="978-é-1"),
+        Book(title="红楼梦", author="曹雪芹 中", isbn="978中2", status="issued"),
+        Book(title="Plain", author="Ann Lee", isbn="9780000000003"),
+    ]
+    for ensure_ascii in (True, False):
+        path = directory / f"unicode-{ensure_ascii}.json"
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump([b.to_dict() for b in books], f, ensure_ascii=ensure_ascii)
+        want = [b.to_dict() for b in books]
+        for options in ({}, {"lazy": True}, {"lazy": True, "binary_snapshot": True}):
+            inv = LibraryInventory(json_path=path, journal=False, **options)
+            assert inv.search_by_isbn("978中2").author == "曹雪芹 中", options
+            assert inv.author_stats("Hugo é")[0]["total"] == 1, options
+            assert [b.to_dict() for b in inv.iter_books()] == want, options
+            inv.close()
+
+
+def bench_load(n_books: int) -> None:
+    with tempfile.TemporaryDirectory() as d:
+        check_unicode_load(Path(d))
+        path = Path(d) / "books.json"
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump([b.to_dict() for b in make_books(n_books)], f, indent=2)
+        size_mb = path.stat().st_size / 1e6
+        json_to_binary(path)  # so inventory-mmap starts from a fresh .snap
+        print(f"{n_books:,} books, books.json {size_mb:.1f} MB")
+        print(
+            f"{'loader':<16} {'startup s':>10} {'peak RSS MB':>12} "
+            f"{'Books built':>12}"
+        )
+        for mode in LOAD_MODES:
+            out = subprocess.run(
+                [sys.executable, __file__, "_load-child", mode, str(path)],
+                check=True,
+                capture_output=True,
+                text=True,
+            ).stdout.split()
+            elapsed, peak_kb, built = float(out[0]), int(out[1]), int(out[2])
+            print(f"{mode:<16} {elapsed:>10.2f} {peak_kb / 1024:>12.1f} {built:>12,}")
+
+
+def snapshot_reader(path: Path, lookups: int) -> None:
+    # one of several processes mapping the same snapshot at once
+    rng = random.Random()
+    t0 = time.perf_counter()
+    snap = BinarySnapshot(path)
+    t_open = time.perf_counter() - t0
+    n = len(snap)
+    isbns = [f"978{rng.randrange(n):010d}" for _ in range(lookups)]
+    t0 = time.perf_counter()
+    for isbn in isbns:
+        snap.get(isbn)
+    t_get = time.perf_counter() - t0
+    data = snap._map
+    for i in range(0, len(data), mmap.PAGESIZE):
+        data[i]  # fault in every page, as a long-running reader would
+    print("ready", flush=True)
+    sys.stdin.readline()  # wait until every reader has mapped the file
+    rss = pss = 0
+    try:
+        with open("/proc/self/smaps_rollup") as f:
+            for line in f:
+                if line.startswith("Rss:"):
+                    rss = int(line.split()[1])
+                elif line.startswith("Pss:"):
+                    pss = int(line.split()[1])
+    except OSError:
+        pass  # not Linux: memory columns stay 0
+    print(f"{t_open} {t_get} {rss} {pss}", flush=True)
+    sys.stdin.readline()  # stay mapped until the others have measured too
+    snap.close()
+
+
+def bench_snapshot(n_books: int, readers: int, lookups: int) -> None:
+    rng = random.Random(13)
+    books = make_books(n_books)
+    for b in rng.sample(books, n_books // 10):
+        b.status = "issued"
+    probe = [f"978{rng.randrange(n_books):010d}" for _ in range(lookups)]
+    with tempfile.TemporaryDirectory() as d:
+        path = Path(d) / "books.json"
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump([b.to_dict() for b in books], f, indent=2)
+        del books
+        t0 = time.perf_counter()
+        snap_path = json_to_binary(path)
+        t_to_bin = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        binary_to_json(snap_path, Path(d) / "export.json")
+        t_to_json = time.perf_counter() - t0
+        assert (Path(d) / "export.json").read_bytes() == path.read_bytes()
+        print(
+            f"{n_books:,} books: books.json {path.stat().st_size / 1e6:.1f} MB, "
+            f"books.json.snap {snap_path.stat().st_size / 1e6:.1f} MB"
+        )
+        print(
+            f"convert: JSON -> snapshot {t_to_bin:.2f} s, "
+            f"snapshot -> JSON {t_to_json:.2f} s"
+        )
+
+        print(f"\n{'startup (new process)':<24} {'seconds':>8} {'peak RSS MB':>12}")
+        for mode in ("inventory", "inventory-lazy", "inventory-mmap"):
+            out = subprocess.run(
+                [sys.executable, __file__, "_load-child", mode, str(path)],
+                check=True,
+                capture_output=True,
+                text=True,
+            ).stdout.split()
+            print(f"{mode:<24} {float(out[0]):>8.3f} {int(out[1]) / 1024:>12.1f}")
+
+        print(f"\n{'lookup (in process)':<24} {'p50 us':>8} {'p99 us':>8} {'rate':>12}")
+        full = LibraryInventory(json_path=path)
+        with BinarySnapshot(snap_path) as snap:
+            for label, fn in (
+                ("dict index (full load)", full.search_by_isbn),
+                ("mmap binary search", snap.get),
+            ):
+                samples = []
+                clock = time.perf_counter
+                for isbn in probe:
+                    t0 = clock()
+                    fn(isbn)
+                    samples.append(clock() - t0)
+                samples.sort()
+                print(
+                    f"{label:<24} {percentile(samples, 50) * 1e6:>8.1f} "
+                    f"{percentile(samples, 99) * 1e6:>8.1f} "
+                    f"{rate(len(samples), sum(samples)):>12}"
+                )
+            for isbn in probe[:1000]:
+                want = full.search_by_isbn(isbn)
+                assert snap.get(isbn).to_dict() == want.to_dict()
+            assert snap.get("978-missing") is None
+        full.close()
+        del full
+
+        procs = [
+            subprocess.Popen(
+                [
+                    sys.executable,
+                    __file__,
+                    "_snapshot-reader",
+                    str(snap_path),
+                    "--lookups",
+                    str(lookups),
+                ],
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                text=True,
+            )
+            for _ in range(readers)
+        ]
+        for p in procs:
+            assert p.stdout.readline().strip() == "ready"
+        rows = []
+        for p in procs:
+            p.stdin.write("\n")
+            p.stdin.flush()
+            rows.append([float(x) for x in p.stdout.readline().split()])
+        for p in procs:
+            p.stdin.close()
+            p.wait()
+        print(
+            f"\n{readers} reader processes, each with the whole file paged in:"
+            f"\n{'reader':>6} {'open ms':>8} {'lookups':>12} "
+            f"{'RSS MB':>8} {'PSS MB':>8}"
+        )
+        for i, (t_open, t_get, rss, pss) in enumerate(rows):
+            print(
+                f"{i:>6} {t_open * 1000:>8.3f} {rate(lookups, t_get):>12} "
+                f"{rss / 1024:>8.1f} {pss / 1024:>8.1f}"
+            )
+        print("(PSS splits shared pages between the processes mapping them)")
+
+
+@dataclass
+class DictBook:
+    # Book as it was before slots: per-instance __dict__, status as parsed
+    title: str
+    author: str
+    isbn: str
+    status: str = "available"
+
+
+def bench_memory(n_books: int) -> None:
+    rng = random.Random(3)
+    records = [
+        json.dumps(
+            {
+                "title": b.title,
+                "author": b.author,
+                "isbn": b.isbn,
+                "status": "issued" if rng.random() < 0.2 else "available",
+            }
+        )
+        for b in make_titled_books(n_books)
+    ]
+
+    def build_dict_books():
+        return [DictBook(**json.loads(r)) for r in records]
+
+    def build_slotted_books():
+        return [Book.from_dict(json.loads(r)) for r in records]
+
+    def build_columnar():
+        store = ColumnarBookStore()
+        store.extend(Book.from_dict(json.loads(r)) for r in records)
+        return store
+
+    print(f"{n_books:,} books (records parsed from JSON inside the measurement)")
+    print(f"{'representation':<22} {'bytes/book':>11}")
+    for label, build in (
+        ("dataclass + __dict__", build_dict_books),
+        ("slotted Book", build_slotted_books),
+        ("ColumnarBookStore", build_columnar),
+    ):
+        tracemalloc.start()
+        books = build()
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        del books
+        print(f"{label:<22} {current / n_books:>11.1f}")
+
+    # the whole inventory: the store plus everything LibraryInventory keeps
+    # per book; the indexes are built by the first query that needs them
+    print()
+    print(f"{'inventory':<22} {'loaded':>11} {'+find_books':>12} {'+title search':>14}")
+    with tempfile.TemporaryDirectory() as d:
+        path = Path(d) / "books.json"
+        path.write_text("[" + ",".join(records) + "]", encoding="utf-8")
+        sizes = {}
+        for label, columnar in (("object", False), ("columnar", True)):
+            tracemalloc.start()
+            inv = LibraryInventory(json_path=path, columnar=columnar, journal=False)
+            row = [tracemalloc.get_traced_memory()[0]]
+            inv.find_books(author="Author 3")
+            row.append(tracemalloc.get_traced_memory()[0])
+            inv.search_by_title("ka")
+            row.append(tracemalloc.get_traced_memory()[0])
+            tracemalloc.stop()
+            sizes[label] = row
+            del inv
+            loaded, found, titled = (b / n_books for b in row)
+            print(f"{label:<22} {loaded:>11.1f} {found:>12.1f} {titled:>14.1f}")
+        # columnar mode must keep its savings once the inventory is queried
+        assert sizes["columnar"][1] < sizes["object"][1] * 0.75, sizes
+
+
+def bench_logging(n_books: int, lookups: int) -> None:
+    with tempfile.TemporaryDirectory() as d:
+        tmp = Path(d)
+        setup_logging(tmp)
+        inv = fresh_inventory(tmp)
+        books = make_books(n_books)
+        inv.add_books(books)
+        isbns = [books[i % n_books].isbn for i in range(lookups)]
+        root = logging.getLogger()
+
+        def run(label: str) -> None:
+            t0 = time.perf_counter()
+            for isbn in isbns:
+                inv.search_by_isbn(isbn)
+            print(f"{label:<40} {rate(lookups, time.perf_counter() - t0):>14}")
+
+        print(f"{n_books:,} books, {lookups:,} search_by_isbn calls, root level INFO")
+        print(f"{'logging setup':<40} {'lookups':>14}")
+
+        # what every lookup used to cost: INFO record written synchronously
+        queued = [
+            h for h in root.handlers if isinstance(h, logging.handlers.QueueHandler)
+        ]
+        sync_file = logging.FileHandler(tmp / "sync.log", encoding="utf-8")
+        for h in queued:
+            root.removeHandler(h)
+        root.addHandler(sync_file)
+        inv.hot_log_level = logging.INFO
+        run("INFO, synchronous FileHandler")
+        root.removeHandler(sync_file)
+        sync_file.close()
+        for h in queued:
+            root.addHandler(h)
+
+        run("INFO, QueueHandler -> listener thread")
+        inv.hot_log_every = 100
+        run("INFO, 1 in 100 sampled, queued")
+        inv.hot_log_every = 1
+        inv.hot_log_level = logging.DEBUG
+        run("DEBUG hot path (default), filtered")
+
+
+def bench_concurrent(
+    n_books: int, hot: int, threads: List[int], ops: int, read_ratio: float
+) -> None:
+    """Desk terminals hammering a few hot ISBNs while others search.
+
+    Every successful issue/return is tallied per ISBN; with atomic
+    check-and-set the tally must alternate, so issues - returns is 1 for a
+    book that ends up issued and 0 otherwise. Anything else is reported as
+    a double issue (or double return), and fails the run.
+    """
+    books = make_titled_books(n_books)
+    hot_isbns = [b.isbn for b in books[:hot]]
+    print(
+        f"{n_books:,} books, {hot} hot ISBNs, {ops:,} ops per thread, "
+        f"{read_ratio:.0%} searches"
+    )
+    print(f"{'threads':>8} {'ops':>14} {'violations':>11}")
+    failed = []
+    for n_threads in threads:
+        with tempfile.TemporaryDirectory() as d:
+            inv = LibraryInventory(
+                json_path=Path(d) / "books.json",
+                concurrent=True,
+                durable=False,
+                compact_every=10**9,
+            )
+            # fresh Book objects: the previous run left some of these issued
+            inv.add_books(b.to_dict() for b in books)
+            inv.compact()
+            inv.search_by_title("warm")  # build the title index up front
+
+            issued = [0] * hot
+            returned = [0] * hot
+            tally_lock = threading.Lock()
+            start = threading.Barrier(n_threads + 1)
+
+            def desk(seed: int) -> None:
+                rng = random.Random(seed)
+                start.wait()
+                for _ in range(ops):
+                    if rng.random() < read_ratio:
+                        if rng.random() < 0.5:
+                            inv.search_by_isbn(rng.choice(hot_isbns))
+                        else:
+                            inv.search_by_title(rng.choice(WORDS)[:4])
+                        continue
+                    i = rng.randrange(hot)
+                    try:
+                        if rng.random() < 0.5:
+                            inv.issue_book_by_isbn(hot_isbns[i])
+                            with tally_lock:
+                                issued[i] += 1
+                        else:
+                            inv.return_book_by_isbn(hot_isbns[i])
+                            with tally_lock:
+                                returned[i] += 1
+                    except ValueError:
+                        pass
+
+            workers = [
+                threading.Thread(target=desk, args=(seed,)) for seed in range(n_threads)
+            ]
+            for w in workers:
+                w.start()
+            start.wait()
+            t0 = time.perf_counter()
+            for w in workers:
+                w.join()
+            elapsed = time.perf_counter() - t0
+            inv.close()
+
+            violations = sum(
+                1
+                for i, isbn in enumerate(hot_isbns)
+                if issued[i] - returned[i]
+                != (0 if inv.search_by_isbn(isbn).is_available() else 1)
+            )
+        print(f"{n_threads:>8} {rate(n_threads * ops, elapsed):>14} {violations:>11}")
+        if violations:
+            failed.append(n_threads)
+    if failed:
+        sys.exit(f"double issue/return detected with {failed} threads")
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    if not sorted_values:
+        return float("nan")
+    k = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[k]
+
+
+async def _http_load(
+    port: int, rps: float, duration: float, connections: int, isbns: List[str]
+) -> None:
+    """Open-loop load: request k is due at k / rps, whatever came back.
+
+    Each connection pipelines its share of requests; latency is measured
+    from the scheduled send time, so server stalls are not hidden.
+    """
+    total = int(rps * duration)
+    latencies: List[float] = []
+    statuses: Dict[int, int] = {}
+    loop = asyncio.get_running_loop()
+    t_start = loop.time() + 0.2
+
+    def make_request(k: int, rng: random.Random) -> bytes:
+        roll = rng.random()
+        if roll < 0.7:
+            target, method = f"/books/{rng.choice(isbns)}", "GET"
+        elif roll < 0.8:
+            target, method = f"/books?title={rng.choice(WORDS)[:5]}&limit=10", "GET"
+        else:
+            # alternate per book so most issue/return calls succeed
+            isbn = isbns[(k // 2) % len(isbns)]
+            action = "issue" if (k // (2 * len(isbns))) % 2 == 0 else "return"
+            target, method = f"/books/{isbn}/{action}", "POST"
+        return f"{method} {target} HTTP/1.1\r\nHost: bench\r\n\r\n".encode()
+
+    async def connection(c: int) -> None:
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        rng = random.Random(c)
+        due: asyncio.Queue = asyncio.Queue()
+        mine = range(c, total, connections)
+
+        async def send() -> None:
+            for k in mine:
+                at = t_start + k / rps
+                delay = at - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                writer.write(make_request(k, rng))
+                due.put_nowait(at)
+
+        async def receive() -> None:
+            for _ in mine:
+                status_line = await reader.readline()
+                length = 0
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b""):
+                        break
+                    name, _, value = line.decode().partition(":")
+                    if name.lower() == "content-length":
+                        length = int(value)
+                await reader.readexactly(length)
+                latencies.append(loop.time() - await due.get())
+                status = int(status_line.split()[1])
+                statuses[status] = statuses.get(status, 0) + 1
+
+        await asyncio.gather(send(), receive())
+        writer.close()
+
+    await asyncio.gather(*(connection(c) for c in range(connections)))
+    elapsed = loop.time() - t_start
+    latencies.sort()
+    print(f"target {rps:,.0f} req/s over {connections} connections for {duration:g}s")
+    print(
+        f"achieved {total / elapsed:,.0f} req/s, "
+        f"statuses {dict(sorted(statuses.items()))}"
+    )
+    print(
+        f"latency ms: p50 {percentile(latencies, 50) * 1000:.2f}  "
+        f"p99 {percentile(latencies, 99) * 1000:.2f}  "
+        f"max {latencies[-1] * 1000:.2f}"
+    )
+
+
+def bench_http(
+    n_books: int, rps: float, duration: float, connections: int, window_ms: float
+) -> None:
+    with tempfile.TemporaryDirectory() as d:
+        path = Path(d) / "books.json"
+        inv = LibraryInventory(json_path=path)
+        books = make_titled_books(n_books)
+        inv.add_books(books)
+        inv.compact()
+        server = subprocess.Popen(
+            [
+                sys.executable,
+                str(Path(__file__).with_name("library_inventory_single.py")),
+                "--json-path",
+                str(path),
+                "serve",
+                "--port",
+                "0",
+                "--commit-window-ms",
+                str(window_ms),
+            ],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+        )
+        try:
+            banner = server.stdout.readline()
+            port = int(banner.rsplit(":", 1)[1])
+            isbns = [b.isbn for b in books[:1000]]
+            asyncio.run(_http_load(port, rps, duration, connections, isbns))
+        finally:
+            server.terminate()
+            server.wait()
+
+
+def bench_backends(n_books: int, ops: int) -> None:
+    rng = random.Random(11)
+    books = make_titled_books(n_books)
+    hits = [b.isbn for b in rng.sample(books, min(ops, n_books))]
+    queries = []
+    for _ in range(50):
+        w = rng.choice(WORDS)
+        queries.append(w[: rng.randint(4, len(w))] if len(w) > 4 else w)
+
+    print(f"{n_books:,} books, {len(hits):,} lookups and issue/return pairs")
+    print(
+        f"{'backend':>8} {'build s':>8} {'open s':>7} {'size MB':>8} "
+        f"{'lookup':>12} {'title ms/q':>11} {'issue+ret':>12}"
+    )
+    with tempfile.TemporaryDirectory() as d:
+        for backend, name in (("json", "books.json"), ("sqlite", "books.db")):
+            path = Path(d) / name
+            t0 = time.perf_counter()
+            inv = open_inventory(path, backend)
+            inv.add_books(b.to_dict() for b in books)
+            inv.compact()
+            inv.close()
+            t_build = time.perf_counter() - t0
+
+            t0 = time.perf_counter()
+            inv = open_inventory(path, backend, autosave=False)
+            t_open = time.perf_counter() - t0
+
+            t0 = time.perf_counter()
+            for isbn in hits:
+                inv.search_by_isbn(isbn)
+            t_lookup = time.perf_counter() - t0
+
+            inv.search_by_title(queries[0])  # build the lazy title index
+            t0 = time.perf_counter()
+            for q in queries:
+                inv.search_by_title(q)
+            t_title = time.perf_counter() - t0
+
+            t0 = time.perf_counter()
+            for isbn in hits:
+                inv.issue_book_by_isbn(isbn)
+                inv.return_book_by_isbn(isbn)
+            inv.save()
+            t_ops = time.perf_counter() - t0
+            inv.close()
+
+            size = path.stat().st_size / 1e6
+            print(
+                f"{backend:>8} {t_build:>8.2f} {t_open:>7.2f} {size:>8.1f} "
+                f"{rate(len(hits), t_lookup):>12} "
+                f"{t_title * 1000 / len(queries):>11.2f} "
+                f"{rate(len(hits), t_ops):>12}"
+            )
+
+
+def bench_listing(sizes: List[int], page_size: int) -> None:
+    print(
+        f"{'books':>10} {'display_all ms':>15} {'peak MB':>8} "
+        f"{'first page ms':>14} {'peak KB':>8} {'issued walk ms':>15}"
+    )
+    for n in sizes:
+        with tempfile.TemporaryDirectory() as d:
+            inv = fresh_inventory(Path(d))
+            inv.add_books(make_books(n))
+            # a few issued books spread through the catalogue
+            for i in range(0, n, max(1, n // 50)):
+                inv.issue_book_by_isbn(f"978{i:010d}")
+
+            tracemalloc.start()
+            t0 = time.perf_counter()
+            inv.display_all()
+            t_all = time.perf_counter() - t0
+            peak_all = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+            tracemalloc.start()
+            t0 = time.perf_counter()
+            inv.list_books(page_size)
+            t_page = time.perf_counter() - t0
+            peak_page = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+            t0 = time.perf_counter()
+            page = inv.list_books(page_size, status="issued")
+            while page.next_cursor is not None:
+                page = inv.list_books(page_size, page.next_cursor, status="issued")
+            t_issued = time.perf_counter() - t0
+
+        print(
+            f"{n:>10,} {t_all * 1000:>15.1f} {peak_all / 1e6:>8.1f} "
+            f"{t_page * 1000:>14.3f} {peak_page / 1e3:>8.1f} {t_issued * 1000:>15.1f}"
+        )
+
+
+def bench_query(sizes: List[int], queries: int) -> None:
+    print(
+        f"{'books':>10} {'query':<26} {'matches':>8} {'index ms':>9} "
+        f"{'scan ms':>9} {'speedup':>8}"
+    )
+    for n in sizes:
+        rng = random.Random(17)
+        books = make_books(n)
+        books += [
+            Book(title=f"Rare {i}", author="Rare Author", isbn=f"979{i:010d}")
+            for i in range(20)
+        ]
+        with tempfile.TemporaryDirectory() as d:
+            inv = LibraryInventory(
+                json_path=Path(d) / "books.json", durable=False, autosave=False
+            )
+            inv.add_books(books)
+            for b in rng.sample(books, len(books) // 10):
+                inv.issue_book_by_isbn(b.isbn)
+            inv.issue_book_by_isbn(f"979{3:010d}")
+
+            cases = [
+                ("author", None, "author 17"),
+                ("status=issued", "issued", None),
+                ("author + issued", "issued", "AUTHOR 17"),
+                ("author + available", "available", "Author 17"),
+                ("rare author + issued", "issued", "rare author"),
+            ]
+            for label, status, author in cases:
+                key = author.casefold() if author else None
+
+                def scan():
+                    # what client code had to write before find_books()
+                    return [
+                        b
+                        for b in inv.books
+                        if (status is None or b.status == status)
+                        and (key is None or b.author.casefold() == key)
+                    ]
+
+                t0 = time.perf_counter()
+                for _ in range(queries):
+                    found = inv.find_books(status, author)
+                t_index = (time.perf_counter() - t0) / queries
+                reps = max(1, min(queries, 5_000_000 // len(books)))
+                t0 = time.perf_counter()
+                for _ in range(reps):
+                    want = scan()
+                t_scan = (time.perf_counter() - t0) / reps
+                assert [b.isbn for b in found] == [b.isbn for b in want]
+                print(
+                    f"{n:>10,} {label:<26} {len(found):>8,} "
+                    f"{t_index * 1000:>9.3f} {t_scan * 1000:>9.2f} "
+                    f"{t_scan / t_index:>7.0f}x"
+                )
+            inv.close()
+
+        tracemalloc.start()
+        t0 = time.perf_counter()
+        index = FieldIndex()
+        for b in books:
+            index.add(b.isbn, b.author, b.status)
+        t_build = time.perf_counter() - t0
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        print(
+            f"{n:>10,} FieldIndex: {size / len(books):.0f} bytes/book, "
+            f"built in {t_build:.2f} s (under tracemalloc)"
+        )
+
+
+def bench_metrics(n_books: int, lookups: int) -> None:
+    books = make_books(n_books)
+    rng = random.Random(3)
+    isbns = [rng.choice(books).isbn for _ in range(lookups)]
+    with tempfile.TemporaryDirectory() as d:
+        inv = fresh_inventory(Path(d))
+        inv.add_books(books)
+
+        def run() -> float:
+            t0 = time.perf_counter()
+            for isbn in isbns:
+                inv.search_by_isbn(isbn)
+            return time.perf_counter() - t0
+
+        print(f"{n_books:,} books, {lookups:,} search_by_isbn calls")
+        print(f"{'metrics':>18} {'lookups':>14}")
+        print(f"{'off':>18} {rate(lookups, run()):>14}")
+        metrics.enable()
+        print(f"{'on':>18} {rate(lookups, run()):>14}")
+        metrics.disable()
+        print(f"{'off again':>18} {rate(lookups, run()):>14}")
+        metrics.reset()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Library inventory benchmarks")
+    sub = parser.add_subparsers(dest="bench", required=True)
+
+    p = sub.add_parser("isbn", help="add/lookup throughput with the ISBN index")
+    p.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+
+    p = sub.add_parser("title", help="search_by_title latency: scan vs trigram index")
+    p.add_argument("--sizes", type=int, nargs="+", default=[100_000, 500_000])
+    p.add_argument("--queries", type=int, default=50)
+
+    p = sub.add_parser("durable", help="saves per second with and without fsync")
+    p.add_argument("--books", type=int, default=100_000)
+    p.add_argument("--ops", type=int, default=2_000)
+    p.add_argument("--window-ms", type=float, default=5.0)
+
+    p = sub.add_parser("load", help="startup time and peak RSS per loader")
+    p.add_argument("--books", type=int, default=1_000_000)
+
+    p = sub.add_parser("memory", help="bytes per book for each representation")
+    p.add_argument("--books", type=int, default=200_000)
+
+    p = sub.add_parser("logging", help="lookup throughput with logging enabled")
+    p.add_argument("--books", type=int, default=100_000)
+    p.add_argument("--lookups", type=int, default=200_000)
+
+    p = sub.add_parser("concurrent", help="multi-threaded issue/return stress test")
+    p.add_argument("--books", type=int, default=100_000)
+    p.add_argument("--hot", type=int, default=32, help="ISBNs the desks fight over")
+    p.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8])
+    p.add_argument("--ops", type=int, default=20_000, help="operations per thread")
+    p.add_argument("--read-ratio", type=float, default=0.8)
+
+    p = sub.add_parser("http", help="HTTP service p50/p99 latency at a target RPS")
+    p.add_argument("--books", type=int, default=100_000)
+    p.add_argument("--rps", type=float, default=2_000)
+    p.add_argument("--duration", type=float, default=10.0)
+    p.add_argument("--connections", type=int, default=16)
+    p.add_argument("--commit-window-ms", type=float, default=2.0)
+
+    p = sub.add_parser("backends", help="JSON vs SQLite: build, open, query, update")
+    p.add_argument("--books", type=int, default=1_000_000)
+    p.add_argument("--ops", type=int, default=10_000)
+
+    p = sub.add_parser("listing", help="display_all vs the first page of list_books")
+    p.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    p.add_argument("--page-size", type=int, default=20)
+
+    p = sub.add_parser("metrics", help="lookup throughput with metrics off and on")
+    p.add_argument("--books", type=int, default=100_000)
+    p.add_argument("--lookups", type=int, default=500_000)
+
+    p = sub.add_parser("query", help="find_books (author/status index) vs a scan")
+    p.add_argument("--sizes", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    p.add_argument("--queries", type=int, default=200)
+
+    p = sub.add_parser("snapshot", help="binary snapshot: convert, startup, lookups")
+    p.add_argument("--books", type=int, default=1_000_000)
+    p.add_argument("--readers", type=int, default=4)
+    p.add_argument("--lookups", type=int, default=100_000)
+
+    p = sub.add_parser("_snapshot-reader")
+    p.add_argument("path", type=Path)
+    p.add_argument("--lookups", type=int, default=100_000)
+
+    p = sub.add_parser("_load-child")
+    p.add_argument("mode", choices=LOAD_MODES)
+    p.add_argument("path", type=Path)
+
+    args = parser.parse_args()
+
+    if args.bench == "concurrent":
+        # rejected issue/return calls are expected here and log errors
+        logging.disable(logging.ERROR)
+    elif args.bench != "logging":
+        # keep per-call INFO logging out of the measurements
+        logging.disable(logging.INFO)
+
+    if args.bench == "isbn":
+        bench_isbn(args.sizes)
+    elif args.bench == "title":
+        bench_title(args.sizes, args.queries)
+    elif args.bench == "durable":
+        bench_durable(args.books, args.ops, args.window_ms)
+    elif args.bench == "load":
+        bench_load(args.books)
+    elif args.bench == "logging":
+        bench_logging(args.books, args.lookups)
+    elif args.bench == "concurrent":
+        bench_concurrent(args.books, args.hot, args.threads, args.ops, args.read_ratio)
+    elif args.bench == "http":
+        bench_http(
+            args.books, args.rps, args.duration, args.connections, args.commit_window_ms
+        )
+    elif args.bench == "backends":
+        bench_backends(args.books, args.ops)
+    elif args.bench == "listing":
+        bench_listing(args.sizes, args.page_size)
+    elif args.bench == "metrics":
+        bench_metrics(args.books, args.lookups)
+    elif args.bench == "memory":
+        bench_memory(args.books)
+    elif args.bench == "query":
+        bench_query(args.sizes, args.queries)
+    elif args.bench == "snapshot":
+        bench_snapshot(args.books, args.readers, args.lookups)
+    elif args.bench == "_snapshot-reader":
+        snapshot_reader(args.path, args.lookups)
+    elif args.bench == "_load-child":
+        load_child(args.mode, args.path)
+
+
+if __name__ == "__main__":
+    main()
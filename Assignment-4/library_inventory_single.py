@@ -4,19 +4,118 @@ library_inventory_single.py
 
 from __future__ import annotations
 
+import argparse
+import asyncio
+import atexit
+import bisect
+import cProfile
+import csv
+import functools
+import heapq
+import itertools
 import json
 import logging
+import logging.handlers
+import mmap
+import os
+import pstats
+import queue
+import re
+import sqlite3
+import struct
 import sys
+import threading
+import time
 import traceback
-from dataclasses import dataclass, asdict
+from urllib.parse import parse_qs, unquote, urlsplit
+from array import array
+from collections import Counter
+from contextlib import contextmanager, nullcontext
+from dataclasses import dataclass, asdict, field
 from pathlib import Path
-from typing import List, Optional
+from typing import (
+    IO,
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+
+
+logger = logging.getLogger(__name__)
+
+
+# -------------------------
+# Logging setup
+# -------------------------
+_log_listener: Optional[logging.handlers.QueueListener] = None
+
+
+class _ThreadQueueHandler(logging.handlers.QueueHandler):
+    # The listener runs in this process, so the record does not need the
+    # copy + full format QueueHandler does for pickling; just freeze the
+    # message so later changes to the arguments do not leak into the log.
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+def setup_logging(log_dir: Optional[Path] = None) -> None:
+    """Configure logging once per process.
+
+    Records go through a QueueHandler, and a background QueueListener
+    writes them to library.log, so callers never wait on file I/O. Errors
+    are still echoed to the console synchronously. Later calls are no-ops.
+    """
+    global _log_listener
+    if _log_listener is not None:
+        return
+
+    if log_dir is None:
+        # Try to put logs in ./library_manager/logs, fallback to cwd
+        try:
+            log_dir = Path(__file__).parent / "library_manager" / "logs"
+        except NameError:
+            # __file__ may not exist in some environments
+            log_dir = Path.cwd() / "library_manager" / "logs"
+
+    try:
+        log_dir.mkdir(parents=True, exist_ok=True)
+    except Exception:
+        log_dir = Path.cwd() / "library_manager" / "logs"
+        log_dir.mkdir(parents=True, exist_ok=True)
+
+    file_handler = logging.FileHandler(log_dir / "library.log", encoding="utf-8")
+    file_handler.setFormatter(
+        logging.Formatter("%(asctime)s %(levelname)s: %(message)s")
+    )
+    log_queue: queue.SimpleQueue = queue.SimpleQueue()
+    _log_listener = logging.handlers.QueueListener(log_queue, file_handler)
+    _log_listener.start()
+    atexit.register(_log_listener.stop)
+
+    root = logging.getLogger()
+    if not root.handlers:
+        root.setLevel(logging.INFO)
+    root.addHandler(_ThreadQueueHandler(log_queue))
+
+    # Console handler for errors only
+    console = logging.StreamHandler()
+    console.setLevel(logging.ERROR)
+    console.setFormatter(logging.Formatter("%(levelname)s: %(message)s"))
+    root.addHandler(console)
 
 
 # -------------------------
 # Book class
 # -------------------------
-@dataclass
+@dataclass(slots=True)
 class Book:
     title: str
     author: str
@@ -28,8 +127,8 @@ class Book:
         self.title = self.title.strip()
         self.author = self.author.strip()
         self.isbn = self.isbn.strip()
-        if self.status not in ("available", "issued"):
-            self.status = "available"
+        # one shared string per status instead of one per record
+        self.status = "issued" if self.status == "issued" else "available"
 
     def __str__(self) -> str:
         return f"{self.title} — {self.author} (ISBN: {self.isbn}) [{self.status}]"
@@ -60,11 +159,1393 @@ class Book:
         return self.status == "available"
 
 
+@dataclass
+class BookPage:
+    books: List[Book]
+    next_cursor: Optional[str] = None  # None on the last page
+
+
+_STATUSES = ("available", "issued")
+
+
+def _author_key(author: str) -> str:
+    """How authors are compared by every filter, index and backend."""
+    return author.strip().casefold()
+
+
+def _book_filter(status: Optional[str], author: Optional[str]):
+    """Predicate for list_books()/iter_books() filters, or None for no filter."""
+    if status is not None and status not in _STATUSES:
+        raise ValueError(f"Unknown status {status!r}.")
+    author = _author_key(author) if author else None
+    if status is None and author is None:
+        return None
+
+    def match(book: Book) -> bool:
+        if status is not None and book.status != status:
+            return False
+        return author is None or _author_key(book.author) == author
+
+    return match
+
+
+def _check_limit(limit: Optional[int]) -> None:
+    if limit is not None and limit < 0:
+        raise ValueError("limit must not be negative.")
+
+
+@dataclass
+class ImportReport:
+    added: int = 0
+    rejected: List[Tuple[int, str]] = field(default_factory=list)  # (record no, reason)
+
+
+def _coerce_book(item: Any) -> Tuple[Optional[Book], str]:
+    """Turn a bulk-import item into a Book, or return why it was rejected."""
+    if isinstance(item, dict):
+        try:
+            item = Book.from_dict(item)
+        except (AttributeError, TypeError):
+            return None, "fields must be strings"
+    elif not isinstance(item, (Book, BookView)):
+        return None, "not a book record"
+    if not (item.title and item.author and item.isbn):
+        return None, "title, author and isbn are required"
+    return item, ""
+
+
+# -------------------------
+# Columnar book storage
+# -------------------------
+class BookView:
+    """A Book-compatible view of one row in a ColumnarBookStore."""
+
+    __slots__ = ("_store", "_row")
+
+    def __init__(self, store: "ColumnarBookStore", row: int) -> None:
+        self._store = store
+        self._row = row
+
+    @property
+    def title(self) -> str:
+        return self._store._title_at(self._row)
+
+    @property
+    def author(self) -> str:
+        return self._store._author_names[self._store._authors[self._row]]
+
+    @property
+    def isbn(self) -> str:
+        return self._store._isbn_at(self._row)
+
+    @property
+    def status(self) -> str:
+        return "issued" if self._store._is_issued(self._row) else "available"
+
+    @status.setter
+    def status(self, value: str) -> None:
+        self._store._set_issued(self._row, value == "issued")
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (Book, BookView)):
+            return self.to_dict() == other.to_dict()
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return (
+            f"BookView(title={self.title!r}, author={self.author!r}, "
+            f"isbn={self.isbn!r}, status={self.status!r})"
+        )
+
+    def to_dict(self) -> dict:
+        return {
+            "title": self.title,
+            "author": self.author,
+            "isbn": self.isbn,
+            "status": self.status,
+        }
+
+    # behaviour is shared with Book, which only goes through the attributes
+    __str__ = Book.__str__
+    issue = Book.issue
+    return_book = Book.return_book
+    is_available = Book.is_available
+
+
+# ColumnarBookStore row state flags
+_ROW_LIVE = 1  # not removed
+_ROW_INDEXED = 2  # the row get() finds for its ISBN (first live one)
+_ROW_WIDE = 4  # title has non-ASCII characters
+
+
+class ColumnarBookStore:
+    """Compact column-oriented storage for many books.
+
+    Titles and ISBNs live in UTF-8 byte heaps addressed by offsets arrays,
+    authors are interned into an id column, issued/available is one bit
+    per row and a state byte marks removed rows. ISBN lookups go through
+    an open-addressing table of row numbers, so no per-book Python object
+    is kept at all. Rows are handed out as BookView objects, so callers
+    keep using the Book API. It supports the list operations
+    LibraryInventory needs (append, extend, remove, iteration, len) plus
+    get() by ISBN; removed rows are tombstoned.
+    """
+
+    def __init__(self) -> None:
+        self._title_heap = bytearray()
+        self._title_offsets = array("Q", [0])
+        self._isbn_heap = bytearray()
+        self._isbn_offsets = array("Q", [0])
+        self._author_names: List[str] = []
+        self._author_ids: Dict[str, int] = {}
+        self._authors = array("I")
+        self._issued = bytearray()
+        self._bits_lock = threading.Lock()
+        self._state = bytearray()  # _ROW_* flags per row
+        self._wide = array("I")  # rows with a non-ASCII title
+        # ISBN hash table: row + 1 per slot, 0 empty, -1 a removed entry
+        self._slots = array("i", [0]) * 8
+        self._used = 0  # filled and removed slots
+        self._live = 0
+
+    # --- column access ---
+    def _title_at(self, row: int) -> str:
+        start, end = self._title_offsets[row], self._title_offsets[row + 1]
+        return self._title_heap[start:end].decode("utf-8")
+
+    def _isbn_bytes(self, row: int) -> bytes:
+        start, end = self._isbn_offsets[row], self._isbn_offsets[row + 1]
+        return bytes(self._isbn_heap[start:end])
+
+    def _isbn_at(self, row: int) -> str:
+        return self._isbn_bytes(row).decode("utf-8")
+
+    def _is_issued(self, row: int) -> bool:
+        return bool(self._issued[row >> 3] & (1 << (row & 7)))
+
+    def _set_issued(self, row: int, issued: bool) -> None:
+        # rows share bitmap bytes, so concurrent updates need one lock
+        with self._bits_lock:
+            self._set_issued_unlocked(row, issued)
+
+    def _set_issued_unlocked(self, row: int, issued: bool) -> None:
+        if issued:
+            self._issued[row >> 3] |= 1 << (row & 7)
+        else:
+            self._issued[row >> 3] &= ~(1 << (row & 7)) & 0xFF
+
+    # --- ISBN table ---
+    def _slot_of(self, key: bytes) -> int:
+        """Slot holding ``key``, or -1; linear probing from hash(key)."""
+        slots = self._slots
+        mask = len(slots) - 1
+        i = hash(key) & mask
+        while True:
+            entry = slots[i]
+            if entry == 0:
+                return -1
+            if entry > 0 and self._isbn_bytes(entry - 1) == key:
+                return i
+            i = (i + 1) & mask
+
+    def _row_of(self, isbn: str) -> int:
+        slot = self._slot_of(isbn.encode("utf-8"))
+        return -1 if slot < 0 else self._slots[slot] - 1
+
+    def _insert(self, key: bytes, row: int) -> None:
+        if (self._used + 1) * 2 > len(self._slots):
+            self._rehash()
+        slots = self._slots
+        mask = len(slots) - 1
+        i = hash(key) & mask
+        while slots[i] > 0:
+            i = (i + 1) & mask
+        if slots[i] == 0:
+            self._used += 1
+        slots[i] = row + 1
+
+    def _rehash(self) -> None:
+        # sized for the live rows, dropping removed entries
+        size = 8
+        while size < self._live * 4:
+            size *= 2
+        slots = array("i", [0]) * size
+        mask = size - 1
+        used = 0
+        for row in self._indexed_rows():
+            i = hash(self._isbn_bytes(row)) & mask
+            while slots[i]:
+                i = (i + 1) & mask
+            slots[i] = row + 1
+            used += 1
+        self._slots = slots
+        self._used = used
+
+    # --- list-like API ---
+    def __len__(self) -> int:
+        return self._live
+
+    def __iter__(self) -> Iterator[BookView]:
+        for row, state in enumerate(self._state):
+            if state & _ROW_LIVE:
+                yield BookView(self, row)
+
+    def append(self, book) -> None:
+        row = len(self._state)
+        title = book.title
+        self._title_heap += title.encode("utf-8")
+        self._title_offsets.append(len(self._title_heap))
+        key = book.isbn.encode("utf-8")
+        self._isbn_heap += key
+        self._isbn_offsets.append(len(self._isbn_heap))
+
+        author_id = self._author_ids.get(book.author)
+        if author_id is None:
+            author_id = len(self._author_names)
+            self._author_ids[book.author] = author_id
+            self._author_names.append(book.author)
+        self._authors.append(author_id)
+
+        if row & 7 == 0:
+            self._issued.append(0)
+        self._set_issued_unlocked(row, book.status == "issued")
+        state = _ROW_LIVE
+        if not title.isascii():
+            state |= _ROW_WIDE
+            self._wide.append(row)
+        if self._slot_of(key) < 0:
+            state |= _ROW_INDEXED
+            self._insert(key, row)  # before the row exists: a rehash skips it
+        self._state.append(state)
+        self._live += 1
+
+    def extend(self, books) -> None:
+        for b in books:
+            self.append(b)
+
+    def remove(self, book) -> None:
+        slot = self._slot_of(book.isbn.encode("utf-8"))
+        if slot < 0:
+            raise ValueError("ColumnarBookStore.remove(x): x not in store")
+        row = self._slots[slot] - 1
+        self._slots[slot] = -1
+        self._state[row] = 0
+        self._live -= 1
+
+    def iter_from(self, row: int) -> Iterator[Tuple[int, BookView]]:
+        """Live (row, view) pairs from ``row`` on; rows never move."""
+        state = self._state
+        while row < len(state):
+            if state[row] & _ROW_LIVE:
+                yield row, BookView(self, row)
+            row += 1
+
+    def _indexed_rows(self) -> Iterator[int]:
+        for row, state in enumerate(self._state):
+            if state & _ROW_INDEXED:
+                yield row
+
+    def indexed(self) -> Iterator[BookView]:
+        """Rows reachable by ISBN (the first live row per ISBN), in row order."""
+        for row in self._indexed_rows():
+            yield BookView(self, row)
+
+    def get(self, isbn: str) -> Optional[BookView]:
+        row = self._row_of(isbn)
+        return None if row < 0 else BookView(self, row)
+
+    def search_titles(self, substr: str) -> List[BookView]:
+        """Indexed rows whose title contains ``substr`` (case-insensitive),
+        in row order.
+
+        ASCII titles are matched by one find() loop over the title heap,
+        lowercased per query (ASCII lowering keeps every offset); the few
+        non-ASCII titles are lowercased and tested one by one.
+        """
+        if not substr:
+            return list(self.indexed())
+        lowered = substr.lower()
+        state = self._state
+        rows: List[int] = []
+        if lowered.isascii():
+            needle = lowered.encode("ascii")
+            heap, offsets = self._title_heap.lower(), self._title_offsets
+            pos = heap.find(needle)
+            while pos != -1:
+                row = bisect.bisect_right(offsets, pos) - 1
+                end = offsets[row + 1]
+                if pos + len(needle) > end:
+                    # straddles two titles: look again from the next byte
+                    pos = heap.find(needle, pos + 1)
+                    continue
+                if state[row] & (_ROW_INDEXED | _ROW_WIDE) == _ROW_INDEXED:
+                    rows.append(row)
+                pos = heap.find(needle, end)
+        wide = [
+            row
+            for row in self._wide
+            if state[row] & _ROW_INDEXED and lowered in self._title_at(row).lower()
+        ]
+        if wide:
+            rows = sorted(rows + wide)
+        return [BookView(self, row) for row in rows]
+
+    def find(
+        self,
+        status: Optional[str] = None,
+        author: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[BookView]:
+        """Indexed rows matching the filters, in row order.
+
+        Scans the author id column and the issued bitmap instead of keeping
+        per-book postings, so filtering costs no memory beyond the columns.
+        """
+        ids = None
+        if author is not None:
+            key = _author_key(author)
+            names = enumerate(self._author_names)
+            ids = {i for i, name in names if _author_key(name) == key}
+            if not ids:
+                return []
+        want = None if status is None else status == "issued"
+        authors, issued = self._authors, self._issued
+        found: List[BookView] = []
+        if limit is not None and limit <= 0:
+            return found
+        for row in self._indexed_rows():
+            if ids is not None and authors[row] not in ids:
+                continue
+            if want is not None and bool(issued[row >> 3] & (1 << (row & 7))) != want:
+                continue
+            found.append(BookView(self, row))
+            if len(found) == limit:
+                break
+        return found
+
+    def __contains__(self, isbn: str) -> bool:
+        return self._row_of(isbn) >= 0
+
+
+# -------------------------
+# File helpers
+# -------------------------
+def _fsync_dir(path: Path) -> None:
+    # make a rename durable; not supported on every platform
+    if not hasattr(os, "O_DIRECTORY"):
+        return
+    fd = os.open(str(path), os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+_WS = re.compile(r"[ \t\n\r]*")
+
+
+def iter_json_array(
+    f: IO[str], chunk_size: int = 1 << 16
+) -> Iterator[Tuple[object, int, int]]:
+    """Incrementally parse a top-level JSON array from a text file.
+
+    Yields (element, start, end) with character offsets of each element in
+    the stream, holding at most one chunk plus one element in memory. A
+    document that is valid JSON but not an array raises ValueError, as
+    json.load + the list check did; malformed input raises JSONDecodeError.
+    """
+    decoder = json.JSONDecoder()
+    buf = ""
+    base = 0  # stream offset of buf[0]
+    pos = 0
+    eof = False
+
+    def fill() -> None:
+        nonlocal buf, base, pos, eof
+        chunk = f.read(chunk_size)
+        if not chunk:
+            eof = True
+            return
+        base += pos
+        buf = buf[pos:] + chunk
+        pos = 0
+
+    def peek() -> str:
+        nonlocal pos
+        while True:
+            pos = _WS.match(buf, pos).end()
+            if pos < len(buf):
+                return buf[pos]
+            if eof:
+                return ""
+            fill()
+
+    first = peek()
+    if first != "[":
+        rest = buf[pos:] + f.read()
+        json.loads(rest)  # raises JSONDecodeError if it is not JSON at all
+        raise ValueError("Invalid JSON structure for books (expected list).")
+    pos += 1
+
+    expect_value = True
+    while True:
+        c = peek()
+        if c == "]":
+            pos += 1
+            break
+        if c == "":
+            raise json.JSONDecodeError("Unterminated array", buf, pos)
+        if not expect_value:
+            if c != ",":
+                raise json.JSONDecodeError("Expecting ',' delimiter", buf, pos)
+            pos += 1
+            peek()
+        while True:
+            try:
+                value, end = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError:
+                if eof:
+                    raise
+                fill()
+                continue
+            if end == len(buf) and not eof:
+                # the value may carry on in the next chunk
+                fill()
+                continue
+            break
+        yield value, base + pos, base + end
+        pos = end
+        expect_value = False
+
+    if peek() != "":
+        raise json.JSONDecodeError("Extra data", buf, pos)
+
+
+class _LazySnapshot:
+    """ISBN -> byte span index over a books.json snapshot.
+
+    The file is memory-mapped and scanned once, decoded as latin-1 so that
+    character offsets equal byte offsets; a record is parsed into a Book
+    only when take() is called for its ISBN. A record whose ISBN or author
+    is not plain ASCII (raw UTF-8 or escaped) is re-parsed from its
+    UTF-8 bytes during the scan, since latin-1 would garble it.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.spans: Dict[str, Tuple[int, int]] = {}
+        self.order: List[str] = []  # file order of unique ISBNs
+        self.taken: Dict[str, Book] = {}  # records already materialised
+        self.stats = InventoryStats()  # counted during the scan
+        self._file = open(path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            # empty file cannot be mapped; it also has no records
+            self._map = None
+        try:
+            self._scan(path)
+        except Exception:
+            self.close()
+            raise
+
+    def _scan(self, path: Path) -> None:
+        with open(path, "r", encoding="latin-1", newline="") as f:
+            for item, start, end in iter_json_array(f):
+                isbn = str(item.get("isbn", ""))
+                author = str(item.get("author", ""))
+                if not (isbn.isascii() and author.isascii()):
+                    item = json.loads(self._map[start:end].decode("utf-8"))
+                    isbn = str(item.get("isbn", ""))
+                    author = str(item.get("author", ""))
+                isbn = isbn.strip()
+                if isbn not in self.spans:
+                    self.spans[isbn] = (start, end)
+                    self.order.append(isbn)
+                    self.stats.add(
+                        author.strip(),
+                        str(item.get("status", "")).strip() == "issued",
+                    )
+
+    def __contains__(self, isbn: str) -> bool:
+        return isbn in self.spans
+
+    def __len__(self) -> int:
+        return len(self.spans)
+
+    def take(self, isbn: str) -> Book:
+        start, end = self.spans.pop(isbn)
+        book = Book.from_dict(json.loads(self._map[start:end].decode("utf-8")))
+        self.taken[isbn] = book
+        return book
+
+    def discard(self, isbn: str) -> None:
+        self.spans.pop(isbn, None)
+        self.taken.pop(isbn, None)
+
+    def in_order(self) -> Iterator[Book]:
+        """Pending and taken records in file order; pending ones are parsed."""
+        for isbn in self.order:
+            if isbn in self.spans:
+                yield self.take(isbn)
+            elif isbn in self.taken:
+                yield self.taken[isbn]
+
+    def read_stats(self) -> InventoryStats:
+        return self.stats
+
+    def close(self) -> None:
+        if self._map is not None:
+            self._map.close()
+        self._file.close()
+
+
+# Binary snapshot layout (little-endian):
+#   header   magic, version, record size, count, issued, order/heap/stats
+#            offsets, stats length, size and mtime_ns of the source JSON
+#   records  count fixed-width records sorted by UTF-8 ISBN bytes:
+#            heap offset, ISBN/title/author byte lengths, status byte
+#   order    u32 sorted position of each record, in the source file order
+#   heap     ISBN, title and author bytes of each record, back to back
+#   stats    JSON {author: [books, issued]}
+_SNAP_MAGIC = b"LIBSNAP1"
+_SNAP_VERSION = 1
+_SNAP_HEADER = struct.Struct("<8sIIQQQQQQQq")
+_SNAP_RECORD = struct.Struct("<QIIIB3x")
+_SNAP_KEY = struct.Struct("<QI")  # the leading heap offset + ISBN length
+
+
+def _snap_path(json_path: Path) -> Path:
+    return json_path.with_suffix(json_path.suffix + ".snap")
+
+
+def _u32_bytes(values: List[int]) -> bytes:
+    a = array("I", values)
+    if sys.byteorder == "big":
+        a.byteswap()
+    return a.tobytes()
+
+
+def write_binary_snapshot(
+    books: Iterable[Book],
+    snap_path: Path,
+    source: Tuple[int, int] = (0, 0),
+    durable: bool = False,
+) -> int:
+    """Write ``books`` (first ISBN wins) as a binary snapshot; returns the
+    number of records. ``source`` is the (size, mtime_ns) of the JSON file
+    the books came from, so a reader can tell when it has gone stale."""
+    unique: Dict[bytes, Book] = {}
+    for b in books:
+        key = b.isbn.encode("utf-8")
+        if key not in unique:
+            unique[key] = b
+    keys = list(unique)  # file order
+    by_key = sorted(range(len(keys)), key=keys.__getitem__)
+    position = [0] * len(keys)
+    records = bytearray(_SNAP_RECORD.size * len(keys))
+    heap = bytearray()
+    issued = 0
+    stats: Dict[str, List[int]] = {}
+    for pos, i in enumerate(by_key):
+        position[i] = pos
+        book = unique[keys[i]]
+        title = book.title.encode("utf-8")
+        author = book.author.encode("utf-8")
+        is_issued = book.status == "issued"
+        _SNAP_RECORD.pack_into(
+            records,
+            pos * _SNAP_RECORD.size,
+            len(heap),
+            len(keys[i]),
+            len(title),
+            len(author),
+            is_issued,
+        )
+        heap += keys[i]
+        heap += title
+        heap += author
+        issued += is_issued
+        counts = stats.setdefault(book.author, [0, 0])
+        counts[0] += 1
+        counts[1] += is_issued
+    order = _u32_bytes(position)
+    stats_blob = json.dumps(stats, ensure_ascii=False).encode("utf-8")
+    order_off = _SNAP_HEADER.size + len(records)
+    heap_off = order_off + len(order)
+    stats_off = heap_off + len(heap)
+    header = _SNAP_HEADER.pack(
+        _SNAP_MAGIC,
+        _SNAP_VERSION,
+        _SNAP_RECORD.size,
+        len(keys),
+        issued,
+        order_off,
+        heap_off,
+        stats_off,
+        len(stats_blob),
+        source[0],
+        source[1],
+    )
+    tmp_path = snap_path.with_name(snap_path.name + ".tmp")
+    with open(tmp_path, "wb") as f:
+        for part in (header, records, order, heap, stats_blob):
+            f.write(part)
+        if durable:
+            f.flush()
+            os.fsync(f.fileno())
+        if metrics.enabled:
+            metrics.add_bytes("binary_snapshot", f.tell())
+    os.replace(tmp_path, snap_path)
+    if durable:
+        _fsync_dir(snap_path.parent)
+    return len(keys)
+
+
+def json_to_binary(
+    json_path: Path, snap_path: Optional[Path] = None, durable: bool = False
+) -> Path:
+    """Convert a books.json array into a binary snapshot (default
+    ``<json_path>.snap``), streaming the JSON."""
+    json_path = Path(json_path)
+    snap_path = Path(snap_path) if snap_path is not None else _snap_path(json_path)
+    st = json_path.stat()  # before reading: a concurrent rewrite looks stale
+    with open(json_path, "r", encoding="utf-8") as f:
+        books = (Book.from_dict(item) for item, _, _ in iter_json_array(f))
+        write_binary_snapshot(
+            books, snap_path, (st.st_size, st.st_mtime_ns), durable
+        )
+    return snap_path
+
+
+def binary_to_json(snap_path: Path, json_path: Path) -> int:
+    """Write a binary snapshot back out as a books.json array, in the
+    original order; returns the number of books."""
+    json_path = Path(json_path)
+    tmp_path = json_path.with_name(json_path.name + ".tmp")
+    with BinarySnapshot(snap_path) as snap:
+        records = [b.to_dict() for b in snap.iter_books()]
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(records, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, json_path)
+    return len(records)
+
+
+class BinarySnapshot:
+    """Read-only, memory-mapped view of a binary snapshot file.
+
+    Opening reads only the header, so it costs the same for ten books or
+    ten million, and processes that map the same file share its pages
+    through the OS page cache. get() is a binary search over the sorted
+    fixed-width records; a Book is only built for the record asked for.
+
+    For a lazy LibraryInventory it offers the same take()/discard()
+    interface as the JSON span index: taken and discarded ISBNs no longer
+    count as pending, while the file itself is never modified.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self.taken: Dict[str, Book] = {}
+        self._done: Set[str] = set()  # taken or discarded
+        self._file = open(self.path, "rb")
+        try:
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self._file.close()
+            raise ValueError(f"{self.path} is not a library snapshot.") from None
+        try:
+            if len(self._map) < _SNAP_HEADER.size:
+                raise ValueError(f"{self.path} is not a library snapshot.")
+            (
+                magic,
+                version,
+                record_size,
+                self._count,
+                self._issued,
+                self._order_off,
+                self._heap_off,
+                self._stats_off,
+                self._stats_len,
+                size,
+                mtime_ns,
+            ) = _SNAP_HEADER.unpack_from(self._map)
+            if (
+                magic != _SNAP_MAGIC
+                or record_size != _SNAP_RECORD.size
+                or self._stats_off + self._stats_len > len(self._map)
+            ):
+                raise ValueError(f"{self.path} is not a library snapshot.")
+            if version != _SNAP_VERSION:
+                raise ValueError(f"Unsupported snapshot version {version}.")
+        except Exception:
+            self.close()
+            raise
+        self.source = (size, mtime_ns)
+
+    def __enter__(self) -> "BinarySnapshot":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def _find(self, isbn: str) -> int:
+        key = isbn.encode("utf-8")
+        data, unpack = self._map, _SNAP_KEY.unpack_from
+        heap, size = self._heap_off, _SNAP_RECORD.size
+        lo, hi = 0, self._count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            off, n = unpack(data, _SNAP_HEADER.size + mid * size)
+            if data[heap + off : heap + off + n] < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self._count:
+            off, n = unpack(data, _SNAP_HEADER.size + lo * size)
+            if data[heap + off : heap + off + n] == key:
+                return lo
+        return -1
+
+    def _record(self, pos: int) -> Book:
+        off, n_isbn, n_title, n_author, issued = _SNAP_RECORD.unpack_from(
+            self._map, _SNAP_HEADER.size + pos * _SNAP_RECORD.size
+        )
+        start = self._heap_off + off
+        raw = self._map[start : start + n_isbn + n_title + n_author]
+        return Book(
+            title=raw[n_isbn : n_isbn + n_title].decode("utf-8"),
+            author=raw[n_isbn + n_title :].decode("utf-8"),
+            isbn=raw[:n_isbn].decode("utf-8"),
+            status="issued" if issued else "available",
+        )
+
+    def get(self, isbn: str) -> Optional[Book]:
+        """The book stored under ``isbn``, or None; ignores take()/discard()."""
+        pos = self._find(isbn)
+        return self._record(pos) if pos >= 0 else None
+
+    def iter_books(self) -> Iterator[Book]:
+        """Every stored book, in the order of the source JSON file."""
+        order = array("I")
+        order.frombytes(self._map[self._order_off : self._heap_off])
+        if sys.byteorder == "big":
+            order.byteswap()
+        for pos in order:
+            yield self._record(pos)
+
+    def __contains__(self, isbn: str) -> bool:
+        return isbn not in self._done and self._find(isbn) >= 0
+
+    def __len__(self) -> int:
+        return self._count - len(self._done)
+
+    def take(self, isbn: str) -> Book:
+        book = None if isbn in self._done else self.get(isbn)
+        if book is None:
+            raise KeyError(isbn)
+        self._done.add(isbn)
+        self.taken[isbn] = book
+        return book
+
+    def discard(self, isbn: str) -> None:
+        self.taken.pop(isbn, None)
+        if isbn not in self._done and self._find(isbn) >= 0:
+            self._done.add(isbn)
+
+    def in_order(self) -> Iterator[Book]:
+        """Pending and taken records in file order."""
+        for book in self.iter_books():
+            if book.isbn in self.taken:
+                yield self.taken[book.isbn]
+            elif book.isbn not in self._done:
+                self._done.add(book.isbn)
+                self.taken[book.isbn] = book
+                yield book
+
+    def read_stats(self) -> InventoryStats:
+        """Counts of every stored book, read from the stats section."""
+        stats = InventoryStats()
+        stats.total, stats.issued = self._count, self._issued
+        blob = self._map[self._stats_off : self._stats_off + self._stats_len]
+        stats.authors = json.loads(blob.decode("utf-8"))
+        return stats
+
+    def close(self) -> None:
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        self._file.close()
+
+
+def read_import_rows(
+    path: Path, fmt: Optional[str] = None
+) -> Iterator[Tuple[int, Any]]:
+    """Yield (record number, row) from a CSV or JSONL import file.
+
+    CSV files need a header naming title, author and isbn (status is
+    optional). A row is a dict, or an error message string for a record
+    that could not be parsed.
+    """
+    path = Path(path)
+    fmt = (fmt or path.suffix.lstrip(".")).lower()
+    if fmt == "csv":
+        with open(path, "r", encoding="utf-8", newline="") as f:
+            reader = csv.DictReader(f)
+            if reader.fieldnames is None:
+                return
+            reader.fieldnames = [h.strip().lower() for h in reader.fieldnames]
+            missing = {"title", "author", "isbn"} - set(reader.fieldnames)
+            if missing:
+                raise ValueError(f"CSV header is missing: {', '.join(sorted(missing))}")
+            for n, row in enumerate(reader, start=1):
+                yield n, row
+    elif fmt in ("jsonl", "ndjson"):
+        with open(path, "r", encoding="utf-8") as f:
+            for n, line in enumerate(f, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    yield n, json.loads(line)
+                except ValueError as e:
+                    yield n, f"invalid JSON: {e}"
+    else:
+        raise ValueError(f"Unsupported import format: {fmt!r} (use csv or jsonl)")
+
+
+# -------------------------
+# Statistics
+# -------------------------
+class InventoryStats:
+    """Counters kept up to date by the inventory as books change.
+
+    ``authors`` maps author -> [books, issued]. ``issues``/``returns``
+    count successful issue/return calls since the inventory was opened.
+    Reading a total is O(1); nothing here walks the books.
+
+    The counts can start from a ``base`` given as a loader: an mmap'ed
+    snapshot only reads its stored per-author counts when a statistic is
+    first asked for. Until then add/remove/set_issued record deltas.
+    """
+
+    __slots__ = (
+        "total",
+        "issued",
+        "authors",
+        "issues",
+        "returns",
+        "_lock",
+        "_base_loader",
+    )
+
+    def __init__(self, lock: Optional[threading.Lock] = None) -> None:
+        self.total = 0
+        self.issued = 0
+        self.authors: Dict[str, List[int]] = {}
+        self.issues = 0
+        self.returns = 0
+        # only needed when issue/return run in parallel (concurrent mode)
+        self._lock = lock if lock is not None else nullcontext()
+        self._base_loader = None
+
+    def reset(self, books: Iterable[Book], base=None) -> None:
+        """Recount from scratch (on load), optionally on top of ``base``:
+        an InventoryStats, or a function returning one when first needed."""
+        with self._lock:
+            self.total = self.issued = 0
+            self.authors = {}
+            self._base_loader = None
+            if callable(base):
+                self._base_loader = base
+            elif base is not None:
+                self.total, self.issued = base.total, base.issued
+                self.authors = {a: list(c) for a, c in base.authors.items()}
+        for b in books:
+            self.add(b.author, b.status == "issued")
+
+    def _settle(self) -> None:
+        # caller holds the lock; fold the deferred base into the deltas
+        loader, self._base_loader = self._base_loader, None
+        base = loader()
+        self.total += base.total
+        self.issued += base.issued
+        authors = self.authors
+        for a, (books, issued) in base.authors.items():
+            counts = authors.get(a)
+            if counts is None:
+                authors[a] = [books, issued]
+            else:
+                counts[0] += books
+                counts[1] += issued
+                if not counts[0] and not counts[1]:
+                    del authors[a]
+
+    def add(self, author: str, issued: bool) -> None:
+        with self._lock:
+            self.total += 1
+            counts = self.authors.get(author)
+            if counts is None:
+                counts = self.authors[author] = [0, 0]
+            counts[0] += 1
+            if issued:
+                self.issued += 1
+                counts[1] += 1
+
+    def remove(self, author: str, issued: bool) -> None:
+        with self._lock:
+            self.total -= 1
+            counts = self.authors.get(author)
+            if counts is None:  # only while a deferred base is pending
+                counts = self.authors[author] = [0, 0]
+            counts[0] -= 1
+            if issued:
+                self.issued -= 1
+                counts[1] -= 1
+            if not counts[0] and not counts[1]:
+                del self.authors[author]
+
+    def set_issued(self, author: str, issued: bool, counted: bool = True) -> None:
+        """Record a status flip; ``counted`` also bumps issues/returns."""
+        with self._lock:
+            step = 1 if issued else -1
+            self.issued += step
+            counts = self.authors.get(author)
+            if counts is None:  # only while a deferred base is pending
+                counts = self.authors[author] = [0, 0]
+            counts[1] += step
+            if not counts[0] and not counts[1]:
+                del self.authors[author]
+            if counted:
+                if issued:
+                    self.issues += 1
+                else:
+                    self.returns += 1
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            if self._base_loader is not None:
+                self._settle()
+            total, issued = self.total, self.issued
+            return {
+                "total": total,
+                "available": total - issued,
+                "issued": issued,
+                "authors": len(self.authors),
+                "issue_rate": issued / total if total else 0.0,
+                "issues": self.issues,
+                "returns": self.returns,
+            }
+
+    def by_author(
+        self, author: Optional[str] = None, top: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Per-author counts: one author, the ``top`` largest, or all.
+
+        Counts are kept per spelling; ``author`` is matched by _author_key(),
+        so it returns a row for every spelling of that author.
+        """
+        with self._lock:
+            if self._base_loader is not None:
+                self._settle()
+            if author is not None:
+                key = _author_key(author)
+                items = sorted(
+                    ((a, c) for a, c in self.authors.items() if _author_key(a) == key),
+                    key=lambda kv: -kv[1][0],
+                )
+            elif top is not None:
+                items = heapq.nlargest(
+                    top, self.authors.items(), key=lambda kv: kv[1][0]
+                )
+            else:
+                items = sorted(self.authors.items(), key=lambda kv: -kv[1][0])
+            return [
+                {
+                    "author": a,
+                    "total": c[0],
+                    "issued": c[1],
+                    "available": c[0] - c[1],
+                    "issue_rate": c[1] / c[0],
+                }
+                for a, c in items
+            ]
+
+
+# -------------------------
+# Concurrency helpers
+# -------------------------
+class RWLock:
+    """Readers-writer lock.
+
+    Any number of readers may hold it together; a writer holds it alone.
+    Waiting writers stop new readers from entering, so a stream of searches
+    cannot starve add_book. The writing thread may re-enter read() and
+    write(); a reader must not ask for write() or nest read() calls.
+    """
+
+    def __init__(self) -> None:
+        self._cond = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer: Optional[int] = None
+        self._writer_depth = 0
+        self._writers_waiting = 0
+
+    @contextmanager
+    def read(self) -> Iterator[None]:
+        me = threading.get_ident()
+        with self._cond:
+            if self._writer == me:
+                owned = True
+            else:
+                owned = False
+                while self._writer is not None or self._writers_waiting:
+                    self._cond.wait()
+                self._readers += 1
+        try:
+            yield
+        finally:
+            if not owned:
+                with self._cond:
+                    self._readers -= 1
+                    if not self._readers:
+                        self._cond.notify_all()
+
+    @contextmanager
+    def write(self) -> Iterator[None]:
+        me = threading.get_ident()
+        with self._cond:
+            if self._writer != me:
+                self._writers_waiting += 1
+                while self._writer is not None or self._readers:
+                    self._cond.wait()
+                self._writers_waiting -= 1
+                self._writer = me
+            self._writer_depth += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._writer_depth -= 1
+                if not self._writer_depth:
+                    self._writer = None
+                    self._cond.notify_all()
+
+
+# -------------------------
+# TitleIndex class
+# -------------------------
+def _trigrams(text: str) -> Set[str]:
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+class TitleIndex:
+    """Inverted trigram index over lowercased titles, keyed by ISBN.
+
+    Titles are indexed padded as "  title " so that word starts produce
+    their own grams; this lets ranked lookups favour prefix matches.
+    Postings are insertion-ordered dicts, so substring results come back
+    in the order books were added.
+    """
+
+    GRAM = 3
+
+    def __init__(self) -> None:
+        self._titles: Dict[str, str] = {}  # isbn -> lowercased title
+        self._postings: Dict[str, Dict[str, None]] = {}
+
+    def __len__(self) -> int:
+        return len(self._titles)
+
+    @staticmethod
+    def _pad(text: str) -> str:
+        return f"  {text} "
+
+    def add(self, isbn: str, title: str) -> None:
+        if isbn in self._titles:
+            self.remove(isbn)
+        lowered = title.lower()
+        self._titles[isbn] = lowered
+        for g in _trigrams(self._pad(lowered)):
+            self._postings.setdefault(g, {})[isbn] = None
+
+    def remove(self, isbn: str) -> None:
+        lowered = self._titles.pop(isbn, None)
+        if lowered is None:
+            return
+        for g in _trigrams(self._pad(lowered)):
+            posting = self._postings.get(g)
+            if posting is None:
+                continue
+            posting.pop(isbn, None)
+            if not posting:
+                del self._postings[g]
+
+    def clear(self) -> None:
+        self._titles.clear()
+        self._postings.clear()
+
+    def search(self, substr: str) -> List[str]:
+        """Return ISBNs whose title contains substr (case-insensitive)."""
+        s = substr.lower()
+        if len(s) < self.GRAM:
+            # too short to have a gram; scan the pre-lowered titles
+            return [isbn for isbn, t in self._titles.items() if s in t]
+
+        postings = []
+        for g in _trigrams(s):
+            posting = self._postings.get(g)
+            if not posting:
+                return []
+            postings.append(posting)
+        postings.sort(key=len)
+        smallest, rest = postings[0], postings[1:]
+
+        titles = self._titles
+        return [
+            isbn
+            for isbn in smallest
+            if all(isbn in p for p in rest) and s in titles[isbn]
+        ]
+
+    def suggest(
+        self, query: str, limit: int = 10, min_score: float = 0.3
+    ) -> List[Tuple[str, float]]:
+        """Ranked prefix/fuzzy lookup.
+
+        Candidates are scored by trigram overlap (Jaccard). Titles that
+        start with the query rank first, then titles containing it, then
+        the remaining fuzzy matches.
+        """
+        q = query.strip().lower()
+        if not q or limit <= 0:
+            return []
+        q_grams = _trigrams(self._pad(q))
+
+        hits: Counter = Counter()
+        for g in q_grams:
+            posting = self._postings.get(g)
+            if posting:
+                hits.update(posting.keys())
+
+        # only the best-overlapping candidates can make the cut
+        ranked = []
+        for isbn, shared in hits.most_common(max(limit * 20, 200)):
+            title = self._titles[isbn]
+            score = shared / (len(q_grams) + len(_trigrams(self._pad(title))) - shared)
+            if title.startswith(q):
+                tier = 2
+            elif q in title:
+                tier = 1
+            elif score >= min_score:
+                tier = 0
+            else:
+                continue
+            ranked.append((tier, score, isbn))
+
+        ranked.sort(key=lambda r: (-r[0], -r[1]))
+        return [(isbn, score) for _, score, isbn in ranked[:limit]]
+
+
+class FieldIndex:
+    """Secondary indexes on author and status, keyed by ISBN.
+
+    Authors are matched by _author_key(), like every other author filter.
+    Every author and status value has an insertion-ordered posting of
+    ISBN -> value (the Book, or the ISBN itself); a compound query walks
+    the smallest posting and probes the others, so it costs the rarest
+    filter's matches, not the catalogue. Results come back in the order
+    books were added: a status posting that issue/return left out of that
+    order is re-sorted by the next query that walks it.
+
+    With an RWLock (concurrent mode) queries share it and only changes
+    take it alone, so readers never wait for one another.
+    """
+
+    def __init__(self, lock: Optional[RWLock] = None) -> None:
+        # isbn -> (add sequence, author key, status), in add order
+        self._fields: Dict[str, Tuple[int, str, str]] = {}
+        self._authors: Dict[str, Dict[str, Any]] = {}
+        self._statuses: Dict[str, Dict[str, Any]] = {s: {} for s in _STATUSES}
+        self._unsorted: Set[str] = set()  # statuses whose posting needs a sort
+        self._seq = 0
+        # issue/return may run in parallel with queries (concurrent mode)
+        self._rw = lock
+
+    def _reading(self):
+        return self._rw.read() if self._rw is not None else nullcontext()
+
+    def _writing(self):
+        return self._rw.write() if self._rw is not None else nullcontext()
+
+    def __len__(self) -> int:
+        return len(self._fields)
+
+    def add(self, isbn: str, author: str, status: str, value: Any = None) -> None:
+        """Index a book; queries return ``value`` (default: the ISBN)."""
+        if value is None:
+            value = isbn
+        with self._writing():
+            if isbn in self._fields:
+                self._remove(isbn)
+            key = _author_key(author)
+            self._fields[isbn] = (self._seq, key, status)
+            self._seq += 1
+            self._authors.setdefault(key, {})[isbn] = value
+            self._statuses[status][isbn] = value
+
+    def remove(self, isbn: str) -> None:
+        with self._writing():
+            self._remove(isbn)
+
+    def _remove(self, isbn: str) -> None:
+        fields = self._fields.pop(isbn, None)
+        if fields is None:
+            return
+        _, key, status = fields
+        posting = self._authors[key]
+        del posting[isbn]
+        if not posting:
+            del self._authors[key]
+        del self._statuses[status][isbn]
+
+    def set_status(self, isbn: str, status: str) -> None:
+        with self._writing():
+            fields = self._fields.get(isbn)
+            if fields is None or fields[2] == status:
+                return
+            seq, key, old = fields
+            value = self._statuses[old].pop(isbn)
+            posting = self._statuses[status]
+            if posting and self._fields[next(reversed(posting))][0] > seq:
+                self._unsorted.add(status)
+            posting[isbn] = value
+            self._fields[isbn] = (seq, key, status)
+
+    def clear(self) -> None:
+        with self._writing():
+            self._fields.clear()
+            self._authors.clear()
+            for posting in self._statuses.values():
+                posting.clear()
+            self._unsorted.clear()
+
+    def query(
+        self,
+        status: Optional[str] = None,
+        author: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[Any]:
+        """Values of the books matching every given filter, in add order."""
+        with self._reading():
+            postings = []
+            if author is not None:
+                posting = self._authors.get(_author_key(author))
+                if not posting:
+                    return []
+                postings.append(posting)
+            if status is not None:
+                postings.append(self._statuses[status])
+            if not postings:
+                statuses = self._statuses
+                fields = itertools.islice(self._fields.items(), limit)
+                return [statuses[st][isbn] for isbn, (_, _, st) in fields]
+            smallest = min(postings, key=len)
+            rest = [p for p in postings if p is not smallest]
+            if status in self._unsorted and smallest is self._statuses[status]:
+                fields = self._fields
+                ordered = sorted(smallest, key=lambda isbn: fields[isbn][0])
+                smallest = self._statuses[status] = {i: smallest[i] for i in ordered}
+                self._unsorted.discard(status)
+            if not rest:
+                return list(itertools.islice(smallest.values(), limit))
+            found = (
+                value
+                for isbn, value in smallest.items()
+                if all(isbn in p for p in rest)
+            )
+            return list(itertools.islice(found, limit))
+
+
 # -------------------------
 # LibraryInventory class
 # -------------------------
 class LibraryInventory:
-    def __init__(self, json_path: Optional[Path] = None):
+    """In-memory book inventory persisted as books.json.
+
+    With ``journal=True`` (the default) every mutation made through the
+    inventory (add/remove/issue/return) is appended to ``books.json.journal``
+    by save(), so a checkout costs one short write instead of a full JSON
+    rewrite. The journal is replayed on load() and folded back into the
+    books.json snapshot by compact() once it holds ``compact_every`` events.
+    Call compact() after editing ``self.books`` directly.
+
+    Snapshots are written to a temp file and renamed over books.json, so a
+    crash never leaves a truncated snapshot. With ``durable=True`` journal
+    appends and snapshots are fsync'ed before save() returns. A non-zero
+    ``group_commit_ms`` defers the write so that a burst of save() calls
+    within the window shares one durable write; call flush() or close() to
+    force it out.
+
+    ``lazy=True`` only indexes ISBN byte offsets of books.json at startup;
+    a record becomes a Book the first time an ISBN lookup touches it, and
+    ``self.books`` holds just those until a title search, display_all() or
+    compact() calls materialize_all().
+
+    ``binary_snapshot=True`` (lazy mode only) opens ``books.json.snap``
+    instead, a memory-mapped BinarySnapshot, so startup no longer scans
+    books.json at all. The file is rebuilt from books.json whenever it is
+    missing or older than it, and rewritten by compact().
+
+    ``columnar=True`` keeps the books in a ColumnarBookStore instead of a
+    list of Book objects; ``self.books`` then yields BookView rows.
+
+    find_books() answers author and/or status filters from a FieldIndex
+    kept up to date by add/remove, issue/return and load, instead of
+    scanning ``self.books``.
+
+    ``concurrent=True`` makes the inventory safe to share between threads:
+    searches share a readers-writer lock, adds/removes take it exclusively,
+    and issue/return also hold one of ``lock_stripes`` per-ISBN locks so the
+    availability check and the status change are atomic.
+
+    issue/return call save() themselves unless ``autosave=False``, in which
+    case the caller decides when to flush() (the HTTP service does so from
+    a worker thread, batching many requests per write).
+
+    Lookups (search_by_isbn/title, suggest_titles) are logged at
+    ``hot_log_level`` (DEBUG by default, so they are dropped by the usual
+    INFO setup), and only every ``hot_log_every``-th one is logged.
+    """
+
+    def __init__(
+        self,
+        json_path: Optional[Path] = None,
+        journal: bool = True,
+        compact_every: int = 1000,
+        durable: bool = True,
+        group_commit_ms: float = 0.0,
+        lazy: bool = False,
+        columnar: bool = False,
+        binary_snapshot: bool = False,
+        hot_log_level: int = logging.DEBUG,
+        hot_log_every: int = 1,
+        concurrent: bool = False,
+        lock_stripes: int = 64,
+        autosave: bool = True,
+    ):
+        if lazy and columnar:
+            raise ValueError("lazy and columnar modes cannot be combined.")
+        if lazy and concurrent:
+            raise ValueError("lazy and concurrent modes cannot be combined.")
+        if binary_snapshot and not lazy:
+            raise ValueError("binary_snapshot needs lazy mode.")
+
+        # Locking (no-ops unless concurrent)
+        self.concurrent = concurrent
+        self._rw = RWLock() if concurrent else None
+        self._stripes = [
+            threading.Lock() for _ in range(lock_stripes if concurrent else 0)
+        ]
+
         # Determine json_path
         if json_path is not None:
             self.json_path = Path(json_path)
@@ -75,183 +1556,1670 @@ class LibraryInventory:
         # Ensure directory exists
         self.json_path.parent.mkdir(parents=True, exist_ok=True)
 
+        # Mutation journal next to the snapshot
+        self.journal = journal
+        self.compact_every = compact_every
+        self.journal_path = self.json_path.with_suffix(
+            self.json_path.suffix + ".journal"
+        )
+        self.binary_snapshot = binary_snapshot
+        self.snapshot_path = _snap_path(self.json_path)
+        self._pending: List[dict] = []  # events not yet written
+        self._journal_len = 0  # events in the journal file
+
+        # Durability / group commit
+        self.durable = durable
+        self.group_commit_ms = group_commit_ms
+        self._io_lock = threading.RLock()
+        self._flush_timer: Optional[threading.Timer] = None
+        self.autosave = autosave
+
         # Logging setup
-        self._setup_logging()
+        setup_logging()
+        self.hot_log_level = hot_log_level
+        self.hot_log_every = max(1, hot_log_every)
+        self._hot_calls = 0
 
-        self.books: List[Book] = []
+        self.columnar = columnar
+        self.books: List[Book] = self._new_books()
+        # ISBN -> Book, kept in sync with self.books by add/remove/load
+        # (in columnar mode the store is its own ISBN index)
+        self._by_isbn: Dict[str, Book] = {}
+        self._titles = TitleIndex()
+        self._titles_stale = False  # loads and bulk adds defer the title index
+        self._fields = FieldIndex(RWLock() if concurrent else None)
+        self._fields_stale = False  # loads defer the author/status index
+        self._snapshot_stale = False  # bulk adds skip the journal
+        self._stats = InventoryStats(threading.Lock() if concurrent else None)
+        self.lazy = lazy
+        self._lazy: Optional[Union[_LazySnapshot, BinarySnapshot]] = None
+        self._rebuild_indexes()
         try:
             self.load()
-            logging.getLogger(__name__).info("Loaded inventory from %s", self.json_path)
+            logger.info("Loaded inventory from %s", self.json_path)
         except Exception as e:
-            logging.getLogger(__name__).exception("Failed to load inventory: %s", e)
-            # Continue with empty inventory
+            logger.exception("Failed to load inventory: %s", e)
+            # never carry on empty: the next compact() would overwrite the file
+            raise
 
-    def _setup_logging(self) -> None:
-        # Try to put logs in ./library_manager/logs, fallback to cwd
-        try:
-            log_dir = Path(__file__).parent / "library_manager" / "logs"
-        except NameError:
-            # __file__ may not exist in some environments
-            log_dir = Path.cwd() / "library_manager" / "logs"
+    def _reading(self):
+        return self._rw.read() if self._rw is not None else nullcontext()
+
+    def _writing(self):
+        return self._rw.write() if self._rw is not None else nullcontext()
+
+    def _isbn_lock(self, isbn: str):
+        if not self._stripes:
+            return nullcontext()
+        return self._stripes[hash(isbn) % len(self._stripes)]
+
+    def _log_hot(self, msg: str, *args: Any) -> None:
+        if not logger.isEnabledFor(self.hot_log_level):
+            return
+        if self.hot_log_every > 1:
+            self._hot_calls += 1
+            if self._hot_calls % self.hot_log_every:
+                return
+        logger.log(self.hot_log_level, msg, *args)
+
+    def _new_books(self) -> List[Book]:
+        return ColumnarBookStore() if self.columnar else []
+
+    # --- Index helpers ---
+    def _index_add(self, book: Book) -> None:
+        if not self.columnar:
+            self._by_isbn[book.isbn] = book
+        if not self._titles_stale:
+            self._titles.add(book.isbn, book.title)
+        # the columnar store answers find_books() by scanning its columns
+        if not (self.columnar or self._fields_stale):
+            self._index_fields(book)
+        self._stats.add(book.author, book.status == "issued")
+
+    def _index_remove(self, book: Book) -> None:
+        if not self.columnar:
+            self._by_isbn.pop(book.isbn, None)
+        self._titles.remove(book.isbn)
+        self._fields.remove(book.isbn)
+        self._stats.remove(book.author, book.status == "issued")
+
+    def _index_fields(self, book: Book) -> None:
+        self._fields.add(book.isbn, book.author, book.status, book)
+
+    def _rebuild_indexes(self) -> None:
+        self._titles.clear()
+        # trigram indexing dominates a load: build it on the first title search
+        self._titles_stale = True
+        # and the author/status postings on the first find_books()
+        self._fields.clear()
+        self._fields_stale = True
+        # books still in the lazy snapshot were counted while scanning it
+        lazy = self._lazy
+        self._stats.reset((), lazy.read_stats if lazy is not None else None)
+        if self.columnar:
+            self._by_isbn = self.books
+            for b in self.books.indexed():
+                self._stats.add(b.author, b.status == "issued")
+            return
+        self._by_isbn = {}
+        for b in self.books:
+            # first occurrence wins, matching the old linear scan
+            if b.isbn not in self._by_isbn:
+                self._index_add(b)
+
+    def _ensure_title_index(self) -> None:
+        if not self._titles_stale:
+            return
+        with self._writing():
+            if not self._titles_stale:
+                return
+            self._titles_stale = False
+            books = self.books.indexed() if self.columnar else self._by_isbn.values()
+            for b in books:
+                self._titles.add(b.isbn, b.title)
+
+    def _ensure_field_index(self) -> None:
+        if not self._fields_stale:
+            return
+        with self._writing():
+            if not self._fields_stale:
+                return
+            self._fields_stale = False
+            for b in self._by_isbn.values():
+                self._index_fields(b)
+
+    def _contains(self, isbn: str) -> bool:
+        return isbn in self._by_isbn or (self._lazy is not None and isbn in self._lazy)
+
+    def _lookup(self, isbn: str) -> Optional[Book]:
+        book = self._by_isbn.get(isbn)
+        if book is None and self._lazy is not None and isbn in self._lazy:
+            book = self._lazy.take(isbn)
+            self.books.append(book)
+            self._index_add(book)
+            # already counted by the snapshot scan
+            self._stats.remove(book.author, book.status == "issued")
+        return book
+
+    def materialize_all(self) -> None:
+        """Parse every record still pending in lazy mode, keeping file order."""
+        lazy = self._lazy
+        if lazy is None:
+            return
+        ordered = list(lazy.in_order())
+        seen = {id(b) for b in ordered}
+        ordered.extend(b for b in self.books if id(b) not in seen)
+        self.books = ordered
+        self._lazy = None
+        lazy.close()
+        self._rebuild_indexes()
+        logger.info("Materialised %d books", len(self.books))
+
+    # --- CRUD operations ---
+    def add_book(self, book: Book) -> None:
+        with self._writing():
+            if self._contains(book.isbn):
+                logger.error(
+                    "Attempted to add duplicate ISBN %s", book.isbn
+                )
+                raise ValueError("Book with same ISBN already exists.")
+            self.books.append(book)
+            self._index_add(book)
+            self._record({"op": "add", "book": book.to_dict()})
+        logger.info("Added book: %s", book)
+
+    def add_books(self, books: Iterable[Any]) -> ImportReport:
+        """Add many books in one pass.
+
+        Items may be Book objects or dicts in the books.json shape. Invalid
+        items and duplicate ISBNs (against the inventory or earlier items)
+        are rejected and reported by their 1-based position instead of
+        raising. Like add_book(), this does not persist; the next save()
+        writes one fresh snapshot instead of journaling every book.
+        """
+        with self._writing():
+            return self._add_many(enumerate(books, start=1), ImportReport())
+
+    def import_file(self, path: Path, fmt: Optional[str] = None) -> ImportReport:
+        """Bulk-add books from a CSV or JSONL file (see read_import_rows)."""
+        report = ImportReport()
+
+        def parsed_rows():
+            for n, row in read_import_rows(path, fmt):
+                if isinstance(row, str):
+                    report.rejected.append((n, row))
+                else:
+                    yield n, row
+
+        with self._writing():
+            self._add_many(parsed_rows(), report)
+        report.rejected.sort()
+        return report
+
+    def _add_many(
+        self, items: Iterable[Tuple[int, Any]], report: ImportReport
+    ) -> ImportReport:
+        # indexing titles per book dominates bulk loads; rebuild on next search
+        self._titles_stale = True
+        reject = report.rejected.append
+        for n, item in items:
+            item, reason = _coerce_book(item)
+            if item is None:
+                reject((n, reason))
+                continue
+            if self._contains(item.isbn):
+                reject((n, f"duplicate ISBN {item.isbn}"))
+                continue
+            self.books.append(item)
+            self._index_add(item)
+            report.added += 1
+        if report.added:
+            self._snapshot_stale = True
+        logger.info(
+            "Bulk added %d books, rejected %d", report.added, len(report.rejected)
+        )
+        return report
+
+    def remove_book(self, isbn: str) -> Book:
+        isbn = isbn.strip()
+        with self._writing():
+            book = self._lookup(isbn)
+            if book is None:
+                logger.error(
+                    "Attempted to remove nonexistent ISBN %s", isbn
+                )
+                raise ValueError("Book not found.")
+            # unindex first: a removed columnar row no longer knows its ISBN
+            self._index_remove(book)
+            self.books.remove(book)
+            if self._lazy is not None:
+                self._lazy.discard(isbn)
+            self._record({"op": "remove", "isbn": isbn})
+        logger.info("Removed book: %s", book)
+        return book
+
+    def search_by_title(self, title_substr: str) -> List[Book]:
+        s = title_substr.strip()
+        self.materialize_all()
+        if self.columnar:
+            # a heap scan keeps columnar mode free of per-book trigram postings
+            with self._reading():
+                results = self.books.search_titles(s)
+        else:
+            self._ensure_title_index()
+            with self._reading():
+                results = [self._lookup(isbn) for isbn in self._titles.search(s)]
+        self._log_hot(
+            "Searched by title '%s' -> %d results", title_substr, len(results)
+        )
+        return results
+
+    def suggest_titles(
+        self, query: str, limit: int = 10, min_score: float = 0.3
+    ) -> List[Book]:
+        self.materialize_all()
+        self._ensure_title_index()
+        with self._reading():
+            results = [
+                self._lookup(isbn)
+                for isbn, _ in self._titles.suggest(query, limit, min_score)
+            ]
+        self._log_hot("Suggested titles for '%s' -> %d results", query, len(results))
+        return results
+
+    def search_by_isbn(self, isbn: str) -> Optional[Book]:
+        isbn = isbn.strip()
+        with self._reading():
+            b = self._lookup(isbn)
+        if b is not None:
+            self._log_hot("Found book by ISBN %s", isbn)
+            return b
+        self._log_hot("No book found with ISBN %s", isbn)
+        return None
+
+    def find_books(
+        self,
+        status: Optional[str] = None,
+        author: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[Book]:
+        """Books matching every given filter, in inventory order.
+
+        ``status`` is "available" or "issued" and ``author`` is matched
+        case-insensitively, as in iter_books(); with both set the index
+        postings are intersected. Columnar inventories scan their columns
+        instead. Like stats(), the indexes follow changes made through the
+        inventory, not a Book mutated directly. ``limit`` may be 0 but
+        not negative.
+        """
+        _check_limit(limit)
+        _book_filter(status, author)  # validates status
+        self.materialize_all()
+        if self.columnar:
+            with self._reading():
+                results = self.books.find(status, author or None, limit)
+        else:
+            self._ensure_field_index()
+            with self._reading():
+                results = self._fields.query(status, author or None, limit)
+        self._log_hot(
+            "Found books (status=%s, author=%s) -> %d results",
+            status,
+            author,
+            len(results),
+        )
+        return results
+
+    def stats(self) -> Dict[str, Any]:
+        """Totals, available/issued counts and issue rate, in O(1).
+
+        Counters follow changes made through the inventory (add/remove,
+        issue/return and load); a Book mutated directly is not seen.
+        """
+        return self._stats.summary()
+
+    def author_stats(
+        self, author: Optional[str] = None, top: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """Per-author counts (see InventoryStats.by_author)."""
+        return self._stats.by_author(author, top)
+
+    def iter_books(
+        self, status: Optional[str] = None, author: Optional[str] = None
+    ) -> Iterator[Book]:
+        """Iterate over every book (backend-neutral; see SqliteInventory).
+
+        ``status`` ("available"/"issued") and ``author`` (case-insensitive)
+        filter the books, through find_books().
+        """
+        if _book_filter(status, author) is not None:
+            return iter(self.find_books(status, author))
+        self.materialize_all()
+        return iter(self.books)
+
+    def iter_display(
+        self, status: Optional[str] = None, author: Optional[str] = None
+    ) -> Iterator[str]:
+        """display_all() one line at a time."""
+        return map(str, self.iter_books(status, author))
+
+    def _scan(self, start: int) -> Iterator[Tuple[int, Book]]:
+        if self.columnar:
+            yield from self.books.iter_from(start)
+            return
+        books = self.books
+        while start < len(books):
+            yield start, books[start]
+            start += 1
+
+    def _resolve_cursor(self, cursor: str) -> int:
+        # a cursor is "<position>:<isbn>" of the first book of the next page
+        pos, sep, isbn = cursor.partition(":")
+        if not (sep and pos.isdigit()):
+            raise ValueError("Invalid cursor.")
+        pos = int(pos)
+        if self.columnar:
+            return pos  # tombstoned rows keep their place
+        books = self.books
+        if pos < len(books) and books[pos].isbn == isbn:
+            return pos
+        if isbn in self._by_isbn:
+            # removals since the last page shifted the book left
+            for i in range(min(pos, len(books) - 1), -1, -1):
+                if books[i].isbn == isbn:
+                    return i
+        # the book itself was removed; resume near where it was
+        return min(pos, len(books))
+
+    def list_books(
+        self,
+        limit: int = 20,
+        cursor: Optional[str] = None,
+        offset: int = 0,
+        status: Optional[str] = None,
+        author: Optional[str] = None,
+    ) -> BookPage:
+        """One page of books in inventory order.
+
+        Pass the previous page's ``next_cursor`` to continue; ``offset``
+        skips that many matching books first. The cost is the page size
+        (plus whatever a filter skips), not the catalogue size.
+        """
+        if limit <= 0 or offset < 0:
+            raise ValueError("limit must be positive and offset non-negative.")
+        match = _book_filter(status, author)
+        self.materialize_all()
+        page: List[Book] = []
+        with self._reading():
+            start = self._resolve_cursor(cursor) if cursor else 0
+            for pos, book in self._scan(start):
+                if match is not None and not match(book):
+                    continue
+                if offset:
+                    offset -= 1
+                    continue
+                if len(page) == limit:
+                    # the next page starts here
+                    return BookPage(page, f"{pos}:{book.isbn}")
+                page.append(book)
+        return BookPage(page)
+
+    def display_all(self) -> List[str]:
+        self.materialize_all()
+        with self._reading():
+            reprs = [str(b) for b in self.books]
+        logger.info("Displayed all books")
+        return reprs
+
+    def issue_book_by_isbn(self, isbn: str) -> None:
+        isbn = isbn.strip()
+        with self._reading(), self._isbn_lock(isbn):
+            book = self._lookup(isbn)
+            if not book:
+                logger.error(
+                    "Attempted to issue nonexistent ISBN %s", isbn
+                )
+                raise ValueError("Book not found.")
+            if not book.is_available():
+                logger.error(
+                    "Attempted to issue already issued book ISBN %s", isbn
+                )
+                raise ValueError("Book already issued.")
+            book.issue()
+            self._stats.set_issued(book.author, True)
+            self._fields.set_status(book.isbn, "issued")
+            self._record({"op": "issue", "isbn": book.isbn})
+        if self.autosave:
+            self.save()
+        logger.info("Issued book ISBN %s", isbn)
+
+    def return_book_by_isbn(self, isbn: str) -> None:
+        isbn = isbn.strip()
+        with self._reading(), self._isbn_lock(isbn):
+            book = self._lookup(isbn)
+            if not book:
+                logger.error(
+                    "Attempted to return nonexistent ISBN %s", isbn
+                )
+                raise ValueError("Book not found.")
+            if book.is_available():
+                logger.error(
+                    "Attempted to return available book ISBN %s", isbn
+                )
+                raise ValueError("Book is not issued.")
+            book.return_book()
+            self._stats.set_issued(book.author, False)
+            self._fields.set_status(book.isbn, "available")
+            self._record({"op": "return", "isbn": book.isbn})
+        if self.autosave:
+            self.save()
+        logger.info("Returned book ISBN %s", isbn)
+
+    # --- Persistence ---
+    def _record(self, event: dict) -> None:
+        if self.journal:
+            self._pending.append(event)
+
+    def save(self) -> None:
+        """Persist pending mutations, now or at the end of the commit window."""
+        if self.group_commit_ms <= 0:
+            self.flush()
+            return
+        with self._io_lock:
+            if self._flush_timer is None:
+                timer = threading.Timer(self.group_commit_ms / 1000, self._timed_flush)
+                timer.daemon = True
+                self._flush_timer = timer
+                timer.start()
 
+    def _timed_flush(self) -> None:
         try:
-            log_dir.mkdir(parents=True, exist_ok=True)
+            self.flush()
         except Exception:
-            log_dir = Path.cwd() / "library_manager" / "logs"
-            log_dir.mkdir(parents=True, exist_ok=True)
+            # already logged; the events stay pending for the next flush
+            pass
 
-        log_file = log_dir / "library.log"
-
-        logging.basicConfig(
-            filename=str(log_file),
-            level=logging.INFO,
-            format="%(asctime)s %(levelname)s: %(message)s",
-        )
+    def flush(self) -> None:
+        """Write pending mutations now.
 
-        # Console handler for errors only
-        console = logging.StreamHandler()
-        console.setLevel(logging.ERROR)
-        formatter = logging.Formatter("%(levelname)s: %(message)s")
-        console.setFormatter(formatter)
-        logging.getLogger().addHandler(console)
+        Appends them to the journal, or compacts into a fresh snapshot when
+        journaling is off, the snapshot is missing or the journal is full.
+        """
+        with self._io_lock:
+            timer, self._flush_timer = self._flush_timer, None
+            if timer is not None and timer is not threading.current_thread():
+                timer.cancel()
 
-    # --- CRUD operations ---
-    def add_book(self, book: Book) -> None:
-        if any(b.isbn == book.isbn for b in self.books):
-            logging.getLogger(__name__).error(
-                "Attempted to add duplicate ISBN %s", book.isbn
+            needs_snapshot = (
+                not self.journal
+                or self._snapshot_stale
+                or not self.json_path.exists()
+                or self._journal_len + len(self._pending) > self.compact_every
             )
-            raise ValueError("Book with same ISBN already exists.")
-        self.books.append(book)
-        logging.getLogger(__name__).info("Added book: %s", book)
-
-    def search_by_title(self, title_substr: str) -> List[Book]:
-        s = title_substr.strip().lower()
-        results = [b for b in self.books if s in b.title.lower()]
-        logging.getLogger(__name__).info(
-            "Searched by title '%s' -> %d results", title_substr, len(results)
-        )
-        return results
+            if not needs_snapshot:
+                self._append_pending()
+        if needs_snapshot:
+            # outside _io_lock: compact() takes the inventory lock first
+            self.compact()
 
-    def search_by_isbn(self, isbn: str) -> Optional[Book]:
-        isbn = isbn.strip()
-        for b in self.books:
-            if b.isbn == isbn:
-                logging.getLogger(__name__).info("Found book by ISBN %s", isbn)
-                return b
-        logging.getLogger(__name__).info("No book found with ISBN %s", isbn)
-        return None
+    def _append_pending(self) -> None:
+        # caller holds _io_lock
+        if not self._pending:
+            return
+        try:
+            events = list(self._pending)
+            lines = "".join(json.dumps(ev, ensure_ascii=False) + "\n" for ev in events)
+            with open(self.journal_path, "a", encoding="utf-8") as f:
+                f.write(lines)
+                if self.durable:
+                    f.flush()
+                    os.fsync(f.fileno())
+            if metrics.enabled:
+                metrics.add_bytes("journal", len(lines.encode("utf-8")))
+            self._journal_len += len(events)
+            del self._pending[: len(events)]
+        except Exception:
+            logger.exception("Failed to append to journal.")
+            raise
 
-    def display_all(self) -> List[str]:
-        reprs = [str(b) for b in self.books]
-        logging.getLogger(__name__).info("Displayed all books")
-        return reprs
+    def close(self) -> None:
+        """Flush anything still waiting in the group-commit window."""
+        self.flush()
 
-    def issue_book_by_isbn(self, isbn: str) -> None:
-        book = self.search_by_isbn(isbn)
-        if not book:
-            logging.getLogger(__name__).error(
-                "Attempted to issue nonexistent ISBN %s", isbn
-            )
-            raise ValueError("Book not found.")
-        if not book.is_available():
-            logging.getLogger(__name__).error(
-                "Attempted to issue already issued book ISBN %s", isbn
-            )
-            raise ValueError("Book already issued.")
-        book.issue()
-        self.save()
-        logging.getLogger(__name__).info("Issued book ISBN %s", isbn)
+    def __enter__(self) -> "LibraryInventory":
+        return self
 
-    def return_book_by_isbn(self, isbn: str) -> None:
-        book = self.search_by_isbn(isbn)
-        if not book:
-            logging.getLogger(__name__).error(
-                "Attempted to return nonexistent ISBN %s", isbn
-            )
-            raise ValueError("Book not found.")
-        if book.is_available():
-            logging.getLogger(__name__).error(
-                "Attempted to return available book ISBN %s", isbn
-            )
-            raise ValueError("Book is not issued.")
-        book.return_book()
-        self.save()
-        logging.getLogger(__name__).info("Returned book ISBN %s", isbn)
+    def __exit__(self, *exc) -> None:
+        self.close()
 
-    # --- Persistence ---
-    def save(self) -> None:
+    def compact(self) -> None:
+        """Atomically write the full books.json snapshot and clear the journal."""
+        tmp_path = self.json_path.with_name(self.json_path.name + ".tmp")
+        self.materialize_all()
+        # Lock order is inventory lock, then _io_lock. The inventory lock is
+        # held only while the records are copied; the dump, fsync and rename
+        # run under _io_lock alone, so add_book and remove_book are not held
+        # up by the disk. Events recorded meanwhile sit past ``done`` and
+        # stay pending (they are idempotent), and _io_lock keeps flushes and
+        # other compactions out until the journal is reset.
+        with self._reading():
+            self._io_lock.acquire()
+            try:
+                done = len(self._pending)
+                records = [b.to_dict() for b in self.books]
+                was_stale, self._snapshot_stale = self._snapshot_stale, False
+            except BaseException:
+                self._io_lock.release()
+                raise
         try:
-            with open(self.json_path, "w", encoding="utf-8") as f:
+            with open(tmp_path, "w", encoding="utf-8") as f:
                 json.dump(
-                    [b.to_dict() for b in self.books],
+                    records,
                     f,
                     indent=2,
                     ensure_ascii=False,
                 )
-            logging.getLogger(__name__).info("Saved inventory to %s", self.json_path)
+                if self.durable:
+                    f.flush()
+                    os.fsync(f.fileno())
+                if metrics.enabled:
+                    metrics.add_bytes("snapshot", f.tell())
+            os.replace(tmp_path, self.json_path)
+            if self.binary_snapshot:
+                st = self.json_path.stat()
+                write_binary_snapshot(
+                    (Book.from_dict(r) for r in records),
+                    self.snapshot_path,
+                    (st.st_size, st.st_mtime_ns),
+                    self.durable,
+                )
+            if self.journal_path.exists():
+                self.journal_path.unlink()
+            if self.durable:
+                _fsync_dir(self.json_path.parent)
+            del self._pending[:done]
+            self._journal_len = 0
+            logger.info("Saved inventory to %s", self.json_path)
         except Exception:
-            logging.getLogger(__name__).exception("Failed to save inventory.")
+            self._snapshot_stale = self._snapshot_stale or was_stale
+            logger.exception("Failed to save inventory.")
             raise
+        finally:
+            self._io_lock.release()
+
+    def _apply_event(self, event: dict) -> None:
+        op = event.get("op")
+        if op == "add":
+            book = Book.from_dict(event.get("book", {}))
+            if not self._contains(book.isbn):
+                self.books.append(book)
+                self._index_add(book)
+            return
+        isbn = event.get("isbn", "")
+        book = self._lookup(isbn)
+        if book is None:
+            return
+        if op == "remove":
+            self._index_remove(book)
+            self.books.remove(book)
+            if self._lazy is not None:
+                self._lazy.discard(isbn)
+        elif op == "issue" and book.status != "issued":
+            book.status = "issued"
+            self._stats.set_issued(book.author, True, counted=False)
+            self._fields.set_status(book.isbn, "issued")
+        elif op == "return" and book.status == "issued":
+            book.status = "available"
+            self._stats.set_issued(book.author, False, counted=False)
+            self._fields.set_status(book.isbn, "available")
+
+    def _replay_journal(self) -> None:
+        self._pending = []
+        self._journal_len = 0
+        if not self.journal_path.exists():
+            return
+
+        good_end = 0
+        with open(self.journal_path, "rb") as f:
+            for raw in f:
+                if not raw.endswith(b"\n"):
+                    break  # torn write at the tail
+                try:
+                    event = json.loads(raw)
+                except ValueError:
+                    break
+                self._apply_event(event)
+                self._journal_len += 1
+                good_end += len(raw)
+
+        if good_end != self.journal_path.stat().st_size:
+            logger.warning(
+                "Truncating damaged journal tail in %s at byte %d",
+                self.journal_path,
+                good_end,
+            )
+            with open(self.journal_path, "r+b") as f:
+                f.truncate(good_end)
+        logger.info(
+            "Replayed %d journal events from %s", self._journal_len, self.journal_path
+        )
 
     def load(self) -> None:
+        with self._writing():
+            self._load()
+            if self._rw is not None and not self.columnar:
+                # a shared inventory indexes up front: built lazily, the first
+                # search would hold the writer lock for the whole build while
+                # every other request waits
+                self._ensure_title_index()
+                self._ensure_field_index()
+
+    def _open_binary_snapshot(self) -> BinarySnapshot:
+        st = self.json_path.stat()
+        try:
+            snap = BinarySnapshot(self.snapshot_path)
+        except FileNotFoundError:
+            snap = None
+        except ValueError:
+            logger.warning("Ignoring unreadable snapshot %s", self.snapshot_path)
+            snap = None
+        if snap is not None:
+            if snap.source == (st.st_size, st.st_mtime_ns):
+                return snap
+            snap.close()
+        logger.info("Rebuilding %s from %s", self.snapshot_path, self.json_path)
+        json_to_binary(self.json_path, self.snapshot_path, self.durable)
+        return BinarySnapshot(self.snapshot_path)
+
+    def _load(self) -> None:
+        if self._lazy is not None:
+            self._lazy.close()
+            self._lazy = None
         try:
             if not self.json_path.exists():
-                # Create empty file
+                # Create empty file (keeping any journaled adds)
+                self.books = self._new_books()
+                self._rebuild_indexes()
+                self._replay_journal()
+                self.compact()
+                return
+
+            if self.lazy:
                 self.books = []
-                self.save()
+                if self.binary_snapshot:
+                    self._lazy = self._open_binary_snapshot()
+                else:
+                    self._lazy = _LazySnapshot(self.json_path)
+                self._rebuild_indexes()
+                self._replay_journal()
+                logger.info(
+                    "Indexed %d books lazily from %s", len(self._lazy), self.json_path
+                )
                 return
 
+            # Stream records so the parsed list and the Books never coexist
+            self.books = self._new_books()
             with open(self.json_path, "r", encoding="utf-8") as f:
-                data = json.load(f)
-
-            if not isinstance(data, list):
-                raise ValueError("Invalid JSON structure for books (expected list).")
+                self.books.extend(
+                    Book.from_dict(item) for item, _, _ in iter_json_array(f)
+                )
 
-            self.books = [Book.from_dict(item) for item in data]
-            logging.getLogger(__name__).info(
+            self._rebuild_indexes()
+            self._replay_journal()
+            logger.info(
                 "Loaded %d books from %s", len(self.books), self.json_path
             )
 
         except json.JSONDecodeError:
-            logging.getLogger(__name__).exception(
+            logger.exception(
                 "JSON decoding error when loading inventory."
             )
             # Back up corrupted file
             corrupt_path = self.json_path.with_suffix(self.json_path.suffix + ".corrupt")
             try:
                 self.json_path.rename(corrupt_path)
-                logging.getLogger(__name__).error(
+                logger.error(
                     "Corrupted JSON moved to %s. Starting with empty inventory.",
                     corrupt_path,
                 )
+                if self.journal_path.exists():
+                    # its events are relative to the lost snapshot
+                    self.journal_path.rename(
+                        self.journal_path.with_suffix(
+                            self.journal_path.suffix + ".corrupt"
+                        )
+                    )
             except Exception:
-                logging.getLogger(__name__).exception(
+                logger.exception(
                     "Failed to rename corrupted JSON file."
                 )
-            self.books = []
+            self.books = self._new_books()
+            self._rebuild_indexes()
             try:
                 self.save()
             except Exception:
                 pass
 
         except FileNotFoundError:
-            logging.getLogger(__name__).warning(
+            logger.warning(
                 "books.json not found; starting with empty inventory."
             )
-            self.books = []
+            self.books = self._new_books()
+            self._rebuild_indexes()
             try:
                 self.save()
             except Exception:
                 pass
 
         except Exception:
-            logging.getLogger(__name__).exception(
+            logger.exception(
                 "Unexpected error while loading inventory."
             )
             raise
 
 
+# -------------------------
+# SQLite backend
+# -------------------------
+class SqliteInventory:
+    """LibraryInventory API backed by a SQLite database.
+
+    Nothing is loaded up front: ISBN lookups, issue/return and title
+    searches are indexed queries (a UNIQUE index on isbn, indexes on the
+    lowercased title, author and status, and an FTS5 trigram index for
+    substring search when this SQLite build has it). The database runs in
+    WAL mode, so readers in other processes are not blocked by writes.
+
+    Books returned by searches are detached copies; change status through
+    issue_book_by_isbn/return_book_by_isbn. As with the JSON backend,
+    add/remove are persisted by save(), and issue/return save themselves
+    unless ``autosave=False``.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS books (
+            id       INTEGER PRIMARY KEY,
+            isbn     TEXT NOT NULL UNIQUE,
+            title    TEXT NOT NULL,
+            title_lc TEXT NOT NULL,
+            author   TEXT NOT NULL,
+            status   TEXT NOT NULL DEFAULT 'available',
+            author_key TEXT NOT NULL DEFAULT ''
+        );
+        CREATE INDEX IF NOT EXISTS books_title_lc ON books (title_lc);
+        CREATE INDEX IF NOT EXISTS books_status ON books (status);
+    """
+
+    # author_key holds _author_key(author): COLLATE NOCASE only folds ASCII
+    AUTHOR_SCHEMA = """
+        DROP INDEX IF EXISTS books_author;
+        CREATE INDEX IF NOT EXISTS books_author_key ON books (author_key);
+    """
+
+    FTS_SCHEMA = """
+        CREATE VIRTUAL TABLE IF NOT EXISTS books_fts USING fts5(
+            title_lc, content='books', content_rowid='id', tokenize='trigram'
+        );
+        CREATE TRIGGER IF NOT EXISTS books_fts_ai AFTER INSERT ON books BEGIN
+            INSERT INTO books_fts (rowid, title_lc) VALUES (new.id, new.title_lc);
+        END;
+        CREATE TRIGGER IF NOT EXISTS books_fts_ad AFTER DELETE ON books BEGIN
+            INSERT INTO books_fts (books_fts, rowid, title_lc)
+            VALUES ('delete', old.id, old.title_lc);
+        END;
+    """
+
+    COLUMNS = "title, author, isbn, status"
+
+    def __init__(
+        self,
+        db_path: Optional[Path] = None,
+        durable: bool = True,
+        autosave: bool = True,
+        **_ignored: Any,
+    ):
+        if db_path is not None:
+            self.db_path = Path(db_path)
+        else:
+            self.db_path = Path.cwd() / "data" / "books.db"
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        setup_logging()
+
+        self.autosave = autosave
+        self._issues = 0
+        self._returns = 0
+        # one connection shared by all threads, serialised by _lock
+        self._lock = threading.RLock()
+        self._db = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute(f"PRAGMA synchronous={'FULL' if durable else 'NORMAL'}")
+        self._db.executescript(self.SCHEMA)
+        self._add_author_key()
+        try:
+            self._db.executescript(self.FTS_SCHEMA)
+            self._fts = True
+        except sqlite3.OperationalError:
+            # no FTS5 or no trigram tokenizer: substring search scans title_lc
+            self._fts = False
+        self._db.commit()
+        logger.info("Opened SQLite inventory %s", self.db_path)
+
+    def _add_author_key(self) -> None:
+        # databases created before author_key get the column filled in once
+        columns = {r[1] for r in self._db.execute("PRAGMA table_info(books)")}
+        if "author_key" not in columns:
+            self._db.execute(
+                "ALTER TABLE books ADD COLUMN author_key TEXT NOT NULL DEFAULT ''"
+            )
+            rows = self._db.execute("SELECT id, author FROM books").fetchall()
+            self._db.executemany(
+                "UPDATE books SET author_key = ? WHERE id = ?",
+                [(_author_key(author), id_) for id_, author in rows],
+            )
+        self._db.executescript(self.AUTHOR_SCHEMA)
+
+    @staticmethod
+    def _book(row: Tuple[str, str, str, str]) -> Book:
+        return Book(title=row[0], author=row[1], isbn=row[2], status=row[3])
+
+    def _query(self, sql: str, params: Tuple = ()) -> List[Book]:
+        with self._lock:
+            rows = self._db.execute(sql, params).fetchall()
+        return [self._book(r) for r in rows]
+
+    @property
+    def books(self) -> List[Book]:
+        """Every book as a list; this loads the whole table."""
+        return list(self.iter_books())
+
+    @staticmethod
+    def _where(status: Optional[str], author: Optional[str]) -> Tuple[str, Tuple]:
+        _book_filter(status, author)  # validates status
+        clauses, params = [], ()
+        if status is not None:
+            clauses.append("status = ?")
+            params += (status,)
+        if author:
+            clauses.append("author_key = ?")
+            params += (_author_key(author),)
+        return " AND ".join(clauses), params
+
+    def iter_books(
+        self, status: Optional[str] = None, author: Optional[str] = None
+    ) -> Iterator[Book]:
+        where, params = self._where(status, author)
+        sql = f"SELECT {self.COLUMNS} FROM books"
+        if where:
+            sql += " WHERE " + where
+        with self._lock:
+            cur = self._db.execute(sql + " ORDER BY id", params)
+            rows = cur.fetchmany(1000)
+        # the query runs here, not on the first next(), so it is timed
+        # with the call under metrics and bad filters raise straight away
+        return self._iter_rows(cur, rows)
+
+    def _iter_rows(self, cur: sqlite3.Cursor, rows: List[Tuple]) -> Iterator[Book]:
+        while rows:
+            for r in rows:
+                yield self._book(r)
+            with self._lock:
+                rows = cur.fetchmany(1000)
+
+    def find_books(
+        self,
+        status: Optional[str] = None,
+        author: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[Book]:
+        """Same contract as LibraryInventory.find_books()."""
+        _check_limit(limit)
+        where, params = self._where(status, author)
+        sql = f"SELECT {self.COLUMNS} FROM books"
+        if where:
+            sql += " WHERE " + where
+        sql += " ORDER BY id"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params += (limit,)
+        return self._query(sql, params)
+
+    # --- CRUD operations ---
+    def add_book(self, book: Book) -> None:
+        with self._lock:
+            try:
+                self._db.execute(
+                    "INSERT INTO books "
+                    "(isbn, title, title_lc, author, author_key, status) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (book.isbn, book.title, book.title.lower(), book.author,
+                     _author_key(book.author), book.status),
+                )
+            except sqlite3.IntegrityError:
+                logger.error("Attempted to add duplicate ISBN %s", book.isbn)
+                raise ValueError("Book with same ISBN already exists.")
+        logger.info("Added book: %s", book)
+
+    def add_books(self, books: Iterable[Any]) -> ImportReport:
+        """Same contract as LibraryInventory.add_books()."""
+        return self._add_many(enumerate(books, start=1), ImportReport())
+
+    def import_file(self, path: Path, fmt: Optional[str] = None) -> ImportReport:
+        report = ImportReport()
+
+        def parsed_rows():
+            for n, row in read_import_rows(path, fmt):
+                if isinstance(row, str):
+                    report.rejected.append((n, row))
+                else:
+                    yield n, row
+
+        self._add_many(parsed_rows(), report)
+        report.rejected.sort()
+        return report
+
+    def _add_many(
+        self, items: Iterable[Tuple[int, Any]], report: ImportReport
+    ) -> ImportReport:
+        reject = report.rejected.append
+        sql = (
+            "INSERT OR IGNORE INTO books "
+            "(isbn, title, title_lc, author, author_key, status) "
+            "VALUES (?, ?, ?, ?, ?, ?)"
+        )
+        with self._lock:
+            execute = self._db.execute
+            for n, item in items:
+                item, reason = _coerce_book(item)
+                if item is None:
+                    reject((n, reason))
+                    continue
+                cur = execute(
+                    sql,
+                    (item.isbn, item.title, item.title.lower(), item.author,
+                     _author_key(item.author), item.status),
+                )
+                if cur.rowcount == 0:
+                    reject((n, f"duplicate ISBN {item.isbn}"))
+                else:
+                    report.added += 1
+        logger.info(
+            "Bulk added %d books, rejected %d", report.added, len(report.rejected)
+        )
+        return report
+
+    def remove_book(self, isbn: str) -> Book:
+        isbn = isbn.strip()
+        with self._lock:
+            book = self.search_by_isbn(isbn)
+            if book is None:
+                logger.error("Attempted to remove nonexistent ISBN %s", isbn)
+                raise ValueError("Book not found.")
+            self._db.execute("DELETE FROM books WHERE isbn = ?", (isbn,))
+        logger.info("Removed book: %s", book)
+        return book
+
+    def search_by_title(self, title_substr: str) -> List[Book]:
+        s = title_substr.strip().lower()
+        if self._fts and len(s) >= 3:
+            # trigram candidates, confirmed with the same test as the JSON backend
+            phrase = '"' + s.replace('"', '""') + '"'
+            results = self._query(
+                f"SELECT {self.COLUMNS} FROM books WHERE id IN "
+                "(SELECT rowid FROM books_fts WHERE books_fts MATCH ?) "
+                "AND instr(title_lc, ?) > 0 ORDER BY id",
+                (phrase, s),
+            )
+        else:
+            results = self._query(
+                f"SELECT {self.COLUMNS} FROM books WHERE instr(title_lc, ?) > 0 "
+                "ORDER BY id",
+                (s,),
+            )
+        logger.debug("Searched by title '%s' -> %d results", title_substr, len(results))
+        return results
+
+    def suggest_titles(
+        self, query: str, limit: int = 10, min_score: float = 0.3
+    ) -> List[Book]:
+        """Titles starting with the query (index range scan), then containing it.
+
+        Unlike the in-memory TitleIndex there is no fuzzy tier; min_score is
+        accepted for API compatibility.
+        """
+        q = query.strip().lower()
+        if not q or limit <= 0:
+            return []
+        results = self._query(
+            f"SELECT {self.COLUMNS} FROM books WHERE title_lc >= ? AND title_lc < ? "
+            "ORDER BY title_lc LIMIT ?",
+            (q, q + "\U0010ffff", limit),
+        )
+        if len(results) < limit:
+            seen = {b.isbn for b in results}
+            results.extend(
+                b for b in self.search_by_title(q) if b.isbn not in seen
+            )
+        return results[:limit]
+
+    def search_by_isbn(self, isbn: str) -> Optional[Book]:
+        isbn = isbn.strip()
+        found = self._query(
+            f"SELECT {self.COLUMNS} FROM books WHERE isbn = ?", (isbn,)
+        )
+        logger.debug("Looked up ISBN %s -> %s", isbn, "found" if found else "none")
+        return found[0] if found else None
+
+    def display_all(self) -> List[str]:
+        reprs = [str(b) for b in self.iter_books()]
+        logger.info("Displayed all books")
+        return reprs
+
+    def iter_display(
+        self, status: Optional[str] = None, author: Optional[str] = None
+    ) -> Iterator[str]:
+        return map(str, self.iter_books(status, author))
+
+    def list_books(
+        self,
+        limit: int = 20,
+        cursor: Optional[str] = None,
+        offset: int = 0,
+        status: Optional[str] = None,
+        author: Optional[str] = None,
+    ) -> BookPage:
+        """Keyset pagination on the rowid; the cursor is the last row's id."""
+        if limit <= 0 or offset < 0:
+            raise ValueError("limit must be positive and offset non-negative.")
+        where, params = self._where(status, author)
+        if cursor:
+            if not cursor.isdigit():
+                raise ValueError("Invalid cursor.")
+            where = " AND ".join(filter(None, ("id > ?", where)))
+            params = (int(cursor),) + params
+        sql = f"SELECT id, {self.COLUMNS} FROM books"
+        if where:
+            sql += " WHERE " + where
+        sql += " ORDER BY id LIMIT ? OFFSET ?"
+        with self._lock:
+            rows = self._db.execute(sql, params + (limit + 1, offset)).fetchall()
+        books = [self._book(r[1:]) for r in rows[:limit]]
+        next_cursor = str(rows[limit - 1][0]) if len(rows) > limit else None
+        return BookPage(books, next_cursor)
+
+    def _set_status(self, isbn: str, old: str, new: str, verb: str) -> None:
+        isbn = isbn.strip()
+        with self._lock:
+            # check-and-set in one statement, so it is atomic across processes
+            cur = self._db.execute(
+                "UPDATE books SET status = ? WHERE isbn = ? AND status = ?",
+                (new, isbn, old),
+            )
+            if cur.rowcount == 0:
+                exists = self._db.execute(
+                    "SELECT 1 FROM books WHERE isbn = ?", (isbn,)
+                ).fetchone()
+                if not exists:
+                    logger.error("Attempted to %s nonexistent ISBN %s", verb, isbn)
+                    raise ValueError("Book not found.")
+                if new == "issued":
+                    logger.error("Attempted to issue already issued book ISBN %s", isbn)
+                    raise ValueError("Book already issued.")
+                logger.error("Attempted to return available book ISBN %s", isbn)
+                raise ValueError("Book is not issued.")
+            if new == "issued":
+                self._issues += 1
+            else:
+                self._returns += 1
+            if self.autosave:
+                self._db.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """Same shape as LibraryInventory.stats(), from the status index."""
+        with self._lock:
+            total, issued, authors = self._db.execute(
+                "SELECT COUNT(*), COUNT(*) FILTER (WHERE status = 'issued'), "
+                "COUNT(DISTINCT author) FROM books"
+            ).fetchone()
+        return {
+            "total": total,
+            "available": total - issued,
+            "issued": issued,
+            "authors": authors,
+            "issue_rate": issued / total if total else 0.0,
+            "issues": self._issues,
+            "returns": self._returns,
+        }
+
+    def author_stats(
+        self, author: Optional[str] = None, top: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        sql = (
+            "SELECT author, COUNT(*), COUNT(*) FILTER (WHERE status = 'issued') "
+            "FROM books"
+        )
+        params: Tuple = ()
+        if author is not None:
+            sql += " WHERE author_key = ?"
+            params = (_author_key(author),)
+        sql += " GROUP BY author ORDER BY COUNT(*) DESC"
+        if top is not None:
+            sql += " LIMIT ?"
+            params += (top,)
+        with self._lock:
+            rows = self._db.execute(sql, params).fetchall()
+        return [
+            {
+                "author": a,
+                "total": n,
+                "issued": i,
+                "available": n - i,
+                "issue_rate": i / n,
+            }
+            for a, n, i in rows
+        ]
+
+    def issue_book_by_isbn(self, isbn: str) -> None:
+        self._set_status(isbn, "available", "issued", "issue")
+        logger.info("Issued book ISBN %s", isbn)
+
+    def return_book_by_isbn(self, isbn: str) -> None:
+        self._set_status(isbn, "issued", "available", "return")
+        logger.info("Returned book ISBN %s", isbn)
+
+    # --- Persistence ---
+    def save(self) -> None:
+        """Commit the open transaction."""
+        with self._lock:
+            self._db.commit()
+        logger.info("Saved inventory to %s", self.db_path)
+
+    flush = save
+
+    def compact(self) -> None:
+        """Commit and fold the WAL back into the main database file."""
+        with self._lock:
+            self._db.commit()
+            self._db.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.commit()
+
+    def __enter__(self) -> "SqliteInventory":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+BACKENDS = {"json": LibraryInventory, "sqlite": SqliteInventory}
+_SQLITE_SUFFIXES = (".db", ".sqlite", ".sqlite3")
+
+
+def open_inventory(
+    path: Optional[Path] = None, backend: Optional[str] = None, **options: Any
+):
+    """Open an inventory with the named backend.
+
+    Without an explicit backend, .db/.sqlite/.sqlite3 paths use SQLite and
+    everything else (including the default data/books.json) uses JSON.
+    """
+    if backend is None:
+        is_sqlite = path is not None and Path(path).suffix.lower() in _SQLITE_SUFFIXES
+        backend = "sqlite" if is_sqlite else "json"
+    try:
+        cls = BACKENDS[backend]
+    except KeyError:
+        raise ValueError(f"Unknown backend {backend!r}.") from None
+    return cls(path, **options)
+
+
+def migrate_inventory(
+    src: Path,
+    dst: Path,
+    src_backend: Optional[str] = None,
+    dst_backend: Optional[str] = None,
+) -> ImportReport:
+    """Copy every book from one inventory into another (e.g. JSON -> SQLite)."""
+    source = open_inventory(src, src_backend)
+    target = open_inventory(dst, dst_backend)
+    report = target.add_books(source.iter_books())
+    target.save()
+    target.close()
+    source.close()
+    logger.info("Migrated %d books from %s to %s", report.added, src, dst)
+    return report
+
+
+# -------------------------
+# Instrumentation
+# -------------------------
+class Metrics:
+    """Call counts, latency histograms and bytes written, per operation.
+
+    Off by default. enable() wraps the INSTRUMENTED methods of every
+    backend class with a timing shim and disable() puts the originals
+    back, so a disabled inventory runs exactly the uninstrumented code.
+    """
+
+    INSTRUMENTED = (
+        "add_book",
+        "add_books",
+        "import_file",
+        "remove_book",
+        "search_by_title",
+        "suggest_titles",
+        "search_by_isbn",
+        "find_books",
+        "list_books",
+        "iter_books",
+        "issue_book_by_isbn",
+        "return_book_by_isbn",
+        "save",
+        "flush",
+        "compact",
+        "load",
+    )
+    # latency bucket upper bounds in seconds (+Inf is implied)
+    BUCKETS = (
+        0.00001, 0.00005, 0.0001, 0.0005, 0.001, 0.005,
+        0.01, 0.05, 0.1, 0.5, 1.0, 5.0,
+    )
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self._lock = threading.Lock()
+        self._originals: Dict[Tuple[type, str], Any] = {}
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            # method -> [calls, errors, total seconds, bucket counts...]
+            self.calls: Dict[str, List[float]] = {}
+            self.bytes_written: Counter = Counter()
+
+    def enable(self) -> None:
+        with self._lock:
+            if self.enabled:
+                return
+            for cls in set(BACKENDS.values()):
+                for name in self.INSTRUMENTED:
+                    fn = cls.__dict__.get(name)
+                    if fn is None:
+                        continue
+                    self._originals[(cls, name)] = fn
+                    setattr(cls, name, self._wrap(name, fn))
+            self.enabled = True
+        logger.info("Metrics enabled")
+
+    def disable(self) -> None:
+        with self._lock:
+            for (cls, name), fn in self._originals.items():
+                setattr(cls, name, fn)
+            self._originals.clear()
+            self.enabled = False
+        logger.info("Metrics disabled")
+
+    def _wrap(self, name: str, fn):
+        observe = self.observe
+
+        @functools.wraps(fn)
+        def timed(*args, **kwargs):
+            t0 = time.perf_counter()
+            try:
+                result = fn(*args, **kwargs)
+            except BaseException:
+                observe(name, time.perf_counter() - t0, error=True)
+                raise
+            observe(name, time.perf_counter() - t0)
+            return result
+
+        return timed
+
+    def observe(self, name: str, seconds: float, error: bool = False) -> None:
+        with self._lock:
+            row = self.calls.get(name)
+            if row is None:
+                row = self.calls[name] = [0, 0, 0.0] + [0] * (len(self.BUCKETS) + 1)
+            row[0] += 1
+            row[1] += error
+            row[2] += seconds
+            row[3 + bisect.bisect_left(self.BUCKETS, seconds)] += 1
+
+    def add_bytes(self, target: str, n: int) -> None:
+        with self._lock:
+            self.bytes_written[target] += n
+
+    def to_json(self) -> Dict[str, Any]:
+        with self._lock:
+            methods = {}
+            for name, row in sorted(self.calls.items()):
+                counts = row[3:]
+                methods[name] = {
+                    "calls": row[0],
+                    "errors": row[1],
+                    "seconds": row[2],
+                    "buckets": {
+                        str(le): n for le, n in zip(self.BUCKETS + ("+Inf",), counts)
+                    },
+                }
+            return {
+                "enabled": self.enabled,
+                "methods": methods,
+                "bytes_written": dict(self.bytes_written),
+            }
+
+    def to_prometheus(self) -> str:
+        data = self.to_json()
+        lines = [
+            "# TYPE library_calls_total counter",
+            "# TYPE library_call_errors_total counter",
+            "# TYPE library_call_seconds histogram",
+        ]
+        for name, m in data["methods"].items():
+            label = f'method="{name}"'
+            lines.append(f"library_calls_total{{{label}}} {m['calls']}")
+            lines.append(f"library_call_errors_total{{{label}}} {m['errors']}")
+            cumulative = 0
+            for le, n in m["buckets"].items():
+                cumulative += n
+                lines.append(
+                    f'library_call_seconds_bucket{{{label},le="{le}"}} {cumulative}'
+                )
+            lines.append(f"library_call_seconds_sum{{{label}}} {m['seconds']:.9f}")
+            lines.append(f"library_call_seconds_count{{{label}}} {m['calls']}")
+        lines.append("# TYPE library_bytes_written_total counter")
+        for target, n in sorted(data["bytes_written"].items()):
+            lines.append(f'library_bytes_written_total{{file="{target}"}} {n}')
+        return "\n".join(lines) + "\n"
+
+    def write(self, path: Path) -> None:
+        """Export to ``path``: JSON for a .json file, Prometheus text otherwise."""
+        path = Path(path)
+        if path.suffix.lower() == ".json":
+            text = json.dumps(self.to_json(), indent=2)
+        else:
+            text = self.to_prometheus()
+        path.write_text(text, encoding="utf-8")
+        logger.info("Wrote metrics to %s", path)
+
+
+metrics = Metrics()
+
+
+@contextmanager
+def profiled(path: Path, top: int = 20):
+    """Run the block under cProfile; save the stats and print the top entries."""
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield profiler
+    finally:
+        profiler.disable()
+        profiler.dump_stats(str(path))
+        stats = pstats.Stats(profiler, stream=sys.stderr)
+        stats.sort_stats("cumulative").print_stats(top)
+        print(f"Profile written to {path}", file=sys.stderr)
+
+
+# -------------------------
+# HTTP/JSON service
+# -------------------------
+_HTTP_REASONS = {
+    200: "OK",
+    201: "Created",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    409: "Conflict",
+    500: "Internal Server Error",
+}
+
+
+class InventoryServer:
+    """Minimal asyncio HTTP/1.1 JSON front-end for a LibraryInventory.
+
+    Routes:
+        GET  /books?title=...        title substring search
+        GET  /books/suggest?q=...    ranked prefix/fuzzy title lookup
+        GET  /books/<isbn>           one book
+        POST /books                  add {"title", "author", "isbn"}
+        POST /books/<isbn>/issue     issue a book
+        POST /books/<isbn>/return    return a book
+
+    Connections are kept alive and requests are answered in order, so
+    clients may pipeline. Mutations are applied on the event loop and then
+    wait for a group commit: one inventory flush runs in a worker thread
+    for everything that changed within ``commit_window_ms``, and only then
+    are those requests answered.
+    """
+
+    MAX_BODY = 1 << 20
+
+    def __init__(self, inv: LibraryInventory, commit_window_ms: float = 2.0) -> None:
+        self.inv = inv
+        self.commit_window = commit_window_ms / 1000
+        self._waiters: List[asyncio.Future] = []
+        self._committer: Optional[asyncio.Task] = None
+
+    async def start(self, host: str = "127.0.0.1", port: int = 8080) -> asyncio.Server:
+        return await asyncio.start_server(self._handle_connection, host, port)
+
+    # --- group commit ---
+    async def _commit(self) -> None:
+        fut = asyncio.get_running_loop().create_future()
+        self._waiters.append(fut)
+        if self._committer is None:
+            self._committer = asyncio.create_task(self._run_commits())
+        await fut
+
+    async def _run_commits(self) -> None:
+        loop = asyncio.get_running_loop()
+        try:
+            while self._waiters:
+                if self.commit_window > 0:
+                    await asyncio.sleep(self.commit_window)
+                waiters, self._waiters = self._waiters, []
+                try:
+                    await loop.run_in_executor(None, self.inv.flush)
+                except Exception as e:
+                    for w in waiters:
+                        w.set_exception(e)
+                else:
+                    for w in waiters:
+                        w.set_result(None)
+        finally:
+            self._committer = None
+
+    # --- HTTP plumbing ---
+    async def _handle_connection(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            while True:
+                request = await self._read_request(reader)
+                if request is None:
+                    break
+                method, target, headers, body = request
+                status, payload = await self._dispatch(method, target, body)
+                keep_alive = headers.get("connection", "").lower() != "close"
+                writer.write(self._response(status, payload, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except ValueError as e:
+            # malformed request line or headers: answer once and hang up
+            writer.write(self._response(400, {"error": str(e)}, False))
+        finally:
+            writer.close()
+
+    async def _read_request(self, reader: asyncio.StreamReader):
+        line = await reader.readline()
+        if not line:
+            return None
+        parts = line.decode("latin-1").split()
+        if len(parts) != 3:
+            raise ValueError("Bad request line.")
+        method, target, _ = parts
+        headers: Dict[str, str] = {}
+        while True:
+            line = await reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = line.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        length = int(headers.get("content-length", "0") or 0)
+        if length > self.MAX_BODY:
+            raise ValueError("Request body too large.")
+        body = await reader.readexactly(length) if length else b""
+        return method.upper(), target, headers, body
+
+    @staticmethod
+    def _response(status: int, payload: Any, keep_alive: bool) -> bytes:
+        if isinstance(payload, str):
+            # plain-text bodies (the Prometheus metrics dump)
+            body = payload.encode("utf-8")
+            content_type = "text/plain; version=0.0.4"
+        else:
+            body = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+            content_type = "application/json"
+        head = (
+            f"HTTP/1.1 {status} {_HTTP_REASONS.get(status, 'Unknown')}\r\n"
+            f"Content-Type: {content_type}\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        return head.encode("latin-1") + body
+
+    # --- routes ---
+    async def _dispatch(self, method: str, target: str, body: bytes):
+        url = urlsplit(target)
+        parts = [unquote(p) for p in url.path.split("/") if p]
+        query = {k: v[-1] for k, v in parse_qs(url.query).items()}
+        inv = self.inv
+        try:
+            if parts == ["metrics"]:
+                if method == "POST":
+                    # {"enabled": true|false} toggles instrumentation
+                    data = json.loads(body or b"{}")
+                    if not isinstance(data, dict):
+                        return 400, {"error": "Expected a JSON object."}
+                    if data.get("reset"):
+                        metrics.reset()
+                    if data.get("enabled") is True:
+                        metrics.enable()
+                    elif data.get("enabled") is False:
+                        metrics.disable()
+                    return 200, {"enabled": metrics.enabled}
+                if query.get("format") == "json":
+                    return 200, metrics.to_json()
+                return 200, metrics.to_prometheus()
+            if parts == ["stats"] and method == "GET":
+                top = int(query.get("top", "10"))
+                return 200, {**inv.stats(), "top_authors": inv.author_stats(top=top)}
+            if not parts or parts[0] != "books" or len(parts) > 3:
+                return 404, {"error": "Unknown route."}
+
+            if len(parts) == 1:
+                if method == "GET" and "title" not in query:
+                    page = inv.list_books(
+                        int(query.get("limit", "100")),
+                        query.get("cursor"),
+                        int(query.get("offset", "0")),
+                        query.get("status"),
+                        query.get("author"),
+                    )
+                    return 200, {
+                        "books": [b.to_dict() for b in page.books],
+                        "next_cursor": page.next_cursor,
+                    }
+                if method == "GET":
+                    books = inv.search_by_title(query["title"])
+                    limit = int(query.get("limit", "100"))
+                    return 200, {
+                        "count": len(books),
+                        "books": [b.to_dict() for b in books[:limit]],
+                    }
+                if method == "POST":
+                    data = json.loads(body or b"{}")
+                    if not isinstance(data, dict):
+                        return 400, {"error": "Expected a JSON object."}
+                    book = Book.from_dict(data)
+                    if not (book.title and book.author and book.isbn):
+                        return 400, {"error": "title, author and isbn are required."}
+                    inv.add_book(book)
+                    await self._commit()
+                    return 201, book.to_dict()
+                return 405, {"error": "Method not allowed."}
+
+            if len(parts) == 2:
+                if method != "GET":
+                    return 405, {"error": "Method not allowed."}
+                if parts[1] == "suggest":
+                    limit = int(query.get("limit", "10"))
+                    books = inv.suggest_titles(query.get("q", ""), limit)
+                    return 200, {"books": [b.to_dict() for b in books]}
+                book = inv.search_by_isbn(parts[1])
+                if book is None:
+                    return 404, {"error": "Book not found."}
+                return 200, book.to_dict()
+
+            if parts[2] not in ("issue", "return"):
+                return 404, {"error": "Unknown route."}
+            if method != "POST":
+                return 405, {"error": "Method not allowed."}
+            if parts[2] == "issue":
+                inv.issue_book_by_isbn(parts[1])
+            else:
+                inv.return_book_by_isbn(parts[1])
+            await self._commit()
+            return 200, inv.search_by_isbn(parts[1]).to_dict()
+
+        except ValueError as e:
+            # inventory errors, malformed JSON and bad numbers in the query
+            msg = str(e)
+            if msg == "Book not found.":
+                return 404, {"error": msg}
+            if msg in _CONFLICT_ERRORS:
+                return 409, {"error": msg}
+            return 400, {"error": msg}
+        except (AttributeError, TypeError):
+            return 400, {"error": "Fields must be strings."}
+        except Exception:
+            logger.exception("Unhandled error serving %s %s", method, target)
+            return 500, {"error": "Internal server error."}
+
+
+_CONFLICT_ERRORS = (
+    "Book already issued.",
+    "Book is not issued.",
+    "Book with same ISBN already exists.",
+)
+
+
+async def _serve(inv: LibraryInventory, host: str, port: int, window_ms: float) -> None:
+    server = await InventoryServer(inv, window_ms).start(host, port)
+    addr = server.sockets[0].getsockname()
+    print(f"Serving on http://{addr[0]}:{addr[1]}", flush=True)
+    async with server:
+        await server.serve_forever()
+
+
+def serve_main(args: argparse.Namespace) -> None:
+    inv = open_inventory(
+        args.json_path, args.backend, concurrent=True, autosave=False
+    )
+    try:
+        asyncio.run(_serve(inv, args.host, args.port, args.commit_window_ms))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        inv.close()
+        print("Server stopped.")
+
+
 # -------------------------
 # CLI utilities
 # -------------------------
@@ -267,15 +3235,57 @@ def prompt_nonempty(prompt_text: str) -> str:
         print("Input cannot be empty. Please try again.")
 
 
+PAGE_SIZE = 20
+
+
 def print_header() -> None:
     print("=" * 60)
     print("Library Inventory Manager (Single-file CLI)".center(60))
     print("=" * 60)
 
 
-def cli_main() -> None:
+def page_books(
+    inv,
+    status: Optional[str] = None,
+    author: Optional[str] = None,
+    page_size: int = PAGE_SIZE,
+) -> None:
+    """Print the inventory one page at a time."""
+    page = inv.list_books(page_size, status=status, author=author)
+    if not page.books:
+        print("No matching books." if status or author else "No books in inventory.")
+        return
+    shown = 0
+    while True:
+        for b in page.books:
+            shown += 1
+            print(f"{shown:>6}. {b}")
+        if page.next_cursor is None:
+            return
+        if input("-- Enter for more, q to stop -- ").strip().lower() == "q":
+            return
+        page = inv.list_books(page_size, page.next_cursor, status=status, author=author)
+
+
+def print_found(
+    inv,
+    status: Optional[str] = None,
+    author: Optional[str] = None,
+    limit: Optional[int] = None,
+) -> None:
+    """Print the books matching an author and/or status filter."""
+    res = inv.find_books(status, author, limit)
+    if not res:
+        print("No matching books.")
+        return
+    print(f"{len(res)} result(s):")
+    for b in res:
+        print(" -", b)
+
+
+def cli_main(json_path: Optional[Path] = None, backend: Optional[str] = None) -> None:
     print_header()
-    inv = LibraryInventory()
+    inv = open_inventory(json_path, backend)
 
     MENU = """
 Choose an option:
@@ -285,13 +3295,15 @@ Choose an option:
 4. View All Books
 5. Search by Title
 6. Search by ISBN
-7. Exit
+7. Search by Author/Status
+8. Statistics
+9. Exit
 """
 
     while True:
         try:
             print(MENU)
-            choice = input("Enter choice (1-7): ").strip()
+            choice = input("Enter choice (1-9): ").strip()
 
             if choice == "1":
                 title = prompt_nonempty("Title: ")
@@ -321,13 +3333,12 @@ Choose an option:
                     print(f"Error: {ve}")
 
             elif choice == "4":
-                entries = inv.display_all()
-                if not entries:
-                    print("No books in inventory.")
-                else:
-                    print("\nAll books:")
-                    for e in entries:
-                        print(" -", e)
+                status = input("Status filter (available/issued, Enter for all): ")
+                author = input("Author filter (Enter for all): ")
+                try:
+                    page_books(inv, status.strip().lower() or None, author or None)
+                except ValueError as ve:
+                    print(f"Error: {ve}")
 
             elif choice == "5":
                 q = prompt_nonempty("Enter title (or part of it) to search: ")
@@ -348,28 +3359,216 @@ Choose an option:
                     print("Book not found.")
 
             elif choice == "7":
+                author = input("Author (Enter for any): ").strip()
+                status = input("Status (available/issued, Enter for any): ")
+                try:
+                    print_found(inv, status.strip().lower() or None, author or None)
+                except ValueError as ve:
+                    print(f"Error: {ve}")
+
+            elif choice == "8":
+                st = inv.stats()
+                print(
+                    f"Books: {st['total']}  available: {st['available']}  "
+                    f"issued: {st['issued']} ({st['issue_rate']:.1%})"
+                )
+                print(
+                    f"Issues this session: {st['issues']}  "
+                    f"returns: {st['returns']}  authors: {st['authors']}"
+                )
+                for a in inv.author_stats(top=10):
+                    print(
+                        f" - {a['author']}: {a['total']} book(s), "
+                        f"{a['issued']} issued"
+                    )
+
+            elif choice == "9":
+                inv.close()
+                # fold the journal into books.json only if it has events;
+                # an unchanged inventory is not rewritten on every exit
+                if getattr(inv, "_journal_len", 0):
+                    inv.compact()
                 print("Exiting. Goodbye!")
                 break
 
             else:
-                print("Invalid choice. Enter a number from 1 to 7.")
+                print("Invalid choice. Enter a number from 1 to 9.")
 
         except KeyboardInterrupt:
             print("\nKeyboard interrupt detected. Exiting.")
             sys.exit(0)
         except Exception as e:
-            logging.getLogger(__name__).exception("Unhandled exception in CLI loop.")
+            logger.exception("Unhandled exception in CLI loop.")
             print(f"An unexpected error occurred: {e}")
             print(traceback.format_exc())
 
 
+def import_main(args: argparse.Namespace) -> None:
+    inv = open_inventory(args.json_path, args.backend)
+    try:
+        report = inv.import_file(args.file, args.format)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    inv.save()
+    print(f"Imported {report.added} book(s); rejected {len(report.rejected)} row(s).")
+    for n, reason in report.rejected[: args.show_rejects]:
+        print(f" - record {n}: {reason}")
+    if len(report.rejected) > args.show_rejects:
+        print(f" ... {len(report.rejected) - args.show_rejects} more")
+
+
+def migrate_main(args: argparse.Namespace) -> None:
+    try:
+        report = migrate_inventory(
+            args.src, args.dst, args.from_backend, args.to_backend
+        )
+    except (OSError, ValueError, sqlite3.Error) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    print(f"Migrated {report.added} book(s) from {args.src} to {args.dst}.")
+    if report.rejected:
+        print(f"Skipped {len(report.rejected)} book(s) already present in the target.")
+
+
+def search_main(args: argparse.Namespace) -> None:
+    inv = open_inventory(args.json_path, args.backend)
+    try:
+        print_found(inv, args.status, args.author, args.limit)
+    finally:
+        inv.close()
+
+
+def snapshot_main(args: argparse.Namespace) -> None:
+    json_path = args.json_path or Path.cwd() / "data" / "books.json"
+    snap_path = args.snapshot or _snap_path(json_path)
+    try:
+        if args.export:
+            count = binary_to_json(snap_path, json_path)
+            print(f"Wrote {count} book(s) from {snap_path} to {json_path}.")
+        else:
+            json_to_binary(json_path, snap_path)
+            with BinarySnapshot(snap_path) as snap:
+                count = len(snap)
+            print(f"Wrote {count} book(s) from {json_path} to {snap_path}.")
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+
+def _non_negative_int(text: str) -> int:
+    value = int(text)
+    if value < 0:
+        raise argparse.ArgumentTypeError("must be 0 or more")
+    return value
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Library Inventory Manager")
+    parser.add_argument(
+        "--json-path",
+        type=Path,
+        default=None,
+        help="inventory file (default: data/books.json)",
+    )
+    parser.add_argument(
+        "--backend",
+        choices=sorted(BACKENDS),
+        default=None,
+        help="storage backend (default: sqlite for .db/.sqlite files, else json)",
+    )
+    parser.add_argument(
+        "--metrics",
+        type=Path,
+        default=None,
+        metavar="FILE",
+        help="record call metrics and write them to FILE on exit "
+        "(JSON for .json, Prometheus text otherwise)",
+    )
+    parser.add_argument(
+        "--profile",
+        type=Path,
+        default=None,
+        metavar="FILE",
+        help="run under cProfile and save the stats to FILE",
+    )
+    sub = parser.add_subparsers(dest="command")
+
+    p = sub.add_parser("import", help="bulk-import books from CSV or JSONL")
+    p.add_argument("file", type=Path)
+    p.add_argument("--format", choices=("csv", "jsonl"), default=None)
+    p.add_argument("--show-rejects", type=int, default=20, metavar="N")
+
+    p = sub.add_parser("serve", help="serve the inventory over HTTP/JSON")
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=8080)
+    p.add_argument(
+        "--commit-window-ms",
+        type=float,
+        default=2.0,
+        help="how long mutations wait to share one flush",
+    )
+
+    p = sub.add_parser("migrate", help="copy an inventory to another backend")
+    p.add_argument("src", type=Path)
+    p.add_argument("dst", type=Path)
+    p.add_argument("--from-backend", choices=sorted(BACKENDS), default=None)
+    p.add_argument("--to-backend", choices=sorted(BACKENDS), default=None)
+
+    p = sub.add_parser("search", help="list books by author and/or status")
+    p.add_argument("--author", default=None)
+    p.add_argument("--status", choices=("available", "issued"), default=None)
+    p.add_argument("--limit", type=_non_negative_int, default=None, metavar="N")
+
+    p = sub.add_parser(
+        "snapshot", help="build the memory-mapped binary snapshot of books.json"
+    )
+    p.add_argument(
+        "--snapshot",
+        type=Path,
+        default=None,
+        metavar="FILE",
+        help="snapshot file (default: the inventory path + .snap)",
+    )
+    p.add_argument(
+        "--export",
+        action="store_true",
+        help="convert the snapshot back into the JSON inventory file instead",
+    )
+
+    args = parser.parse_args(argv)
+    if args.metrics is not None:
+        metrics.enable()
+    try:
+        with profiled(args.profile) if args.profile else nullcontext():
+            run_command(args)
+    finally:
+        if args.metrics is not None:
+            metrics.write(args.metrics)
+
+
+def run_command(args: argparse.Namespace) -> None:
+    if args.command == "import":
+        import_main(args)
+    elif args.command == "serve":
+        serve_main(args)
+    elif args.command == "migrate":
+        migrate_main(args)
+    elif args.command == "search":
+        search_main(args)
+    elif args.command == "snapshot":
+        snapshot_main(args)
+    else:
+        cli_main(args.json_path, args.backend)
+
+
 # -------------------------
 # If run as script
 # -------------------------
 if __name__ == "__main__":
     try:
-        cli_main()
+        main()
     except Exception:
-        logging.getLogger(__name__).exception("Fatal error in application.")
+        logger.exception("Fatal error in application.")
         print("A fatal error occurred. Check the log file for details.")
         sys.exit(1)
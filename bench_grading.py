@@ -0,0 +1,237 @@
+"""
+bench_grading.py
+
+Micro-benchmarks for grading.py:
+
+    analyze   the original Assignment 3 helper functions (seven loops over
+              the marks dict, if/elif grading) against analyze_marks()
+    session   an edit session (add / update / remove, statistics shown
+              after every edit): recomputing from scratch each time
+              against the incremental GradeBook; it first replays random
+              edit scripts and checks GradeBook against the helpers
+
+Usage:
+    python bench_grading.py analyze --sizes 100 10000 1000000
+    python bench_grading.py session --sizes 1000 10000 100000 --edits 2000
+"""
+
+import argparse
+import random
+import time
+
+from grading import GradeBook, analyze_marks, give_grades
+
+
+# -------------------------
+# The original helpers from Assignment 3, unchanged
+# -------------------------
+def average(marks):
+    total = 0
+    for m in marks.values():
+        total += m
+    return total / len(marks)
+
+def median(marks):
+    data = sorted(marks.values())
+    n = len(data)
+    mid = n // 2
+    if n % 2 == 0:
+        return (data[mid - 1] + data[mid]) / 2
+    else:
+        return data[mid]
+
+def max_score(marks):
+    high_name = list(marks.keys())[0]
+    high_value = marks[high_name]
+    for name, value in marks.items():
+        if value > high_value:
+            high_name = name
+            high_value = value
+    return high_name, high_value
+
+def min_score(marks):
+    low_name = list(marks.keys())[0]
+    low_value = marks[low_name]
+    for name, value in marks.items():
+        if value < low_value:
+            low_name = name
+            low_value = value
+    return low_name, low_value
+
+def legacy_give_grades(marks):
+    grades = {}
+    for name, mark in marks.items():
+        if mark >= 90:
+            grades[name] = "A"
+        elif mark >= 80:
+            grades[name] = "B"
+        elif mark >= 70:
+            grades[name] = "C"
+        elif mark >= 60:
+            grades[name] = "D"
+        else:
+            grades[name] = "F"
+    return grades
+
+def grade_count(grades):
+    d = {"A":0,"B":0,"C":0,"D":0,"F":0}
+    for g in grades.values():
+        if g in d:
+            d[g] += 1
+    return d
+
+def pass_fail(marks):
+    passed = [n for n, m in marks.items() if m >= 40]
+    failed = [n for n, m in marks.items() if m < 40]
+    return passed, failed
+
+
+def legacy_analysis(marks):
+    grades = legacy_give_grades(marks)
+    return (
+        average(marks),
+        median(marks),
+        max_score(marks),
+        min_score(marks),
+        grades,
+        grade_count(grades),
+        pass_fail(marks),
+    )
+
+
+# -------------------------
+# Benchmark
+# -------------------------
+def best_of(fn, arg, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(arg)
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def bench_analyze(sizes: list) -> None:
+    print(
+        f"{'students':>10} {'original us':>12} {'fused us':>10} {'speedup':>8} "
+        f"{'if/elif us':>11} {'table us':>9}"
+    )
+    for n in sizes:
+        rng = random.Random(n)
+        marks = {f"student{i}": round(rng.uniform(0, 100), 1) for i in range(n)}
+        repeat = max(3, min(200, 2_000_000 // n))
+
+        # the fused pass must agree with the seven separate functions
+        avg, med, hi, lo, grades, counts, (passed, failed) = legacy_analysis(marks)
+        report = analyze_marks(marks)
+        assert abs(report.average - avg) < 1e-6 and report.median == med
+        assert report.highest == hi and report.lowest == lo
+        assert report.grades == grades and report.counts == counts
+        assert report.passed == passed and report.failed == failed
+
+        t_old = best_of(legacy_analysis, marks, repeat)
+        t_new = best_of(analyze_marks, marks, repeat)
+        t_ifelif = best_of(legacy_give_grades, marks, repeat)
+        t_table = best_of(give_grades, marks, repeat)
+        print(
+            f"{n:>10,} {t_old * 1e6:>12,.0f} {t_new * 1e6:>10,.0f} "
+            f"{t_old / t_new:>7.2f}x {t_ifelif * 1e6:>11,.0f} {t_table * 1e6:>9,.0f}"
+        )
+
+
+def random_edits(rng: random.Random, names: int, steps: int):
+    """(op, name, mark) steps over a small pool of names, so edits collide."""
+    for _ in range(steps):
+        name = f"student{rng.randrange(names)}"
+        mark = rng.choice(
+            [rng.randint(0, 100), round(rng.uniform(0, 100), 1), 40.0, 90]
+        )
+        yield ("set" if rng.random() < 0.65 else "del"), name, mark
+
+
+def check_gradebook(scripts: int = 500, seed: int = 7) -> None:
+    """Replay random edit scripts; after every edit GradeBook must agree
+    with the original helper functions run on an equivalent plain dict."""
+    rng = random.Random(seed)
+    for _ in range(scripts):
+        book, marks = GradeBook(), {}
+        for op, name, mark in random_edits(rng, rng.randint(1, 50), 200):
+            if op == "set":
+                book[name] = marks[name] = mark
+            elif name in marks:
+                del book[name], marks[name]
+            if not marks:
+                continue
+            avg, med, hi, lo, grades, counts, (passed, failed) = legacy_analysis(
+                marks
+            )
+            assert abs(book.average - avg) < 1e-6 and book.median == med
+            assert book.highest == hi and book.lowest == lo
+            assert book.grade_counts == counts
+            assert book.passed_count == len(passed)
+            report = book.report()
+            assert report.grades == grades
+            assert report.passed == passed and report.failed == failed
+
+
+def bench_session(sizes: list, edits: int) -> None:
+    check_gradebook()
+    print("GradeBook agrees with the original helpers on 500 random edit scripts")
+    print(
+        f"{'students':>10} {'recompute us/edit':>18} {'GradeBook us/edit':>18} "
+        f"{'speedup':>8}"
+    )
+    for n in sizes:
+        rng = random.Random(n)
+        marks = {f"student{i}": round(rng.uniform(0, 100), 1) for i in range(n)}
+        steps = list(random_edits(rng, n, edits))
+
+        # from scratch: the menu's dict, every statistic rebuilt per edit
+        current = dict(marks)
+        t0 = time.perf_counter()
+        for op, name, mark in steps:
+            if op == "set":
+                current[name] = mark
+            else:
+                current.pop(name, None)
+            analyze_marks(current)
+        t_scratch = time.perf_counter() - t0
+
+        book = GradeBook(marks)
+        t0 = time.perf_counter()
+        for op, name, mark in steps:
+            if op == "set":
+                book[name] = mark
+            elif name in book:
+                del book[name]
+            book.average, book.median, book.highest, book.lowest
+            book.grade_counts, book.passed_count
+        t_book = time.perf_counter() - t0
+
+        assert book.marks == current
+        print(
+            f"{n:>10,} {t_scratch / edits * 1e6:>18,.1f} "
+            f"{t_book / edits * 1e6:>18,.1f} {t_scratch / t_book:>7.0f}x"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Grading micro-benchmarks")
+    sub = parser.add_subparsers(dest="bench", required=True)
+
+    p = sub.add_parser("analyze", help="original helpers vs analyze_marks")
+    p.add_argument("--sizes", type=int, nargs="+", default=[100, 10_000, 1_000_000])
+
+    p = sub.add_parser("session", help="recompute per edit vs GradeBook")
+    p.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    p.add_argument("--edits", type=int, default=2_000)
+
+    args = parser.parse_args()
+    if args.bench == "analyze":
+        bench_analyze(args.sizes)
+    elif args.bench == "session":
+        bench_session(args.sizes, args.edits)
+
+
+if __name__ == "__main__":
+    main()